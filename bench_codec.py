@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Compare per-section compression codecs on a corpus of document JSON files."""
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from municode_lib.models import Document
+from municode_lib.codec import GzipCodec, ZstdDictCodec, HAS_ZSTD
+
+
+def load_contents(inputs: list) -> list:
+    """Collect the content of every section in the given JSON files and directories."""
+    files = []
+    for entry in map(Path, inputs):
+        files.extend(sorted(entry.rglob("*.json")) if entry.is_dir() else [entry])
+
+    contents = []
+    for path in files:
+        try:
+            document = Document.load_json(path)
+        except (OSError, ValueError, KeyError):
+            continue  # Manifests and other JSON files
+        contents.extend(section.content for section in document.sections if section.content)
+    return contents
+
+
+def measure(codec, payloads: list, lookups: int, seed: int) -> dict:
+    """Compress every section on its own, then time full and random-access decoding."""
+    start = time.perf_counter()
+    compressed = [codec.compress(payload) for payload in payloads]
+    compress_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for blob in compressed:
+        codec.decompress(blob)
+    decode_s = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    picks = [rng.randrange(len(compressed)) for _ in range(lookups)]
+    start = time.perf_counter()
+    for i in picks:
+        codec.decompress(compressed[i])
+    lookup_s = time.perf_counter() - start
+
+    return {
+        "bytes": sum(len(blob) for blob in compressed),
+        "compress_mb_s": sum(map(len, payloads)) / compress_s / 1e6,
+        "decode_mb_s": sum(map(len, payloads)) / decode_s / 1e6,
+        "lookup_us": lookup_s / lookups * 1e6,
+    }
+
+
+def main():
+    """Print size and speed per codec."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("inputs", nargs="+", help="Document JSON files or corpus directories")
+    parser.add_argument("--dict-size", type=int, default=64 * 1024, help="Dictionary size in bytes (default: 65536)")
+    parser.add_argument("--level", type=int, default=3, help="zstd level (default: 3)")
+    parser.add_argument("--train-fraction", type=float, default=0.2,
+                        help="Share of sections sampled for training; all sections are measured (default: 0.2)")
+    parser.add_argument("--lookups", type=int, default=10000, help="Random single-section decodes (default: 10000)")
+    parser.add_argument("--seed", type=int, default=0, help="Sampling seed (default: 0)")
+    args = parser.parse_args()
+
+    contents = load_contents(args.inputs)
+    if not contents:
+        parser.error("no sections found")
+    payloads = [content.encode("utf-8") for content in contents]
+    raw = sum(map(len, payloads))
+
+    codecs = [("gzip", GzipCodec())]
+    if HAS_ZSTD:
+        sample = random.Random(args.seed).sample(contents, max(1, int(len(contents) * args.train_fraction)))
+        start = time.perf_counter()
+        trained = ZstdDictCodec.train(sample, dict_size=args.dict_size, level=args.level, max_samples=len(sample))
+        print(f"Trained {len(trained.dictionary)} byte dictionary on {len(sample)} sections "
+              f"in {time.perf_counter() - start:.2f}s")
+        codecs.append((trained.id, trained))
+    else:
+        print("zstandard is not installed; measuring gzip only")
+
+    print(f"{len(payloads)} sections, {raw / 1e6:.1f} MB raw, {raw / len(payloads):.0f} bytes per section")
+    print(f"{'codec':<28}{'MB':>8}{'ratio':>8}{'comp MB/s':>11}{'dec MB/s':>10}{'lookup us':>11}")
+    for name, codec in codecs:
+        result = measure(codec, payloads, args.lookups, args.seed)
+        print(f"{name:<28}{result['bytes'] / 1e6:>8.2f}{raw / result['bytes']:>8.2f}"
+              f"{result['compress_mb_s']:>11.1f}{result['decode_mb_s']:>10.1f}{result['lookup_us']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
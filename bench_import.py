@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Benchmark cold-start import latency of municode_lib entry points."""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = [
+    ("import municode_lib", "import municode_lib"),
+    ("parser only", "from municode_lib import MunicodeParser"),
+    ("parse CLI", "import municode_lib.cli"),
+    ("scraper (loads Selenium)", "from municode_lib import MunicodeScraper"),
+]
+
+
+def time_statement(statement: str, runs: int) -> list:
+    """Time a statement in fresh interpreters, in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    """Print median cold-start latency per entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--runs", type=int, default=10, help="Interpreter launches per statement (default: 10)")
+    args = parser.parse_args()
+
+    baseline = statistics.median(time_statement("pass", args.runs))
+    print(f"{'entry point':<28}{'median ms':>12}{'over bare python':>20}")
+    print(f"{'bare interpreter':<28}{baseline:>12.1f}{0.0:>20.1f}")
+    for name, statement in STATEMENTS:
+        median = statistics.median(time_statement(statement, args.runs))
+        print(f"{name:<28}{median:>12.1f}{median - baseline:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
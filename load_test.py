@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Load test a running `serve` instance and report latency percentiles."""
+
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+import urllib.request
+from urllib.error import HTTPError
+from urllib.parse import quote
+
+
+def discover_paths(base_url: str, limit: int) -> list:
+    """Build a request mix of document lists, sections, subtrees and searches."""
+    with urllib.request.urlopen(base_url + "/") as response:
+        municipalities = json.load(response)
+
+    paths = []
+    for municipality in municipalities:
+        # Ids and path entries may contain "/", so every segment is quoted whole
+        m = quote(municipality, safe="")
+        paths.append(f"/{m}")
+        with urllib.request.urlopen(f"{base_url}/{m}/search?q=shall&limit=50") as response:
+            hits = json.load(response)
+        for hit in hits[:limit]:
+            paths.append(f"/{m}/sections/{quote(hit['id'], safe='')}")
+            paths.append(f"/{m}/tree/" + "/".join(quote(entry, safe="") for entry in hit["path"][:2]))
+        paths.extend(f"/{m}/search?q={quote(words)}" for words in ("permit", "zoning district", "notice"))
+    return paths
+
+
+def run(base_url: str, paths: list, requests: int, concurrency: int, revalidate: bool) -> tuple:
+    """Issue requests from concurrent threads, returning successful latencies in ms and the failure count."""
+    latencies = []
+    failures = 0
+    lock = threading.Lock()
+    counter = iter(range(requests))
+    etags = {}
+
+    def worker():
+        nonlocal failures
+        rng = random.Random()
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    return
+            path = rng.choice(paths)
+            request = urllib.request.Request(base_url + path)
+            if revalidate and path in etags:
+                request.add_header("If-None-Match", etags[path])
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                    etags[path] = response.headers.get("ETag")
+            except Exception as e:
+                # Any error other than a 304 revalidation is a failed request
+                if not (isinstance(e, HTTPError) and e.code == 304):
+                    with lock:
+                        failures += 1
+                    continue
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, failures
+
+
+def main():
+    """Print p50/p99 latency and throughput."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("url", nargs="?", default="http://127.0.0.1:8000", help="Server base URL")
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="Total requests (default: 2000)")
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="Concurrent clients (default: 16)")
+    parser.add_argument("--sections", type=int, default=20, help="Sections sampled per municipality (default: 20)")
+    parser.add_argument("--revalidate", action="store_true", help="Send If-None-Match for previously seen paths")
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip("/")
+    paths = discover_paths(base_url, args.sections)
+    start = time.perf_counter()
+    latencies, failures = run(base_url, paths, args.requests, args.concurrency, args.revalidate)
+    latencies.sort()
+    elapsed = time.perf_counter() - start
+
+    print(f"{failures} of {args.requests} requests failed")
+    if not latencies:
+        return
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{len(latencies)} requests over {len(paths)} paths, {args.concurrency} clients")
+    print(f"p50 {statistics.median(latencies):.2f} ms   p99 {p99:.2f} ms   {len(latencies) / elapsed:.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
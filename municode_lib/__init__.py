@@ -1,9 +1,29 @@
 """Municode scraper library for extracting municipal code data."""
 
-from .scraper import MunicodeScraper
-from .parser import MunicodeParser
+from importlib import import_module
+
 from .models import Section, Document
-from .exceptions import MunicodeError, ScrapingError, ParsingError
+from .exceptions import MunicodeError, ScrapingError, ParsingError, ArchiveError, CodecError
 
 __version__ = "1.0.0"
-__all__ = ["MunicodeScraper", "MunicodeParser", "Section", "Document", "MunicodeError", "ScrapingError", "ParsingError"]
+__all__ = ["MunicodeScraper", "MunicodeParser", "Section", "Document", "MunicodeError", "ScrapingError", "ParsingError",
+           "ArchiveError", "CodecError"]
+
+# Imported on first access so parse-only jobs never load Selenium
+_LAZY_ATTRIBUTES = {
+    "MunicodeScraper": ".scraper",
+    "MunicodeParser": ".parser",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,215 @@
+"""Random-access binary archive for Documents."""
+
+from typing import Any, Dict, Iterator, List, Optional, Union
+from pathlib import Path
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+
+from .models import Section, Document
+from .exceptions import ArchiveError, CodecError
+from .codec import Codec, load_codec
+
+_MAGIC = b"MCSA"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHH")           # magic, version, reserved
+_ENTRY = struct.Struct("<QQII")            # id hash, offset, length, position
+_FOOTER = struct.Struct("<QIQI4s")         # meta offset, meta length, index offset, count, magic
+
+# Per-section compression: name -> (compress, decompress)
+COMPRESSORS = {
+    "none": (lambda data: data, lambda data: data),
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "gzip": (lambda data: gzip.compress(data, 6, mtime=0), gzip.decompress),
+}
+
+
+def _id_hash(section_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(section_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def write_archive(document: Document, filepath: str, compression: Union[str, Codec] = "zlib") -> None:
+    """
+    Write a Document as a random-access section archive.
+
+    Each section is serialized and compressed on its own, followed by the
+    document metadata and an index sorted by section id hash.
+
+    Args:
+        document: Document to archive
+        filepath: Output path
+        compression: Per-section compression, one of COMPRESSORS or a Codec
+            (whose dictionary is saved next to the archive)
+    """
+    filepath = Path(filepath)
+    if isinstance(compression, Codec):
+        codec = compression
+        compress, compression = codec.compress, codec.id
+        codec.save(filepath.parent)
+    elif compression in COMPRESSORS:
+        compress = COMPRESSORS[compression][0]
+    else:
+        raise ArchiveError(f"Unknown compression: {compression}")
+
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(filepath.parent), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, 0))
+            entries = []
+            for position, section in enumerate(document.sections):
+                record = compress(json.dumps(section.to_dict(), ensure_ascii=False).encode("utf-8"))
+                entries.append((_id_hash(section.id), f.tell(), len(record), position))
+                f.write(record)
+
+            meta = zlib.compress(json.dumps({
+                "title": document.title,
+                "source_url": document.source_url,
+                "compression": compression,
+            }, ensure_ascii=False).encode("utf-8"))
+            meta_offset = f.tell()
+            f.write(meta)
+
+            index_offset = f.tell()
+            entries.sort()
+            for entry in entries:
+                f.write(_ENTRY.pack(*entry))
+            f.write(_FOOTER.pack(meta_offset, len(meta), index_offset, len(entries), _MAGIC))
+        os.replace(tmp, filepath)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class SectionArchive:
+    """
+    Memory-mapped reader for archives written by write_archive.
+
+    Opening an archive reads only the fixed-size footer and metadata; a
+    lookup binary-searches the mapped index and decodes a single section.
+    """
+
+    def __init__(self, filepath: str):
+        """
+        Open an archive.
+
+        Args:
+            filepath: Path to the archive file
+        """
+        self.filepath = Path(filepath)
+        self._file = open(self.filepath, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ArchiveError(f"Empty archive: {filepath}")
+
+        if len(self._mm) < _HEADER.size + _FOOTER.size:
+            self.close()
+            raise ArchiveError(f"Not a section archive: {filepath}")
+        magic, version, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ArchiveError(f"Not a section archive: {filepath}")
+        if version != _VERSION:
+            self.close()
+            raise ArchiveError(f"Unsupported archive version {version}: {filepath}")
+
+        meta_offset, meta_length, self._index_offset, self._count, magic = \
+            _FOOTER.unpack_from(self._mm, len(self._mm) - _FOOTER.size)
+        if magic != _MAGIC:
+            self.close()
+            raise ArchiveError(f"Truncated archive: {filepath}")
+
+        try:
+            meta = json.loads(zlib.decompress(self._mm[meta_offset:meta_offset + meta_length]))
+            self.title = meta["title"]
+            self.source_url = meta["source_url"]
+            self.compression = meta["compression"]
+        except (zlib.error, ValueError, KeyError, TypeError) as e:
+            self.close()
+            raise ArchiveError(f"Corrupt archive metadata in {filepath}: {e}")
+        if self.compression in COMPRESSORS:
+            self._decompress = COMPRESSORS[self.compression][1]
+        else:
+            try:
+                self._decompress = load_codec(self.compression, self.filepath.parent).decompress
+            except CodecError as e:
+                self.close()
+                raise ArchiveError(f"Can't decode {filepath}: {e}")
+
+    def _entry(self, i: int):
+        return _ENTRY.unpack_from(self._mm, self._index_offset + i * _ENTRY.size)
+
+    def _decode(self, offset: int, length: int) -> Dict[str, Any]:
+        return json.loads(self._decompress(self._mm[offset:offset + length]))
+
+    def _find(self, section_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield records whose id matches, in document order."""
+        target = _id_hash(section_id)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        while lo < self._count:
+            id_hash, offset, length, _ = self._entry(lo)
+            if id_hash != target:
+                break
+            data = self._decode(offset, length)
+            if data["id"] == section_id:
+                yield data
+            lo += 1
+
+    def get(self, section_id: str) -> Optional[Section]:
+        """Return the first section with this id, or None."""
+        for data in self._find(section_id):
+            return Section.from_dict(data)
+        return None
+
+    def get_all(self, section_id: str) -> List[Section]:
+        """Return every section with this id, in document order."""
+        return [Section.from_dict(data) for data in self._find(section_id)]
+
+    def __getitem__(self, section_id: str) -> Section:
+        section = self.get(section_id)
+        if section is None:
+            raise KeyError(section_id)
+        return section
+
+    def __contains__(self, section_id: str) -> bool:
+        return any(True for _ in self._find(section_id))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def iter_sections(self) -> Iterator[Section]:
+        """Yield all sections in document order."""
+        entries = sorted((self._entry(i) for i in range(self._count)), key=lambda entry: entry[3])
+        for _, offset, length, _ in entries:
+            yield Section.from_dict(self._decode(offset, length))
+
+    def to_document(self) -> Document:
+        """Decode the whole archive back into a Document."""
+        return Document(title=self.title, sections=list(self.iter_sections()), source_url=self.source_url)
+
+    def close(self) -> None:
+        """Unmap and close the archive file."""
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
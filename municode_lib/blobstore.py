@@ -0,0 +1,344 @@
+"""Content-addressed storage that deduplicates section content."""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pathlib import Path
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import zlib
+
+from .models import Section, Document
+from .codec import Codec, load_codec
+from .fileio import atomic_open
+
+_TAG = re.compile(r'<[^>]+>')
+_WORD = re.compile(r'\w+')
+
+# Mersenne prime used by the MinHash permutations
+_MERSENNE_PRIME = (1 << 61) - 1
+
+# Header of compressed blobs, followed by the codec id and a newline
+_COMPRESSED_MAGIC = b"MCZ1"
+
+
+def normalize_content(content: str) -> str:
+    """Collapse whitespace so formatting-only differences share a blob."""
+    return ' '.join(content.split())
+
+
+def content_key(content: str) -> str:
+    """Return the blob key (SHA-256 of the normalized content)."""
+    return hashlib.sha256(normalize_content(content).encode('utf-8')).hexdigest()
+
+
+class MinHasher:
+    """MinHash signatures over word shingles of section text."""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 1):
+        """
+        Initialize the hasher.
+
+        Args:
+            num_perm: Number of hash permutations (signature length)
+            shingle_size: Number of words per shingle
+            seed: Seed for the permutation coefficients
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def _shingles(self, content: str) -> set:
+        words = _WORD.findall(_TAG.sub(' ', content).lower())
+        if len(words) < self.shingle_size:
+            return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+        return {
+            zlib.crc32(' '.join(words[i:i + self.shingle_size]).encode('utf-8'))
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    def signature(self, content: str) -> List[int]:
+        """Return the MinHash signature of an HTML or text string."""
+        hashes = self._shingles(content)
+        if not hashes:
+            return [_MERSENNE_PRIME] * self.num_perm
+        return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self._perms]
+
+    @staticmethod
+    def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        """Estimate Jaccard similarity from two signatures."""
+        if not sig_a:
+            return 0.0
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class BlobStore:
+    """
+    Content-addressed blob store for section content.
+
+    Each distinct (normalized) content string is stored once under its
+    SHA-256 key. Documents saved through the store carry a 'content_ref'
+    per section instead of the HTML, and every reference is indexed by
+    municipality so shared boilerplate can be reported.
+
+    With a codec, new blobs are compressed one by one and record the
+    codec id, so stores mixing plain blobs and several dictionaries stay
+    readable.
+    """
+
+    def __init__(self, root: str, near_duplicates: bool = False, num_perm: int = 64,
+                 bands: int = 16, threshold: float = 0.8, codec: Optional[Codec] = None):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding blobs and the reference index
+            near_duplicates: Also index MinHash signatures for near-duplicate lookups
+            num_perm: MinHash signature length
+            bands: Number of LSH bands (must divide num_perm)
+            threshold: Minimum estimated similarity reported as a near duplicate
+            codec: Compress new blobs (its dictionary is saved under root)
+        """
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.near_duplicates = near_duplicates
+        self.bands = bands
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm=num_perm) if near_duplicates else None
+        self.codec = codec
+        if codec is not None:
+            codec.save(self.root)
+
+        self._conn = sqlite3.connect(str(self.root / "index.sqlite"))
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS refs ("
+                "municipality TEXT, document TEXT, position INTEGER, section_id TEXT, key TEXT, "
+                "PRIMARY KEY (municipality, document, position))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS refs_key ON refs (key)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS signatures (key TEXT PRIMARY KEY, signature TEXT)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS lsh (band INTEGER, bucket TEXT, key TEXT)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS lsh_bucket ON lsh (band, bucket)")
+
+    def _blob_path(self, key: str) -> Path:
+        return self.blob_dir / key[:2] / key
+
+    def has(self, key: str) -> bool:
+        """Return True if a blob with this key is stored."""
+        return self._blob_path(key).exists()
+
+    def put(self, content: str) -> str:
+        """
+        Store content, skipping the write if an identical blob exists.
+
+        With near_duplicates, an existing blob that has no signature yet
+        (stored before near-duplicate indexing was enabled) is indexed.
+
+        Args:
+            content: Section HTML
+
+        Returns:
+            Blob key
+        """
+        key = content_key(content)
+        path = self._blob_path(key)
+        if path.exists():
+            if self.near_duplicates and not self._has_signature(key):
+                self._index_signature(key, content)
+            return key
+
+        with atomic_open(path, 'wb') as f:
+            if self.codec is None:
+                f.write(content.encode('utf-8'))
+            else:
+                f.write(_COMPRESSED_MAGIC + self.codec.id.encode('ascii') + b'\n')
+                f.write(self.codec.compress(content.encode('utf-8')))
+
+        if self.near_duplicates:
+            self._index_signature(key, content)
+        return key
+
+    def get(self, key: str) -> str:
+        """Return the content stored under a key."""
+        with open(self._blob_path(key), 'rb') as f:
+            data = f.read()
+        if data.startswith(_COMPRESSED_MAGIC):
+            header, _, payload = data.partition(b'\n')
+            codec = load_codec(header[len(_COMPRESSED_MAGIC):].decode('ascii'), self.root)
+            return codec.decompress(payload).decode('utf-8')
+        return data.decode('utf-8')
+
+    def _band_buckets(self, signature: List[int]) -> Iterable[Tuple[int, str]]:
+        rows = len(signature) // self.bands
+        for band in range(self.bands):
+            chunk = signature[band * rows:(band + 1) * rows]
+            yield band, hashlib.sha1(','.join(map(str, chunk)).encode('ascii')).hexdigest()
+
+    def _has_signature(self, key: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM signatures WHERE key = ?", (key,)).fetchone() is not None
+
+    def index_existing(self) -> int:
+        """
+        Index signatures of stored blobs that have none yet.
+
+        Blobs written before near-duplicate indexing was enabled are
+        otherwise invisible to find_near_duplicates until put again.
+
+        Returns:
+            Number of blobs indexed
+        """
+        if not self.near_duplicates:
+            raise ValueError("BlobStore was created without near_duplicates=True")
+
+        count = 0
+        for path in self.blob_dir.glob("*/*"):
+            key = path.name
+            if key.startswith('.') or self._has_signature(key):
+                continue
+            self._index_signature(key, self.get(key))
+            count += 1
+        return count
+
+    def _index_signature(self, key: str, content: str) -> None:
+        signature = self.hasher.signature(content)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO signatures (key, signature) VALUES (?, ?)",
+                (key, json.dumps(signature))
+            )
+            self._conn.executemany(
+                "INSERT INTO lsh (band, bucket, key) VALUES (?, ?, ?)",
+                [(band, bucket, key) for band, bucket in self._band_buckets(signature)]
+            )
+
+    def find_near_duplicates(self, content: str) -> List[Tuple[str, float]]:
+        """
+        Find stored blobs whose content is nearly identical.
+
+        Args:
+            content: Section HTML to compare
+
+        Returns:
+            List of (key, estimated similarity) sorted by similarity, excluding
+            an exact match of the content itself
+        """
+        if not self.near_duplicates:
+            raise ValueError("BlobStore was created without near_duplicates=True")
+
+        own_key = content_key(content)
+        signature = self.hasher.signature(content)
+        candidates = set()
+        for band, bucket in self._band_buckets(signature):
+            rows = self._conn.execute("SELECT key FROM lsh WHERE band = ? AND bucket = ?", (band, bucket))
+            candidates.update(row[0] for row in rows)
+        candidates.discard(own_key)
+
+        matches = []
+        for key in candidates:
+            row = self._conn.execute("SELECT signature FROM signatures WHERE key = ?", (key,)).fetchone()
+            if row:
+                score = MinHasher.similarity(signature, json.loads(row[0]))
+                if score >= self.threshold:
+                    matches.append((key, score))
+        return sorted(matches, key=lambda match: -match[1])
+
+    def store_document(self, document: Document, municipality: str) -> Dict[str, Any]:
+        """
+        Store a document's section content and return its referencing form.
+
+        Args:
+            document: Document to store
+            municipality: Municipality the document belongs to
+
+        Returns:
+            Document dictionary whose sections carry 'content_ref' instead of 'content'
+        """
+        sections = []
+        refs = []
+        for position, section in enumerate(document.sections):
+            key = self.put(section.content)
+            data = section.to_dict()
+            del data['content']
+            data['content_ref'] = key
+            sections.append(data)
+            refs.append((municipality, document.title, position, section.id, key))
+
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM refs WHERE municipality = ? AND document = ?",
+                (municipality, document.title)
+            )
+            self._conn.executemany("INSERT INTO refs VALUES (?, ?, ?, ?, ?)", refs)
+
+        return {'title': document.title, 'source_url': document.source_url, 'sections': sections}
+
+    def save_document(self, document: Document, municipality: str, filepath: str) -> None:
+        """Store a document and write its referencing JSON to filepath."""
+        data = self.store_document(document, municipality)
+        with atomic_open(Path(filepath)) as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def load_document(self, data: Dict[str, Any]) -> Document:
+        """
+        Rebuild a Document from its referencing form.
+
+        Args:
+            data: Dictionary from store_document (or a plain Document dictionary)
+
+        Returns:
+            Document with section content resolved from the store
+        """
+        sections = []
+        for section_data in data.get('sections', []):
+            section = Section.from_dict(section_data)
+            if 'content_ref' in section_data:
+                section.content = self.get(section_data['content_ref'])
+            sections.append(section)
+        return Document(title=data.get('title', ''), sections=sections, source_url=data.get('source_url', ''))
+
+    def load_json(self, filepath: str) -> Document:
+        """Load a Document from JSON written by save_document."""
+        with open(filepath, encoding='utf-8') as f:
+            return self.load_document(json.load(f))
+
+    def shared_sections(self, min_municipalities: int = 2) -> Dict[str, List[Tuple[str, str, str]]]:
+        """
+        Report blobs referenced by several municipalities.
+
+        Args:
+            min_municipalities: Minimum number of distinct municipalities
+
+        Returns:
+            Dict of blob key -> list of (municipality, document title, section id)
+        """
+        rows = self._conn.execute(
+            "SELECT key FROM refs GROUP BY key HAVING COUNT(DISTINCT municipality) >= ?",
+            (min_municipalities,)
+        ).fetchall()
+        report = {}
+        for (key,) in rows:
+            report[key] = [
+                tuple(ref) for ref in self._conn.execute(
+                    "SELECT municipality, document, section_id FROM refs WHERE key = ? "
+                    "ORDER BY municipality, document, position", (key,)
+                )
+            ]
+        return report
+
+    def stats(self) -> Dict[str, int]:
+        """Return counts of references and distinct blobs."""
+        references, blobs = self._conn.execute("SELECT COUNT(*), COUNT(DISTINCT key) FROM refs").fetchone()
+        return {'references': references, 'blobs': blobs}
+
+    def close(self) -> None:
+        """Close the reference index."""
+        self._conn.close()
@@ -0,0 +1,118 @@
+"""Persistent cache of parsed Documents."""
+
+from typing import Iterable, List, Optional
+from pathlib import Path
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from .models import Document
+
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    "MUNICODE_PARSE_CACHE", Path.home() / ".cache" / "municode_lib" / "parse"
+))
+
+
+class ParseCache:
+    """
+    Size-bounded on-disk cache of parse results.
+
+    Entries are keyed by the hash of the input HTML together with the
+    parser configuration, version, parse mode and whether content is
+    minified, and store the serialized Document.
+    When the cache grows past max_bytes the least recently used entries
+    are evicted.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Cache directory (default: DEFAULT_CACHE_DIR)
+            max_bytes: Maximum total size of cached entries
+        """
+        self.directory = Path(directory) if directory else DEFAULT_CACHE_DIR
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(chunks: Iterable[bytes], hierarchy_keywords: List[str], element_tags: List[str],
+                 parser_version: str, mode: str = "full", minified: bool = False) -> str:
+        """
+        Build a cache key from input bytes and parser configuration.
+
+        Args:
+            chunks: Input HTML as one or more byte strings
+            hierarchy_keywords: Parser hierarchy keywords
+            element_tags: Parser element tags
+            parser_version: Version of the parsing logic
+            mode: Parse mode ("full" or "stream"), whose results are cached apart
+            minified: Whether section content is minified (htmlmin installed)
+
+        Returns:
+            Hex digest identifying the parse result
+        """
+        digest = hashlib.sha256(json.dumps(
+            [parser_version, mode, minified, hierarchy_keywords, element_tags], separators=(",", ":")
+        ).encode("utf-8"))
+        for chunk in chunks:
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Document]:
+        """Return the cached Document for a key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return Document.from_dict(data)
+
+    def put(self, key: str, document: Document) -> None:
+        """Store a Document and evict old entries if over the size limit."""
+        fd, tmp = tempfile.mkstemp(dir=str(self.directory), prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(document.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self._path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            total = 0
+            for path in self.directory.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            entries.sort()
+            # Keep at least the newest entry even if it alone exceeds the limit
+            while total > self.max_bytes and len(entries) > 1:
+                _, size, path = entries.pop(0)
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+                total -= size
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for path in self.directory.glob("*.json"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,241 @@
+"""Retrieval-ready chunking of section text."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from pathlib import Path
+import hashlib
+import json
+
+from .models import Section, Document
+from .fileio import atomic_open
+
+
+@dataclass
+class Chunk:
+    """A size-bounded slice of a section's text with hierarchy context."""
+    id: str
+    document: str
+    section_id: str
+    index: int
+    context: str
+    text: str
+    path: List[str] = field(default_factory=list)
+    url: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert chunk to dictionary."""
+        return {
+            'id': self.id,
+            'document': self.document,
+            'section_id': self.section_id,
+            'index': self.index,
+            'context': self.context,
+            'text': self.text,
+            'path': self.path,
+            'url': self.url
+        }
+
+
+class Chunker:
+    """Split sections into overlapping, token-bounded chunks."""
+
+    def __init__(self, max_tokens: int = 256, overlap: int = 32, prefix_context: bool = True):
+        """
+        Initialize the chunker.
+
+        Tokens are whitespace-separated words, a cheap and stable stand-in
+        for model tokenizers.
+
+        Args:
+            max_tokens: Maximum tokens per chunk, including the context prefix
+                (a prefix longer than max_tokens // 2 keeps only its last tokens)
+            overlap: Tokens repeated between consecutive chunks of a section
+            prefix_context: Start each chunk's text with its hierarchy breadcrumb
+        """
+        if overlap >= max_tokens:
+            raise ValueError("overlap must be smaller than max_tokens")
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+        self.prefix_context = prefix_context
+
+    @property
+    def config_key(self) -> str:
+        """Identifies the chunking configuration in fingerprints."""
+        return f"{self.max_tokens}:{self.overlap}:{int(self.prefix_context)}"
+
+    @staticmethod
+    def context_for(section: Section) -> str:
+        """Build a breadcrumb from the section's path, label and title."""
+        parents = section.path[:-1] if section.path and section.path[-1] == section.id else section.path
+        # Parser paths end with the section's own full heading before its id
+        if parents and parents[-1] == f"{section.label} - {section.title}":
+            parents = parents[:-1]
+        heading = f"{section.label} {section.title}".strip() if section.label != section.title else section.title
+        return " > ".join([*parents, heading]) if heading else " > ".join(parents)
+
+    def chunk_section(self, section: Section, document: str = "") -> List[Chunk]:
+        """
+        Split one section into chunks.
+
+        Args:
+            section: Section to split (its text is extracted if not cached)
+            document: Title of the enclosing document
+
+        Returns:
+            Chunks in order; a section without text yields no chunks
+        """
+        words = section.text.split()
+        if not words:
+            return []
+
+        context = self.context_for(section)
+        prefix = context
+        budget = self.max_tokens
+        if self.prefix_context:
+            # Keep at least half of each chunk for body text; the end of the
+            # breadcrumb is the most specific part, so truncate from the front
+            context_words = context.split()
+            limit = self.max_tokens // 2
+            if len(context_words) > limit:
+                prefix = " ".join(context_words[-limit:]) if limit else ""
+            budget = self.max_tokens - len(prefix.split())
+        overlap = min(self.overlap, budget - 1)
+        step = budget - overlap
+
+        chunks = []
+        section_key = "/".join(section.path) or section.id
+        start = 0
+        while True:
+            body = " ".join(words[start:start + budget])
+            text = f"{prefix}\n{body}" if self.prefix_context and prefix else body
+            index = len(chunks)
+            digest = hashlib.sha1(f"{document}\x1f{section_key}\x1f{index}\x1f{text}".encode("utf-8"))
+            chunks.append(Chunk(
+                id=digest.hexdigest()[:20],
+                document=document,
+                section_id=section.id,
+                index=index,
+                context=context,
+                text=text,
+                path=list(section.path),
+                url=section.url
+            ))
+            if start + budget >= len(words):
+                break
+            start += step
+        return chunks
+
+    def chunk_document(self, document: Document) -> Iterator[Chunk]:
+        """Yield chunks for every section of a document."""
+        for section in document.sections:
+            yield from self.chunk_section(section, document.title)
+
+
+def _section_keys(document: Document) -> Iterator[tuple]:
+    """Yield (stable key, section) pairs, disambiguating repeated paths."""
+    seen: Dict[str, int] = {}
+    for section in document.sections:
+        base = f"{document.title}\x1f{'/'.join(section.path) or section.id}"
+        occurrence = seen.get(base, 0)
+        seen[base] = occurrence + 1
+        yield f"{base}#{occurrence}", section
+
+
+class ChunkPipeline:
+    """
+    Incremental chunking stage that streams chunks to JSONL.
+
+    A manifest remembers a fingerprint and the chunk ids of every section.
+    On later runs unchanged sections are skipped; the output contains
+    'upsert' records for new or changed chunks and 'delete' records for
+    chunks that no longer exist.
+    """
+
+    def __init__(self, chunker: Optional[Chunker] = None, manifest_path: Optional[str] = None,
+                 workers: Optional[int] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            chunker: Chunker to use (default: Chunker())
+            manifest_path: JSON manifest for incremental runs (None re-chunks everything)
+            workers: Worker processes for text extraction (None for CPU count)
+        """
+        self.chunker = chunker or Chunker()
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        self.workers = workers
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        if self.manifest_path and self.manifest_path.exists():
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+    def _fingerprint(self, section: Section) -> str:
+        digest = hashlib.sha1(self.chunker.config_key.encode("utf-8"))
+        for part in (section.id, section.label, section.title, "/".join(section.path), section.content):
+            digest.update(b"\x1f")
+            digest.update(part.encode("utf-8"))
+        return digest.hexdigest()
+
+    def run(self, documents: Iterable[Document], output_path: str) -> Dict[str, int]:
+        """
+        Chunk documents and stream changes to a JSONL file.
+
+        Args:
+            documents: Documents to chunk (the full corpus, so removals are detected)
+            output_path: JSONL file to write (replaced atomically)
+
+        Returns:
+            Counts of sections seen/changed and chunks upserted/deleted
+        """
+        output_path = Path(output_path)
+        stats = {"sections": 0, "changed": 0, "upserted": 0, "deleted": 0}
+        manifest: Dict[str, Dict[str, Any]] = {}
+
+        with atomic_open(output_path) as out:
+            for document in documents:
+                keyed = []
+                for key, section in _section_keys(document):
+                    fingerprint = self._fingerprint(section)
+                    previous = self.manifest.get(key)
+                    if previous and previous["fingerprint"] == fingerprint:
+                        manifest[key] = previous
+                    else:
+                        keyed.append((key, section, fingerprint, previous))
+                    stats["sections"] += 1
+
+                # Extract text for changed sections only, in one batch
+                Document(title=document.title, sections=[item[1] for item in keyed],
+                         source_url=document.source_url).extract_text(workers=self.workers)
+
+                for key, section, fingerprint, previous in keyed:
+                    stats["changed"] += 1
+                    chunks = self.chunker.chunk_section(section, document.title)
+                    new_ids = [chunk.id for chunk in chunks]
+                    for chunk in chunks:
+                        out.write(json.dumps({"op": "upsert", **chunk.to_dict()}, ensure_ascii=False))
+                        out.write("\n")
+                    stats["upserted"] += len(chunks)
+                    if previous:
+                        stale = set(previous["chunks"]) - set(new_ids)
+                        stats["deleted"] += self._write_deletes(out, stale)
+                    manifest[key] = {"fingerprint": fingerprint, "chunks": new_ids}
+
+            # Sections that disappeared since the last run
+            for key, previous in self.manifest.items():
+                if key not in manifest:
+                    stats["deleted"] += self._write_deletes(out, previous["chunks"])
+
+        self.manifest = manifest
+        if self.manifest_path:
+            with atomic_open(self.manifest_path) as f:
+                json.dump(manifest, f)
+        return stats
+
+    @staticmethod
+    def _write_deletes(out, chunk_ids: Iterable[str]) -> int:
+        count = 0
+        for chunk_id in sorted(chunk_ids):
+            out.write(json.dumps({"op": "delete", "id": chunk_id}))
+            out.write("\n")
+            count += 1
+        return count
@@ -0,0 +1,230 @@
+"""Cross-reference extraction and citation graphs."""
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+import json
+import re
+
+from .models import Section, Document
+from .titles import normalize_label_id
+from .fileio import atomic_open
+
+CITATIONS_VERSION = 1
+
+# File name of a corpus directory's citation graph
+CITATIONS_FILE = "citations.json"
+
+_NUMBER = r'\d+(?:[-.:]\d+)*[a-z]?'
+_ROMAN = r'(?-i:[IVXLCDM]+)\b|\d+'
+_THROUGH = r'\s*(?:[\u2013\u2014]|--|\bthrough\b|\bthru\b)\s*'
+_LIST = r'(?:\s*(?:,\s*(?:and|or)?|and|or)\s*(?:{item}))*'
+
+
+def _compile_kind(prefix: str, space: str, item: str, default: str):
+    """Reference pattern, cited item or range, label prefix pattern and default id prefix of one kind."""
+    item_or_range = rf'(?:{item})(?:{_THROUGH}(?:{item}))?'
+    return (
+        re.compile(rf'(?<!\w)(?:{prefix}){space}({item_or_range}{_LIST.format(item=item_or_range)})', re.I),
+        re.compile(rf'({item})(?:{_THROUGH}({item}))?', re.I),
+        re.compile(rf'(?:{prefix}){space}(?={item})', re.I),
+        default,
+    )
+
+
+# Section, article and chapter references, and the label prefix each normalizes with by default
+_REFERENCES = [
+    _compile_kind(r'sec(?:tion)?s?\.?|§§?', r'\s*', _NUMBER, "Sec."),
+    _compile_kind(r'art(?:icle)?s?\.?', r'\s+', _ROMAN, "Article"),
+    _compile_kind(r'ch(?:apter)?s?\.?', r'\s+', _NUMBER, "Chapter"),
+]
+
+
+class Reference(NamedTuple):
+    """One cited number, or range of numbers, of a reference kind."""
+    start: int              # Offset of the reference in the text
+    kind: int               # Index into the reference kinds (section, article, chapter)
+    first: str              # Cited number, e.g. "22-1" or "II"
+    last: Optional[str]     # End of a range like "Secs. 22-1—22-5", else None
+    matched: str            # Whole matched reference text
+
+
+def find_references(text: str) -> List[Reference]:
+    """
+    Find references to other sections in plain text, without normalizing them.
+
+    Args:
+        text: Plain text of a section
+
+    Returns:
+        References in order of appearance
+    """
+    found = []
+    for kind, (pattern, item, _, _) in enumerate(_REFERENCES):
+        for match in pattern.finditer(text):
+            for numbers in item.finditer(match.group(1)):
+                found.append(Reference(match.start(), kind, numbers.group(1), numbers.group(2), match.group(0)))
+    found.sort(key=lambda reference: reference.start)
+    return found
+
+
+def extract_citations(text: str) -> List[Tuple[str, str]]:
+    """
+    Find references to other sections in plain text.
+
+    Handles forms like "Sec. 22-1", "sections 22-1 and 22-3", "§ 30-1",
+    "Article II" and "Chapter 22". Each reference is normalized with the
+    same rules as parse_section_title, using the usual "Sec.", "Article"
+    and "Chapter" prefixes. A range like "Secs. 22-1—22-5" gives
+    both of its ends; CitationGraph expands it to the sections between
+    them and also tries the document's own label prefixes (e.g.
+    "Section 5.1" or "§ 5.1").
+
+    Args:
+        text: Plain text of a section
+
+    Returns:
+        List of (normalized id, matched text) in order of appearance
+    """
+    found = []
+    for reference in find_references(text):
+        default = _REFERENCES[reference.kind][3]
+        for number in filter(None, (reference.first, reference.last)):
+            found.append((normalize_label_id(f"{default} {number}"), reference.matched))
+    return found
+
+
+def _label_prefixes(sections: Iterable[Section]) -> List[List[str]]:
+    """Label prefixes a document uses per reference kind, e.g. "Sec. " or "§", most common first."""
+    counts: List[Dict[str, int]] = [defaultdict(int) for _ in _REFERENCES]
+    for section in sections:
+        for kind, (_, _, label_prefix, _) in enumerate(_REFERENCES):
+            match = label_prefix.match(section.label)
+            if match:
+                counts[kind][match.group(0)] += 1
+                break
+    return [sorted(count, key=lambda prefix: -count[prefix]) for count in counts]
+
+
+def section_key(section: Section) -> str:
+    """Graph node of a section: its hierarchy path, which stays unique when ids repeat."""
+    return "/".join(section.path) if section.path else section.id
+
+
+def _key(section: Union[Section, str]) -> str:
+    return section if isinstance(section, str) else section_key(section)
+
+
+def _shared_prefix(a: Sequence[str], b: Sequence[str]) -> int:
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
+
+
+class CitationGraph:
+    """
+    Forward and reverse citation adjacency lists per document.
+
+    Nodes are section keys (see section_key) within one document, so
+    "cites" and "cited by" lookups cost O(degree).
+    """
+
+    def __init__(self):
+        """Initialize an empty graph."""
+        self.forward: Dict[str, Dict[str, List[str]]] = {}
+        self.reverse: Dict[str, Dict[str, List[str]]] = {}
+
+    @classmethod
+    def build(cls, documents: Iterable[Document]) -> "CitationGraph":
+        """Build a graph from documents (see add_document)."""
+        graph = cls()
+        for document in documents:
+            graph.add_document(document)
+        return graph
+
+    def add_document(self, document: Document) -> None:
+        """
+        Extract and resolve the citations of every section in a document.
+
+        A reference resolves to a section of the same document with the
+        cited id, normalized with the usual prefix ("Sec. 5.1") or any
+        label prefix the document itself uses ("Section 5.1.", "§ 5.1.").
+        When several sections share that id, the one sharing the longest
+        hierarchy path with the citing section wins, so "Article II"
+        means the article of the citing section's chapter. A range cites
+        both ends and every section of the same kind between them in
+        document order (ranges must use "through" or a long dash: in
+        "Secs. 22-1-22-5" the hyphen reads as part of one number).
+        Self-references and unresolved references are dropped.
+
+        Args:
+            document: Document whose sections are scanned
+        """
+        candidates: Dict[str, List[Section]] = defaultdict(list)
+        for section in document.sections:
+            candidates[section.id].append(section)
+        prefixes = _label_prefixes(document.sections)
+        positions = {id(section): i for i, section in enumerate(document.sections)}
+
+        def resolve(kind: int, number: str, source: Section) -> Optional[Section]:
+            for prefix in [_REFERENCES[kind][3] + " "] + prefixes[kind]:
+                targets = candidates.get(normalize_label_id(prefix + number))
+                if targets:
+                    return max(targets, key=lambda t: _shared_prefix(t.path[:-1], source.path))
+            return None
+
+        document.extract_text()
+        forward: Dict[str, List[str]] = defaultdict(list)
+        reverse: Dict[str, List[str]] = defaultdict(list)
+        for section in document.sections:
+            for reference in find_references(section.text):
+                first = resolve(reference.kind, reference.first, section)
+                targets = [first] if first else []
+                if reference.last:
+                    last = resolve(reference.kind, reference.last, section)
+                    if first and last and positions[id(first)] < positions[id(last)]:
+                        label_prefix = _REFERENCES[reference.kind][2]
+                        between = document.sections[positions[id(first)] + 1:positions[id(last)]]
+                        targets.extend(t for t in between if label_prefix.match(t.label))
+                    if last:
+                        targets.append(last)
+
+                source_key = section_key(section)
+                for target in targets:
+                    target_key = section_key(target)
+                    if target is section or target_key in forward[source_key]:
+                        continue
+                    forward[source_key].append(target_key)
+                    reverse[target_key].append(source_key)
+
+        self.forward[document.title] = {source: targets for source, targets in forward.items() if targets}
+        self.reverse[document.title] = dict(reverse)
+
+    def cites(self, document_title: str, section: Union[Section, str]) -> List[str]:
+        """Keys of sections cited by a section (or key), in order of first citation."""
+        return self.forward.get(document_title, {}).get(_key(section), [])
+
+    def cited_by(self, document_title: str, section: Union[Section, str]) -> List[str]:
+        """Keys of sections citing a section (or key), in document order."""
+        return self.reverse.get(document_title, {}).get(_key(section), [])
+
+    def save(self, filepath: Path) -> None:
+        """Save the graph as JSON (atomically replaced)."""
+        with atomic_open(filepath) as f:
+            json.dump({"version": CITATIONS_VERSION, "forward": self.forward, "reverse": self.reverse},
+                      f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, filepath: Path) -> "CitationGraph":
+        """Load a graph written by save."""
+        with open(filepath, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CITATIONS_VERSION:
+            raise ValueError(f"Unsupported citation graph version: {data.get('version')}")
+        graph = cls()
+        graph.forward = data["forward"]
+        graph.reverse = data["reverse"]
+        return graph
@@ -1,36 +1,77 @@
 """Command-line interface for municode library."""
 
 import argparse
+import os
 import sys
 from pathlib import Path
+from typing import Optional
 
-from .scraper import MunicodeScraper
 from .parser import MunicodeParser
+from .cache import ParseCache
+from .seen import open_seen_set
+from .pipeline import PipelinedCrawler
+from .models import Document
+from .chunking import Chunker, ChunkPipeline
+from .writer import OutputWriter
+from .diff import diff_documents
+from .versions import VersionStore
+from .citations import CITATIONS_FILE, CitationGraph
+from .codec import ZstdDictCodec
+from .watchdog import DriverWatchdog
+from .workqueue import SqliteTaskQueue, enqueue_crawl, run_worker, assemble_documents
 from .exceptions import MunicodeError
 
 
+def make_watchdog(args) -> Optional[DriverWatchdog]:
+    """Build the browser watchdog from --recycle-pages/--max-browser-mb (off unless one is given)."""
+    if args.recycle_pages is None and args.max_browser_mb is None:
+        return None
+    return DriverWatchdog(max_pages=args.recycle_pages or 0, max_rss_mb=args.max_browser_mb or None)
+
+
 def scrape_command(args):
     """Handle scrape command."""
+    # Selenium is only loaded for scrape runs
+    from .scraper import MunicodeScraper
+
+    formats = ["html"]
+    if args.json:
+        formats.append("json")
+    if args.jsonl:
+        formats.append("jsonl")
+
     try:
-        with MunicodeScraper(headless=args.headless, output_dir=args.output) as scraper:
-            if args.full:
-                documents = scraper.scrape_full(args.url)
-                print(f"✅ Scraped {len(documents)} documents")
+        seen = open_seen_set(args.seen)
+        with MunicodeScraper(headless=args.headless, output_dir=args.output, seen=seen,
+                             page_load_strategy=args.page_load_strategy,
+                             block_resources=args.block_resources,
+                             watchdog=make_watchdog(args)) as scraper:
+            if args.outline:
+                documents = scraper.outline_full(args.url) if args.full else [scraper.outline_section(args.url)]
+                documents = [doc for doc in documents if doc]
+                if not documents:
+                    print("❌ Failed to read outline")
+                    return 1
                 for doc in documents:
-                    output_path = Path(args.output) / f"{doc.title}.html"
-                    doc.save_html(output_path)
-                    if args.json:
-                        json_path = Path(args.output) / f"{doc.title}.json"
-                        doc.save_json(json_path)
+                    print(f"✅ Outlined document: {doc.title} ({len(doc.sections)} sections)")
+                    doc.save_json(Path(args.output) / f"{doc.title}.outline.json")
+            elif args.full:
+                if args.pipeline:
+                    crawler = PipelinedCrawler(scraper, include=args.include, exclude=args.exclude)
+                    documents = crawler.iter_documents(args.url)
+                else:
+                    documents = scraper.iter_full(args.url, include=args.include, exclude=args.exclude)
+                # Each document is written in the background as soon as it is scraped
+                with OutputWriter(args.output, formats, include_text=args.text) as writer:
+                    for doc in documents:
+                        writer.write_document(doc)
+                print(f"✅ Scraped {writer.written} documents")
             else:
-                document = scraper.scrape_section(args.url)
+                document = scraper.scrape_section(args.url, include=args.include, exclude=args.exclude)
                 if document:
                     print(f"✅ Scraped document: {document.title}")
-                    output_path = Path(args.output) / f"{document.title}.html"
-                    document.save_html(output_path)
-                    if args.json:
-                        json_path = Path(args.output) / f"{document.title}.json"
-                        document.save_json(json_path)
+                    with OutputWriter(args.output, formats, include_text=args.text) as writer:
+                        writer.write_document(document)
                 else:
                     print("❌ Failed to scrape document")
                     return 1
@@ -47,14 +88,15 @@ def scrape_command(args):
 def parse_command(args):
     """Handle parse command."""
     try:
-        parser = MunicodeParser()
+        use_cache = args.cache or args.cache_dir is not None
+        parser = MunicodeParser(cache=ParseCache(args.cache_dir) if use_cache else None)
         
         input_path = Path(args.input)
         if not input_path.exists():
             print(f"❌ Input file not found: {input_path}")
             return 1
             
-        document = parser.parse_html_file(str(input_path))
+        document = parser.parse_html_file(str(input_path), stream=args.stream, workers=args.workers or None)
         print(f"✅ Parsed document: {document.title}")
         
         if args.output:
@@ -62,7 +104,7 @@ def parse_command(args):
         else:
             output_path = input_path.with_suffix('.parsed.json')
             
-        parser.save_structured_json(document, str(output_path))
+        parser.save_structured_json(document, str(output_path), include_text=args.text)
         print(f"✅ Saved to: {output_path}")
         
     except MunicodeError as e:
@@ -75,6 +117,173 @@ def parse_command(args):
     return 0
 
 
+def chunk_command(args):
+    """Handle chunk command."""
+    try:
+        inputs = [Path(path) for path in args.inputs]
+        missing = [path for path in inputs if not path.exists()]
+        if missing:
+            print(f"❌ Input file not found: {missing[0]}")
+            return 1
+
+        pipeline = ChunkPipeline(
+            Chunker(max_tokens=args.max_tokens, overlap=args.overlap),
+            manifest_path=args.manifest,
+            workers=args.workers
+        )
+        documents = (Document.load_json(path) for path in inputs)
+        stats = pipeline.run(documents, args.output)
+        print(f"✅ Chunked {stats['changed']}/{stats['sections']} changed sections: "
+              f"{stats['upserted']} upserts, {stats['deleted']} deletes")
+        print(f"✅ Saved to: {args.output}")
+
+    except MunicodeError as e:
+        print(f"❌ Chunking error: {e}")
+        return 1
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        return 1
+
+    return 0
+
+
+def queue_command(args):
+    """Handle queue command (distributed scraping)."""
+    try:
+        queue = SqliteTaskQueue(args.queue, lease_seconds=args.lease)
+        if args.action == "assemble":
+            documents = assemble_documents(queue, complete_only=not args.partial)
+            for doc in documents:
+                doc.save_html(Path(args.output) / f"{doc.title}.html")
+                if args.json:
+                    doc.save_json(Path(args.output) / f"{doc.title}.json")
+            print(f"✅ Assembled {len(documents)} documents ({queue.counts()})")
+            return 0
+
+        # Selenium is only loaded for producer/worker runs
+        from .scraper import MunicodeScraper
+
+        with MunicodeScraper(headless=args.headless, output_dir=args.output, seen=open_seen_set(args.seen),
+                             watchdog=make_watchdog(args)) as scraper:
+            if args.action == "enqueue":
+                count = enqueue_crawl(scraper, args.url, queue, full=args.full)
+                print(f"✅ Enqueued {count} tasks")
+            else:
+                count = run_worker(scraper, queue, idle_timeout=args.idle_timeout)
+                print(f"✅ Worker completed {count} tasks ({queue.counts()})")
+    except MunicodeError as e:
+        print(f"❌ Queue error: {e}")
+        return 1
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        return 1
+
+    return 0
+
+
+def cite_command(args):
+    """Handle cite command."""
+    try:
+        documents = [Document.load_json(path) for path in args.inputs]
+    except (OSError, ValueError, MunicodeError) as e:
+        print(f"❌ Failed to read documents: {e}")
+        return 1
+
+    # The server looks for the graph next to the documents of a municipality
+    output = Path(args.output) if args.output else \
+        Path(os.path.commonpath([Path(path).resolve().parent for path in args.inputs])) / CITATIONS_FILE
+
+    graph = CitationGraph.build(documents)
+    edges = sum(len(targets) for forward in graph.forward.values() for targets in forward.values())
+    graph.save(output)
+    print(f"✅ Resolved {edges} citations across {len(documents)} documents to {output}")
+    return 0
+
+
+def diff_command(args):
+    """Handle diff command."""
+    try:
+        old = Document.load_json(args.old)
+        new = Document.load_json(args.new)
+    except (OSError, ValueError, MunicodeError) as e:
+        print(f"❌ Failed to read documents: {e}")
+        return 1
+
+    changes = diff_documents(old, new, text_diffs=not args.no_text, context=args.context)
+    summary = changes.summary()
+    print("✅ " + ", ".join(f"{count} {kind}" for kind, count in summary.items()))
+    if args.output:
+        changes.save_json(Path(args.output))
+        print(f"💾 Saved change set to {args.output}")
+    else:
+        for change in changes.changes:
+            print(f"{change.kind:<9} {change.old_id or '-'} -> {change.new_id or '-'}"
+                  + (f" [{', '.join(change.fields)}]" if change.fields else ""))
+    return 0
+
+
+def compress_command(args):
+    """Handle compress command."""
+    try:
+        documents = [Document.load_json(path) for path in args.inputs]
+        codec = ZstdDictCodec.train((section.content for doc in documents for section in doc.sections),
+                                    dict_size=args.dict_size, level=args.level)
+    except (OSError, ValueError, MunicodeError) as e:
+        print(f"❌ Compression failed: {e}")
+        return 1
+
+    output_dir = Path(args.output)
+    for doc in documents:
+        doc.save_json(output_dir / f"{doc.title}.json", codec=codec)
+    print(f"✅ Compressed {len(documents)} documents with {codec.id} into {output_dir}")
+    return 0
+
+
+def versions_command(args):
+    """Handle versions command."""
+    store = VersionStore(args.store, checkpoint_every=args.checkpoint_every)
+    try:
+        if args.action == "add":
+            documents = [Document.load_json(path) for path in args.inputs]
+            version = store.add_version(args.municipality, documents, label=args.label)
+            print(f"✅ Stored {args.municipality} version {version} ({store.stats(args.municipality)})")
+        elif args.action == "get":
+            documents = store.materialize(args.municipality, args.version)
+            for doc in documents:
+                doc.save_json(Path(args.output) / f"{doc.title}.json")
+            print(f"✅ Wrote {len(documents)} documents to {args.output}")
+        else:
+            for entry in store.versions(args.municipality):
+                print(f"v{entry['version']:<5} {entry['kind']:<6} {entry['bytes']:>10} bytes  {entry['label'] or ''}")
+    except (OSError, ValueError, KeyError, MunicodeError) as e:
+        print(f"❌ Version store error: {e}")
+        return 1
+    return 0
+
+
+def serve_command(args):
+    """Handle serve command."""
+    from .server import make_server
+
+    try:
+        server = make_server(args.corpus, host=args.host, port=args.port, cache_size=args.cache_size)
+    except (OSError, MunicodeError) as e:
+        print(f"❌ Failed to start server: {e}")
+        return 1
+
+    corpus = server.RequestHandlerClass.corpus
+    count = sum(len(docs) for docs in corpus.documents.values())
+    print(f"✅ Loaded {count} documents from {len(corpus.documents)} municipalities")
+    print(f"🌐 Serving on http://{args.host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -90,12 +299,106 @@ def main():
     scrape_parser.add_argument("-o", "--output", default="data", help="Output directory (default: data)")
     scrape_parser.add_argument("--full", action="store_true", help="Scrape full municode (vs single section)")
     scrape_parser.add_argument("--json", action="store_true", help="Also save as JSON")
+    scrape_parser.add_argument("--jsonl", action="store_true", help="Also stream every section to sections.jsonl")
+    scrape_parser.add_argument("--text", action="store_true", help="Include plain text of each section in JSON")
     scrape_parser.add_argument("--headless", action="store_true", default=True, help="Run browser in headless mode")
+    scrape_parser.add_argument("--outline", action="store_true", help="Only read the TOC structure (no content pages)")
+    scrape_parser.add_argument("--pipeline", action="store_true", help="Overlap page loading with parsing (with --full)")
+    scrape_parser.add_argument("--page-load-strategy", choices=["normal", "eager", "none"], default="normal",
+                               help="Browser page load strategy (default: normal)")
+    scrape_parser.add_argument("--block-resources", action="store_true", help="Block images, fonts and analytics")
+    scrape_parser.add_argument("--include", action="append",
+                               help="Only scrape TOC entries matching this glob or 're:' regex on label, id or path (repeatable)")
+    scrape_parser.add_argument("--exclude", action="append",
+                               help="Skip TOC entries matching this glob or 're:' regex (repeatable)")
+    scrape_parser.add_argument("--recycle-pages", type=int,
+                               help="Watch browser health and restart it after this many page loads (0: no limit; default: off)")
+    scrape_parser.add_argument("--max-browser-mb", type=float,
+                               help="Watch browser health and restart it above this memory use in MB (0: no limit; default: off)")
+    scrape_parser.add_argument("--seen", help="Seen-set file shared across runs/workers (.db/.sqlite for SQLite)")
     
     # Parse command
     parse_parser = subparsers.add_parser("parse", help="Parse existing HTML file")
     parse_parser.add_argument("input", help="Input HTML file to parse")
     parse_parser.add_argument("-o", "--output", help="Output JSON file (default: input.parsed.json)")
+    parse_parser.add_argument("--text", action="store_true", help="Include plain text of each section")
+    parse_parser.add_argument("--cache", action="store_true", help="Reuse and store results in the parse cache")
+    parse_parser.add_argument("--cache-dir", help="Parse cache directory, implies --cache "
+                                                  "(default: ~/.cache/municode_lib/parse)")
+    parse_parser.add_argument("--workers", type=int, default=1, help="Processes for parallel chunk parsing (0 for CPU count)")
+    parse_parser.add_argument("--stream", action="store_true", help="Parse incrementally with bounded memory")
+    
+    # Chunk command
+    chunk_parser = subparsers.add_parser("chunk", help="Split JSON documents into retrieval chunks")
+    chunk_parser.add_argument("inputs", nargs="+", help="Document JSON files")
+    chunk_parser.add_argument("-o", "--output", default="chunks.jsonl", help="Output JSONL file (default: chunks.jsonl)")
+    chunk_parser.add_argument("--manifest", help="Manifest file for incremental runs")
+    chunk_parser.add_argument("--max-tokens", type=int, default=256, help="Maximum tokens per chunk (default: 256)")
+    chunk_parser.add_argument("--overlap", type=int, default=32, help="Tokens shared by consecutive chunks (default: 32)")
+    chunk_parser.add_argument("--workers", type=int, help="Worker processes for text extraction")
+    
+    # Queue command
+    queue_parser = subparsers.add_parser("queue", help="Distributed scraping through a task queue")
+    queue_parser.add_argument("action", choices=["enqueue", "work", "assemble"],
+                              help="enqueue: expand TOCs into tasks; work: consume tasks; assemble: write documents")
+    queue_parser.add_argument("url", nargs="?", help="Municode URL to expand (enqueue only)")
+    queue_parser.add_argument("-q", "--queue", default="queue.db", help="Queue database (default: queue.db)")
+    queue_parser.add_argument("-o", "--output", default="data", help="Output directory (default: data)")
+    queue_parser.add_argument("--full", action="store_true", help="Expand the full municode (vs single section)")
+    queue_parser.add_argument("--json", action="store_true", help="Also save as JSON (assemble only)")
+    queue_parser.add_argument("--partial", action="store_true", help="Assemble documents with unfinished tasks")
+    queue_parser.add_argument("--seen", help="Seen-set file shared by all workers (.db/.sqlite for SQLite; "
+                                             "default: per-worker, in memory)")
+    queue_parser.add_argument("--lease", type=int, default=300, help="Seconds before an unacked task is redelivered")
+    queue_parser.add_argument("--idle-timeout", type=float, default=30.0, help="Seconds a worker waits for new tasks")
+    queue_parser.add_argument("--recycle-pages", type=int,
+                              help="Watch browser health and restart it after this many page loads (0: no limit; default: off)")
+    queue_parser.add_argument("--max-browser-mb", type=float,
+                              help="Watch browser health and restart it above this memory use in MB (0: no limit; default: off)")
+    queue_parser.add_argument("--headless", action="store_true", default=True, help="Run browser in headless mode")
+    
+    # Cite command
+    cite_parser = subparsers.add_parser("cite", help="Build the citation graph of JSON documents")
+    cite_parser.add_argument("inputs", nargs="+", help="Document JSON files of one corpus")
+    cite_parser.add_argument("-o", "--output",
+                             help=f"Output graph file (default: {CITATIONS_FILE} in the inputs' common directory)")
+    
+    # Diff command
+    diff_parser = subparsers.add_parser("diff", help="Compare two JSON versions of a document")
+    diff_parser.add_argument("old", help="Earlier document JSON")
+    diff_parser.add_argument("new", help="Later document JSON")
+    diff_parser.add_argument("-o", "--output", help="Write the change set as JSON instead of listing it")
+    diff_parser.add_argument("--no-text", action="store_true", help="Skip text-level diffs of modified sections")
+    diff_parser.add_argument("--context", type=int, default=1, help="Context lines in text diffs (default: 1)")
+    
+    # Compress command
+    compress_parser = subparsers.add_parser("compress", help="Rewrite JSON documents with dictionary-compressed content")
+    compress_parser.add_argument("inputs", nargs="+", help="Document JSON files of one corpus (the training sample)")
+    compress_parser.add_argument("-o", "--output", required=True,
+                                 help="Output directory; the dictionary is saved under dictionaries/")
+    compress_parser.add_argument("--dict-size", type=int, default=64 * 1024,
+                                 help="Dictionary size in bytes (default: 65536)")
+    compress_parser.add_argument("--level", type=int, default=3, help="zstd compression level (default: 3)")
+    
+    # Versions command
+    versions_parser = subparsers.add_parser("versions", help="Store and restore historical snapshots")
+    versions_parser.add_argument("action", choices=["add", "get", "list"],
+                                 help="add: store JSON documents as a new version; get: write a version; list: show versions")
+    versions_parser.add_argument("municipality", help="Municipality name")
+    versions_parser.add_argument("inputs", nargs="*", help="Document JSON files of the snapshot (add only)")
+    versions_parser.add_argument("-s", "--store", default="versions", help="Store directory (default: versions)")
+    versions_parser.add_argument("-o", "--output", default="data", help="Output directory (get only, default: data)")
+    versions_parser.add_argument("--version", type=int, help="Version to get (default: latest)")
+    versions_parser.add_argument("--label", help="Description of the snapshot, e.g. the scrape date (add only)")
+    versions_parser.add_argument("--checkpoint-every", type=int, default=10,
+                                 help="Versions between full snapshots (default: 10)")
+    
+    # Serve command
+    serve_parser = subparsers.add_parser("serve", help="Serve a scraped corpus over HTTP")
+    serve_parser.add_argument("corpus", help="Directory of document JSON files (subdirectories per municipality)")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8000, help="Port to bind (default: 8000)")
+    serve_parser.add_argument("--cache-size", type=int, default=1024, help="Responses kept in the LRU cache")
     
     # Parse arguments
     args = parser.parse_args()
@@ -109,6 +412,24 @@ def main():
         return scrape_command(args)
     elif args.command == "parse":
         return parse_command(args)
+    elif args.command == "chunk":
+        return chunk_command(args)
+    elif args.command == "queue":
+        if args.action == "enqueue" and not args.url:
+            queue_parser.error("enqueue requires a url")
+        return queue_command(args)
+    elif args.command == "cite":
+        return cite_command(args)
+    elif args.command == "diff":
+        return diff_command(args)
+    elif args.command == "compress":
+        return compress_command(args)
+    elif args.command == "versions":
+        if args.action == "add" and not args.inputs:
+            versions_parser.error("add requires document JSON files")
+        return versions_command(args)
+    elif args.command == "serve":
+        return serve_command(args)
     else:
         print(f"❌ Unknown command: {args.command}")
         return 1
@@ -0,0 +1,218 @@
+"""Per-section compression codecs, including zstd with a trained dictionary."""
+
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+import base64
+import gzip
+import hashlib
+import importlib.util
+import random
+import threading
+
+from .exceptions import CodecError
+from .fileio import atomic_open
+
+# Optional zstandard module, imported on first use
+HAS_ZSTD = importlib.util.find_spec("zstandard") is not None
+
+# Subdirectory of a data directory holding the dictionaries its files refer to
+DICTIONARY_DIR = "dictionaries"
+
+
+def _zstd():
+    if not HAS_ZSTD:
+        raise CodecError("Dictionary compression requires zstandard (pip install municode-lib[zstd])")
+    import zstandard
+    return zstandard
+
+
+class Codec:
+    """
+    Compresses section content one section at a time.
+
+    Every codec has an id that is recorded next to the data it
+    compressed, so load_codec can find the same codec when reading.
+    """
+
+    name = "none"
+
+    @property
+    def id(self) -> str:
+        """Identifier recorded with compressed data."""
+        return self.name
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+    def encode_text(self, text: str) -> str:
+        """Compress a string into base64 text for JSON."""
+        return base64.b64encode(self.compress(text.encode("utf-8"))).decode("ascii")
+
+    def decode_text(self, encoded: str) -> str:
+        """Reverse encode_text."""
+        return self.decompress(base64.b64decode(encoded)).decode("utf-8")
+
+    def save(self, directory: Path) -> None:
+        """Write whatever a reader of this codec's output needs into a data directory."""
+        pass
+
+
+class GzipCodec(Codec):
+    """Plain gzip per section (the baseline)."""
+
+    name = "gzip"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def decompress(self, data: bytes) -> bytes:
+        return gzip.decompress(data)
+
+
+class ZstdDictCodec(Codec):
+    """
+    zstd with a dictionary trained on a corpus's own sections.
+
+    Section content is short and repeats the same markup and phrasing,
+    which a shared dictionary captures once instead of in every
+    compressed section. Sections are still compressed independently, so
+    any one of them can be decoded on its own.
+
+    The dictionary is identified by a hash of its bytes. save writes it to
+    <directory>/dictionaries/<hash>.zdict, and data compressed with it
+    records "zstd-dict:<hash>", so retraining never breaks older files.
+    """
+
+    name = "zstd-dict"
+
+    def __init__(self, dictionary: bytes, level: int = 3):
+        """
+        Initialize the codec.
+
+        Args:
+            dictionary: Trained dictionary bytes (see train)
+            level: zstd compression level
+
+        Raises:
+            CodecError: If zstandard is missing or the dictionary is corrupt
+        """
+        zstd = _zstd()
+        self.dictionary = dictionary
+        self.level = level
+        self.digest = hashlib.blake2b(dictionary, digest_size=8).hexdigest()
+        try:
+            self._dict = zstd.ZstdCompressionDict(dictionary)
+            self._dict.precompute_compress(level=level)
+        except zstd.ZstdError as e:
+            raise CodecError(f"Invalid zstd dictionary {self.digest}: {e}")
+        # zstd contexts aren't thread-safe, so each thread gets its own pair
+        self._local = threading.local()
+
+    @classmethod
+    def train(cls, contents: Iterable[str], dict_size: int = 64 * 1024, level: int = 3,
+              max_samples: int = 20000, seed: int = 0) -> "ZstdDictCodec":
+        """
+        Train a dictionary on section content.
+
+        Args:
+            contents: Section HTML of the corpus
+            dict_size: Maximum dictionary size in bytes
+            level: zstd compression level
+            max_samples: Sections sampled for training
+            seed: Seed for the sample
+
+        Returns:
+            ZstdDictCodec with the trained dictionary
+
+        Raises:
+            CodecError: If zstandard is missing or there are too few samples
+        """
+        zstd = _zstd()
+        samples = [content.encode("utf-8") for content in contents if content]
+        if len(samples) > max_samples:
+            samples = random.Random(seed).sample(samples, max_samples)
+        try:
+            dictionary = zstd.train_dictionary(dict_size, samples, level=level)
+        except zstd.ZstdError as e:
+            raise CodecError(f"Failed to train dictionary on {len(samples)} sections: {e}")
+        return cls(dictionary.as_bytes(), level=level)
+
+    @property
+    def id(self) -> str:
+        return f"{self.name}:{self.digest}"
+
+    def _contexts(self):
+        if not hasattr(self._local, "compressor"):
+            zstd = _zstd()
+            self._local.compressor = zstd.ZstdCompressor(dict_data=self._dict, write_checksum=False,
+                                                         write_content_size=True, write_dict_id=False)
+            self._local.decompressor = zstd.ZstdDecompressor(dict_data=self._dict)
+        return self._local.compressor, self._local.decompressor
+
+    def compress(self, data: bytes) -> bytes:
+        return self._contexts()[0].compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._contexts()[1].decompress(data)
+
+    def save(self, directory: Path) -> None:
+        """Write the dictionary into a data directory (skipped if already there)."""
+        path = Path(directory) / DICTIONARY_DIR / f"{self.digest}.zdict"
+        if path.exists():
+            return
+        with atomic_open(path, "wb") as f:
+            f.write(self.dictionary)
+
+    @classmethod
+    def load(cls, path: Path, level: int = 3) -> "ZstdDictCodec":
+        """Load a dictionary file written by save."""
+        with open(path, "rb") as f:
+            return cls(f.read(), level=level)
+
+
+# Codecs by id; dictionaries are content-addressed, so an id always means the same codec
+_LOADED: Dict[str, Codec] = {"none": Codec(), "gzip": GzipCodec()}
+_LOADED_LOCK = threading.Lock()
+
+
+def load_codec(codec_id: str, directory: Optional[Path] = None) -> Codec:
+    """
+    Return the codec that produced data recorded with codec_id.
+
+    Args:
+        codec_id: Codec.id stored with the data
+        directory: Data directory holding the dictionaries (see ZstdDictCodec.save);
+            required to load a dictionary that isn't loaded yet
+
+    Returns:
+        Codec able to decompress the data
+
+    Raises:
+        CodecError: If the codec is unknown, or its dictionary is missing,
+            corrupt or needed without a directory
+    """
+    with _LOADED_LOCK:
+        codec = _LOADED.get(codec_id)
+        if codec is not None:
+            return codec
+
+        name, _, digest = codec_id.partition(":")
+        if name != ZstdDictCodec.name or not digest:
+            raise CodecError(f"Unknown codec: {codec_id}")
+        if directory is None:
+            raise CodecError(f"No data directory given to find the dictionary for {codec_id}")
+        path = Path(directory) / DICTIONARY_DIR / f"{digest}.zdict"
+        try:
+            codec = ZstdDictCodec.load(path)
+        except OSError as e:
+            raise CodecError(f"Missing dictionary for {codec_id}: {e}")
+        if codec.digest != digest:
+            raise CodecError(f"Dictionary {path} doesn't match {codec_id}")
+        _LOADED[codec_id] = codec
+        return codec
@@ -0,0 +1,256 @@
+"""Structural diffs between two versions of a Document."""
+
+from collections import defaultdict, deque
+from dataclasses import dataclass, field, asdict
+from difflib import SequenceMatcher, unified_diff
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import hashlib
+import json
+
+from .models import Section, Document
+from .blobstore import normalize_content
+from .fileio import atomic_open
+
+# Minimum word-level text similarity for sequence-aligned sections to count as the same section
+SIMILARITY_THRESHOLD = 0.6
+
+
+class Fingerprint(NamedTuple):
+    """The parts of a section that a diff compares."""
+    content: bytes               # Digest of the normalized content
+    heading: Tuple[str, str]     # Label and title
+    path: Tuple[str, ...]
+
+
+def fingerprint(section: Section) -> Fingerprint:
+    """
+    Hash a section's normalized content and collect its label, title and path.
+
+    Args:
+        section: Section to fingerprint
+
+    Returns:
+        Fingerprint of the section
+    """
+    content = hashlib.blake2b(normalize_content(section.content).encode("utf-8"), digest_size=16).digest()
+    return Fingerprint(content, (section.label, section.title), tuple(section.path))
+
+
+@dataclass
+class Change:
+    """One changed section."""
+    kind: str                         # "added", "removed", "moved" or "modified"
+    old_id: Optional[str] = None
+    new_id: Optional[str] = None
+    old_path: Optional[List[str]] = None
+    new_path: Optional[List[str]] = None
+    fields: List[str] = field(default_factory=list)  # Changed among id, label, title, path, content
+    text_diff: Optional[str] = None   # Unified diff of the plain text when content changed
+
+
+@dataclass
+class ChangeSet:
+    """Changes between two versions of a document."""
+    old_title: str
+    new_title: str
+    changes: List[Change]
+    unchanged: int
+
+    def summary(self) -> Dict[str, int]:
+        """Count changes per kind."""
+        counts = {"added": 0, "removed": 0, "moved": 0, "modified": 0}
+        for change in self.changes:
+            counts[change.kind] += 1
+        counts["unchanged"] = self.unchanged
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the change set to a dictionary (None fields omitted)."""
+        return {
+            "old_title": self.old_title,
+            "new_title": self.new_title,
+            "summary": self.summary(),
+            "changes": [{k: v for k, v in asdict(change).items() if v not in (None, [])}
+                        for change in self.changes],
+        }
+
+    def save_json(self, filepath: Path) -> None:
+        """Save the change set as JSON (atomically replaced)."""
+        with atomic_open(filepath) as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+def _keys(sections: List[Section]) -> List[Tuple[str, int]]:
+    """Ids made unique by their occurrence number (ids like 'untitled-section' repeat)."""
+    seen: Dict[str, int] = defaultdict(int)
+    keys = []
+    for section in sections:
+        keys.append((section.id, seen[section.id]))
+        seen[section.id] += 1
+    return keys
+
+
+def _match_content(old_prints: List[Fingerprint], new_prints: List[Fingerprint], old_pool: List[int],
+                   new_pool: List[int]) -> Tuple[List[Tuple[int, int]], List[int], List[int]]:
+    """Pair sections with identical content, in order; return the pairs and the unmatched rest of each side."""
+    by_content: Dict[bytes, deque] = defaultdict(deque)
+    for i in old_pool:
+        by_content[old_prints[i].content].append(i)
+    pairs = []
+    matched_old = set()
+    remaining_new = []
+    for j in new_pool:
+        candidates = by_content.get(new_prints[j].content)
+        if candidates:
+            i = candidates.popleft()
+            matched_old.add(i)
+            pairs.append((i, j))
+        else:
+            remaining_new.append(j)
+    return pairs, [i for i in old_pool if i not in matched_old], remaining_new
+
+
+def _similar(old: Section, new: Section) -> bool:
+    """Word-level similarity check; the cheap upper bounds reject most unrelated pairs first."""
+    similarity = SequenceMatcher(None, old.text.split(), new.text.split(), autojunk=False)
+    return (similarity.real_quick_ratio() >= SIMILARITY_THRESHOLD
+            and similarity.quick_ratio() >= SIMILARITY_THRESHOLD
+            and similarity.ratio() >= SIMILARITY_THRESHOLD)
+
+
+def _align_leftovers(old: List[Section], new: List[Section], remaining_old: List[int],
+                     remaining_new: List[int]) -> List[Tuple[int, int]]:
+    """Pair edited sections whose ids changed by sequence alignment and similarity."""
+    pairs = []
+
+    # Align in order, pairing similar sections. Within a block, each old
+    # section may skip as many new ones as the block gained, so sections
+    # shifted by an insertion still meet their counterpart
+    matcher = SequenceMatcher(None, [old[i].label for i in remaining_old],
+                              [new[j].label for j in remaining_new], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag not in ("equal", "replace"):
+            continue
+        block = remaining_new[j1:j2]
+        window = max(0, (j2 - j1) - (i2 - i1)) + 1
+        start = 0
+        for i in remaining_old[i1:i2]:
+            for offset, j in enumerate(block[start:start + window]):
+                if _similar(old[i], new[j]):
+                    pairs.append((i, j))
+                    start += offset + 1
+                    break
+            else:
+                start += 1
+    return pairs
+
+
+def _text_diff(old: Section, new: Section, context: int) -> str:
+    lines = unified_diff(old.text.splitlines(), new.text.splitlines(),
+                         fromfile=old.id, tofile=new.id, n=context, lineterm="")
+    return "\n".join(lines)
+
+
+def diff_documents(old: Document, new: Document, text_diffs: bool = True, context: int = 1) -> ChangeSet:
+    """
+    Compare two versions of a document section by section.
+
+    Sections are aligned by id when their content is unchanged. Sections
+    left over on both sides, and same-id sections whose content changed,
+    are then paired by identical content, so inserting a section that
+    shifts the numbering of everything after it reports those sections
+    as moved rather than modified. A same-id pair whose content matched
+    nothing else stays paired as an edit, and what remains is paired by
+    sequence alignment with a similarity check, which catches sections
+    both renumbered and edited. A paired section is "moved" if only its
+    id, label or path changed and "modified" if its content or title
+    changed.
+
+    Args:
+        old: Earlier version
+        new: Later version
+        text_diffs: Attach a unified diff of the plain text to modified sections
+        context: Context lines in text diffs
+
+    Returns:
+        ChangeSet with added, removed, moved and modified sections
+    """
+    old_prints = [fingerprint(section) for section in old.sections]
+    new_prints = [fingerprint(section) for section in new.sections]
+
+    # Same id and content; an id whose content changed may be a renumbered neighbour
+    old_index = {key: i for i, key in enumerate(_keys(old.sections))}
+    pairs = []
+    suspects = []
+    new_left = []
+    for j, key in enumerate(_keys(new.sections)):
+        i = old_index.pop(key, None)
+        if i is None:
+            new_left.append(j)
+        elif old_prints[i].content == new_prints[j].content:
+            pairs.append((i, j))
+        else:
+            suspects.append((i, j))
+    old_left = sorted(old_index.values())
+
+    if suspects or (old_left and new_left):
+        old_pool = sorted(old_left + [i for i, _ in suspects])
+        new_pool = sorted(new_left + [j for _, j in suspects])
+        content_pairs, old_rest, new_rest = _match_content(old_prints, new_prints, old_pool, new_pool)
+        pairs.extend(content_pairs)
+
+        # An edited section keeps its id unless either side's content turned up elsewhere
+        old_unmatched, new_unmatched = set(old_rest), set(new_rest)
+        for i, j in suspects:
+            if i in old_unmatched and j in new_unmatched:
+                pairs.append((i, j))
+                old_unmatched.discard(i)
+                new_unmatched.discard(j)
+        old_rest = [i for i in old_rest if i in old_unmatched]
+        new_rest = [j for j in new_rest if j in new_unmatched]
+
+        if old_rest and new_rest:
+            pairs.extend(_align_leftovers(old.sections, new.sections, old_rest, new_rest))
+
+    changes: List[Tuple[Tuple[int, int], Change]] = []
+    paired_old = set()
+    paired_new = set()
+    unchanged = 0
+    for i, j in pairs:
+        paired_old.add(i)
+        paired_new.add(j)
+        a, b = old.sections[i], new.sections[j]
+        fa, fb = old_prints[i], new_prints[j]
+        if fa == fb and a.id == b.id:
+            unchanged += 1
+            continue
+
+        fields = []
+        if a.id != b.id:
+            fields.append("id")
+        if fa.heading != fb.heading:
+            fields.extend(name for name in ("label", "title") if getattr(a, name) != getattr(b, name))
+        if fa.path != fb.path:
+            fields.append("path")
+        if fa.content != fb.content:
+            fields.append("content")
+
+        kind = "modified" if "content" in fields or "title" in fields else "moved"
+        change = Change(kind=kind, old_id=a.id, new_id=b.id, old_path=list(a.path), new_path=list(b.path),
+                        fields=fields)
+        if text_diffs and "content" in fields:
+            change.text_diff = _text_diff(a, b, context)
+        changes.append(((j, 1), change))
+
+    for j, section in enumerate(new.sections):
+        if j not in paired_new:
+            changes.append(((j, 1), Change(kind="added", new_id=section.id, new_path=list(section.path))))
+    for i, section in enumerate(old.sections):
+        if i not in paired_old:
+            # Removed sections sort where they used to be, ahead of what replaced them
+            changes.append(((i, 0), Change(kind="removed", old_id=section.id, old_path=list(section.path))))
+
+    changes.sort(key=lambda entry: entry[0])
+    return ChangeSet(old_title=old.title, new_title=new.title,
+                     changes=[change for _, change in changes], unchanged=unchanged)
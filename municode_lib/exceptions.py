@@ -24,3 +24,13 @@ class InvalidUrlError(MunicodeError):
 class ElementNotFoundError(ScrapingError):
     """Raised when expected HTML element is not found."""
     pass
+
+
+class ArchiveError(MunicodeError):
+    """Raised when an archive is malformed or a section is missing."""
+    pass
+
+
+class CodecError(MunicodeError):
+    """Raised when a codec can't be trained, found or used."""
+    pass
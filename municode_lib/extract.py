@@ -0,0 +1,59 @@
+"""Batched DOM extraction through single JavaScript calls."""
+
+from typing import Dict, List, Optional
+
+# Returns [{href, text}] for every link under the node matched by an XPath
+_TOC_LINKS_SCRIPT = """
+var root = document.evaluate(arguments[0], document, null,
+    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!root) { return null; }
+var links = root.getElementsByTagName('a');
+var result = [];
+for (var i = 0; i < links.length; i++) {
+    result.push({href: links[i].href, text: (links[i].innerText || '').trim()});
+}
+return result;
+"""
+
+# Returns {heading, chunks}: first line of the chunk heading and the
+# serialized 'ul.chunks' list (only when arguments[0] is true)
+_PAGE_PAYLOAD_SCRIPT = """
+var heading = document.getElementsByClassName('chunk-heading')[0];
+var headingText = heading ? (heading.innerText || '').split('\\n')[0] : null;
+var chunks = null;
+if (arguments[0]) {
+    var list = document.querySelector('ul.chunks');
+    chunks = list ? list.outerHTML : '';
+}
+return {heading: headingText, chunks: chunks};
+"""
+
+
+def extract_toc_links(driver, xpath: str) -> Optional[List[Dict[str, str]]]:
+    """
+    Collect all TOC links below an element in one WebDriver round-trip.
+
+    Args:
+        driver: Selenium WebDriver on the loaded page
+        xpath: XPath of the TOC list element
+
+    Returns:
+        List of {"href": ..., "text": ...} dicts in document order, or None
+        if the element is not on the page
+    """
+    return driver.execute_script(_TOC_LINKS_SCRIPT, xpath)
+
+
+def extract_page_payload(driver, include_chunks: bool = True) -> Dict[str, Optional[str]]:
+    """
+    Read a content page's heading and chunk list in one WebDriver round-trip.
+
+    Args:
+        driver: Selenium WebDriver on the loaded page
+        include_chunks: Also serialize the 'ul.chunks' list
+
+    Returns:
+        Dict with "heading" (first heading line or None) and "chunks"
+        (outer HTML of the chunk list, "" if absent, None if not requested)
+    """
+    return driver.execute_script(_PAGE_PAYLOAD_SCRIPT, include_chunks) or {"heading": None, "chunks": None}
@@ -0,0 +1,60 @@
+"""Atomic file output."""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+import os
+import stat
+import tempfile
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once: os.umask can only be queried by setting it, which races with other threads
+_UMASK = _current_umask()
+
+
+def _target_mode(filepath: Path) -> int:
+    """Permissions for filepath: those of the file it replaces, else the umask default."""
+    try:
+        return stat.S_IMODE(os.stat(filepath).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_open(filepath: Path, mode: str = "w", encoding: str = "utf-8") -> Iterator[IO]:
+    """
+    Open a temporary file that replaces filepath only once fully written.
+
+    A crash or exception while writing leaves any existing file at
+    filepath untouched and removes the temporary file. The new file keeps
+    the permissions of the one it replaces, or gets the usual umask-based
+    permissions if there was none (mkstemp alone would make it owner-only).
+
+    Args:
+        filepath: Final output path (parent directories are created)
+        mode: "w" for text or "wb" for bytes
+        encoding: Text encoding (ignored in binary mode)
+
+    Yields:
+        File object to write to
+    """
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(filepath.parent), prefix=f".{filepath.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+        os.chmod(tmp, _target_mode(filepath))
+        os.replace(tmp, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,125 @@
+"""Include/exclude filters for selecting subtrees of a municode."""
+
+from fnmatch import fnmatchcase
+from typing import Iterable, List, Optional, Sequence
+import re
+
+from .models import Section
+
+
+class Pattern:
+    """
+    One filter pattern.
+
+    A "re:" prefix makes the rest a regular expression (searched);
+    anything else is a glob. Matching is case-insensitive. Patterns
+    containing "/" match hierarchy paths segment by segment, e.g.
+    "chapter-22/article-*"; other patterns match a section's label or id.
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.is_regex = pattern.startswith("re:")
+        if self.is_regex:
+            self._regex = re.compile(pattern[3:], re.IGNORECASE)
+            self.segments = None
+        else:
+            self.segments = pattern.lower().split("/") if "/" in pattern else None
+
+    def _match_text(self, text: str) -> bool:
+        if self.is_regex:
+            return self._regex.search(text) is not None
+        return fnmatchcase(text.lower(), self.pattern.lower())
+
+    def matches(self, section_id: str, label: str, path: Sequence[str]) -> bool:
+        """Whether the pattern selects this entry."""
+        if self.segments is not None:
+            n = len(self.segments)
+            return len(path) >= n and all(
+                fnmatchcase(entry.lower(), segment) for entry, segment in zip(path, self.segments)
+            )
+        if self.is_regex:
+            # Regexes may target the label, the id or the joined path
+            return any(self._match_text(text) for text in (label, section_id, "/".join(path)))
+        return self._match_text(label) or self._match_text(section_id)
+
+    def may_match_below(self, path: Sequence[str]) -> bool:
+        """Whether an entry inside the subtree at path could still match."""
+        if self.segments is None:
+            return True
+        return all(fnmatchcase(entry.lower(), segment) for entry, segment in zip(path, self.segments))
+
+
+class PathFilter:
+    """
+    Select TOC entries by include and exclude patterns.
+
+    An entry is selected when it (or an ancestor) matches an include
+    pattern, or no include patterns are given, and neither it nor an
+    ancestor matches an exclude pattern. Selecting an entry selects its
+    whole subtree.
+    """
+
+    def __init__(self, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None):
+        """
+        Initialize the filter.
+
+        Args:
+            include: Patterns of entries to keep (default: everything)
+            exclude: Patterns of entries to drop, applied after include
+        """
+        self.include: List[Pattern] = [Pattern(p) for p in include or []]
+        self.exclude: List[Pattern] = [Pattern(p) for p in exclude or []]
+
+    def __bool__(self) -> bool:
+        return bool(self.include or self.exclude)
+
+    def excluded(self, section_id: str, label: str, path: Sequence[str]) -> bool:
+        """Whether the entry falls in an excluded subtree."""
+        return any(p.matches(section_id, label, path) for p in self.exclude)
+
+    def matches(self, section_id: str, label: str, path: Sequence[str]) -> bool:
+        """Whether the entry is selected."""
+        if self.excluded(section_id, label, path):
+            return False
+        return not self.include or any(p.matches(section_id, label, path) for p in self.include)
+
+    def select(self, sections: Sequence[Section], inherited: bool = False) -> List[Section]:
+        """
+        Keep the selected sections of a TOC, in order.
+
+        A section is kept when it or an earlier section on its path was
+        selected, and dropped when it or one on its path was excluded.
+
+        Args:
+            sections: Sections in TOC order with paths filled in
+            inherited: The enclosing entry is already selected
+
+        Returns:
+            The selected sections
+        """
+        selected_ids = set()
+        excluded_ids = set()
+        kept = []
+        for section in sections:
+            ancestors = section.path[:-1]
+            if self.excluded(section.id, section.label, section.path) or excluded_ids.intersection(ancestors):
+                excluded_ids.add(section.id)
+                continue
+            if (inherited or not self.include or selected_ids.intersection(ancestors)
+                    or any(p.matches(section.id, section.label, section.path) for p in self.include)):
+                selected_ids.add(section.id)
+                kept.append(section)
+        return kept
+
+    def may_contain(self, section_id: str, label: str, path: Sequence[str]) -> bool:
+        """
+        Whether the subtree at an entry could hold selected entries.
+
+        Used to prune a branch before its TOC page is loaded.
+        """
+        if self.excluded(section_id, label, path):
+            return False
+        return not self.include or any(
+            p.matches(section_id, label, path) or p.may_match_below(path) for p in self.include
+        )
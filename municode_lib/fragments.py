@@ -0,0 +1,134 @@
+"""Cheap splitting of raw HTML into chunk-content fragments."""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple, Union
+import re
+
+_NAME = r'[a-zA-Z][^\t\n\r\f />\x00]*'
+_ATTRS = r'''(?:[\s/]*(?<=['"\s/])[^\s/>][^\s/=>]*(?:\s*=+\s*(?:'[^']*'|"[^"]*"|(?!['"])[^>\s]*))?)*[\s/]*'''
+
+# Markup as html.parser tokenizes it; anything else is text
+_TOKEN = (
+    r'<!--.*?(?:-->|\Z)'
+    r'|<!\[CDATA\[.*?(?:\]\]>|\Z)'
+    r'|<[!?][^>]*>?'
+    rf'|</(?P<end>{_NAME})[^>]*>'
+    rf'|<(?P<start>{_NAME})(?P<attrs>{_ATTRS})>'
+)
+_CLASS = r'''(?<![^\s/"'])class\s*=+\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))'''
+
+# Elements html.parser reads as raw text up to their end tag
+_RAW_TEXT = {"script", "style"}
+
+# Elements bs4's HTML tree builders close as soon as they open
+_VOID = {"area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr", "image", "img",
+         "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid", "param", "source", "spacer",
+         "track", "wbr"}
+
+
+
+def _compile(encode):
+    return (
+        re.compile(encode(_TOKEN), re.S),
+        re.compile(encode(_CLASS), re.I),
+        {name: re.compile(encode(rf'</{name}(?=[\s/>])'), re.I) for name in _RAW_TEXT},
+    )
+
+
+_PATTERNS = {str: _compile(lambda pattern: pattern), bytes: _compile(str.encode)}
+
+
+@dataclass
+class ChunkFragment:
+    """Offsets of one chunk-content div in a raw HTML buffer."""
+    text_start: int   # End of the last tag before the div (its heading siblings follow)
+    start: int        # Start of the opening <div> tag
+    end: int          # End of the div as the tree builder closes it
+
+
+def _text(value: Union[str, bytes]) -> str:
+    return value if isinstance(value, str) else value.decode("utf-8", "replace")
+
+
+def _is_chunk(attrs: Union[str, bytes], class_re) -> bool:
+    """Whether a div's attributes give it the chunk-content class (the last class attribute wins)."""
+    value = None
+    for match in class_re.finditer(attrs):
+        value = next(group for group in match.groups() if group is not None)
+    return value is not None and "chunk-content" in _text(value).split()
+
+
+def iter_chunk_fragments(buffer: Union[str, bytes, memoryview]) -> Iterator[ChunkFragment]:
+    """
+    Locate 'chunk-content' divs without building a parse tree.
+
+    Works on str, bytes and mmap buffers. Tags are tokenized the way
+    html.parser reads them, so comments and script/style bodies are
+    skipped, and the stack of open elements is tracked the way bs4's
+    tree builder keeps it: an end tag closes the most recent open element
+    of its name along with everything opened after it, and is ignored if
+    none is open. Each fragment therefore covers exactly what a full
+    parse puts in the div, even for unclosed or stray tags, and a chunk
+    left open around a later one contains it, as in the full tree.
+
+    The text, comments and declarations between the previous tag and
+    each div are included too, since they are the div's preceding
+    siblings, from which the parser reads the hierarchy heading.
+
+    Args:
+        buffer: Raw HTML
+
+    Yields:
+        ChunkFragment offsets in document order of the opening tags
+    """
+    kind = str if isinstance(buffer, str) else bytes
+    token_re, class_re, raw_text_end = _PATTERNS[kind]
+
+    stack: List[Tuple[str, Optional[ChunkFragment]]] = []
+    pending = deque()
+    last_tag_end = 0
+    pos = 0
+    while True:
+        match = token_re.search(buffer, pos)
+        if match is None:
+            break
+        pos = match.end()
+        if match.group("start"):
+            name = _text(match.group("start")).lower()
+            text_start, last_tag_end = last_tag_end, pos
+            if name in _VOID:
+                continue
+            fragment = None
+            if name == "div" and _is_chunk(match.group("attrs"), class_re):
+                fragment = ChunkFragment(text_start=text_start, start=match.start(), end=-1)
+                pending.append(fragment)
+            if match.group(0)[-2:] in ("/>", b"/>"):
+                if fragment is not None:
+                    fragment.end = pos
+            else:
+                stack.append((name, fragment))
+                if name in _RAW_TEXT:
+                    close = raw_text_end[name].search(buffer, pos)
+                    pos = close.start() if close else len(buffer)
+        elif match.group("end"):
+            name = _text(match.group("end")).lower()
+            last_tag_end = pos
+            if name in _VOID or all(open_name != name for open_name, _ in stack):
+                continue
+            while True:
+                open_name, fragment = stack.pop()
+                if fragment is not None:
+                    # Closed by its own end tag, or implicitly just before an ancestor's
+                    fragment.end = pos if open_name == name else match.start()
+                if open_name == name:
+                    break
+
+        while pending and pending[0].end >= 0:
+            yield pending.popleft()
+
+    # Elements still open at the end of the buffer run to its end
+    for fragment in pending:
+        if fragment.end < 0:
+            fragment.end = len(buffer)
+        yield fragment
@@ -0,0 +1,57 @@
+"""Hierarchy path reconstruction for out-of-order parsing."""
+
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class PathRecord:
+    """What a section contributes to the hierarchy, recorded independently."""
+    section_id: str
+    level: Optional[int] = None   # None: stays under the current path without changing it
+    key: Optional[str] = None     # Path entry this section places at its level
+    order: Tuple[Any, ...] = ()   # Sort key restoring document order
+
+
+def rebuild_paths(records: Sequence[PathRecord], depth: int, root: Optional[str] = None,
+                  append_id: bool = True) -> List[List[str]]:
+    """
+    Rebuild every section's path in one linear stack-based pass.
+
+    Produces the same paths as updating a shared current-path list while
+    parsing sequentially, so chunks can be parsed in any order first.
+
+    Args:
+        records: One record per section, in any order
+        depth: Number of hierarchy levels
+        root: Entry fixed at level 0 until a level-0 section replaces it
+        append_id: Append the section id after the path entries (parser
+            style); otherwise the record's key is its own last entry
+
+    Returns:
+        Paths in the same order as records
+    """
+    stack: List[Optional[str]] = [None] * depth
+    if depth and root is not None:
+        stack[0] = root
+
+    paths: List[List[str]] = [[] for _ in records]
+    for index in sorted(range(len(records)), key=lambda i: records[i].order):
+        record = records[index]
+        level = record.level
+        if level is None:
+            path = [entry for entry in stack if entry is not None]
+        elif 0 <= level < depth:
+            stack[level] = record.key
+            for deeper in range(level + 1, depth):
+                stack[deeper] = None
+            path = [entry for entry in stack[:level + 1] if entry is not None]
+        else:
+            # Invalid level: the section stands alone
+            paths[index] = [record.section_id]
+            continue
+
+        if append_id:
+            path.append(record.section_id)
+        paths[index] = path
+    return paths
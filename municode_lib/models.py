@@ -1,41 +1,14 @@
 """Data models for municode content."""
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Callable, List, Optional, Dict, Any, Tuple, Union
 from pathlib import Path
 import json
-import re
 
-
-def parse_section_title(full_title: str) -> Tuple[str, str, str]:
-    """
-    Parse a full section title into id, label, and title components.
-    
-    Args:
-        full_title: Full title like "Article II - Some Title" or "Sec. 22-1. - Emergency procedures"
-        
-    Returns:
-        Tuple of (id, label, title)
-    """
-    # Split on the first dash to separate label from title
-    if " - " in full_title:
-        label_part, title_part = full_title.split(" - ", 1)
-        
-        # Clean up the parts
-        label = label_part.strip()
-        title = title_part.strip()
-        
-        # Create ID by normalizing the label part
-        # Remove periods, convert to lowercase, replace spaces with hyphens
-        section_id = re.sub(r'[.\s]+', '-', label).lower().strip('-')
-        
-        return section_id, label, title
-    else:
-        # Fallback: no dash separator found
-        clean_title = full_title.strip()
-        # Create a simple ID from the beginning of the title
-        fallback_id = re.sub(r'[^\w\s]', '', clean_title[:20]).lower().replace(' ', '-').strip('-')
-        return fallback_id, clean_title, clean_title
+from .titles import parse_section_title
+from .text import html_to_text, extract_texts
+from .fileio import atomic_open
+from .codec import Codec, load_codec
 
 
 @dataclass
@@ -47,10 +20,27 @@ class Section:
     content: str
     path: List[str] = field(default_factory=list)
     url: Optional[str] = None
+    # Memoized (content, text) pair behind the text property
+    _text_cache: Optional[Tuple[str, str]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def text(self) -> str:
+        """Plain text of the content, extracted on first access."""
+        if self._text_cache is None or self._text_cache[0] is not self.content:
+            self._text_cache = (self.content, html_to_text(self.content))
+        return self._text_cache[1]
+
+    def has_text(self) -> bool:
+        """Return True if the text of the current content is already cached."""
+        return self._text_cache is not None and self._text_cache[0] is self.content
+
+    def set_text(self, text: str) -> None:
+        """Cache text extracted elsewhere for the current content."""
+        self._text_cache = (self.content, text)
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert section to dictionary."""
-        return {
+    def to_dict(self, include_text: bool = False, codec: Optional[Codec] = None) -> Dict[str, Any]:
+        """Convert section to dictionary (with a codec, content becomes compressed 'content_z')."""
+        data = {
             'id': self.id,
             'title': self.title,
             'label': self.label,
@@ -58,6 +48,88 @@ class Section:
             'path': self.path,
             'url': self.url
         }
+        if codec is not None:
+            data['content_z'] = codec.encode_text(data.pop('content'))
+        if include_text:
+            data['text'] = self.text
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], codec: Optional[Codec] = None) -> "Section":
+        """Create section from dictionary (codec decodes 'content_z')."""
+        content = data.get('content', '')
+        if 'content_z' in data:
+            if codec is None:
+                raise ValueError(f"Section {data['id']} has compressed content but no codec was given")
+            content = codec.decode_text(data['content_z'])
+        section = cls(
+            id=data['id'],
+            title=data.get('title', ''),
+            label=data.get('label', ''),
+            content=content,
+            path=list(data.get('path') or []),
+            url=data.get('url')
+        )
+        if 'text' in data:
+            section.set_text(data['text'])
+        return section
+
+
+class SpanSection(Section):
+    """
+    Section whose content is read from a span of the source buffer on demand.
+
+    Holds byte offsets into the original file (bytes or an mmap) instead of
+    a processed copy. The content property decodes and processes the span
+    on first access and keeps the result; assigning content replaces it.
+    Pickling produces a plain Section.
+    """
+
+    def __init__(self, id: str, title: str, label: str, buffer: Union[bytes, memoryview], start: int, end: int,
+                 materialize: Callable[[str], str], path: Optional[List[str]] = None, url: Optional[str] = None):
+        """
+        Initialize a span-backed section.
+
+        Args:
+            id: Section id
+            title: Section title
+            label: Section label
+            buffer: Raw source bytes, e.g. an mmap of the file
+            start: Offset of the span in the buffer
+            end: End offset of the span
+            materialize: Turns the decoded span into the section's content
+            path: Hierarchy path
+            url: Source URL or file path
+        """
+        self._buffer = buffer
+        self.start = start
+        self.end = end
+        self._materialize = materialize
+        super().__init__(id=id, title=title, label=label, content=None,
+                         path=path if path is not None else [], url=url)
+
+    @property
+    def content(self) -> str:
+        """Processed content, materialized from the source span on first access."""
+        if self._content is None:
+            self._content = self._materialize(bytes(self.raw).decode("utf-8"))
+        return self._content
+
+    @content.setter
+    def content(self, value: Optional[str]) -> None:
+        self._content = value
+
+    @property
+    def raw(self) -> memoryview:
+        """Unprocessed source bytes of the section, without copying."""
+        return memoryview(self._buffer)[self.start:self.end]
+
+    def is_materialized(self) -> bool:
+        """Return True if the content has been produced."""
+        return self._content is not None
+
+    def __reduce__(self):
+        return Section.from_dict, (self.to_dict(),)
 
 
 @dataclass
@@ -68,35 +140,70 @@ class Document:
     source_url: str
     
     def save_html(self, filepath: Path) -> None:
-        """Save document as HTML file."""
-        filepath = Path(filepath)
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
+        """Save document as HTML file (atomically replaced)."""
+        with atomic_open(filepath) as f:
             f.write(f"<h1>{self.title}</h1>\n")
             for section in self.sections:
                 f.write(f"<h2>{section.title}</h2>\n")
                 f.write(section.content)
                 f.write("\n")
     
-    def save_json(self, filepath: Path) -> None:
-        """Save document as JSON file."""
-        filepath = Path(filepath)
-        filepath.parent.mkdir(parents=True, exist_ok=True)
+    def save_json(self, filepath: Path, include_text: bool = False, codec: Optional[Codec] = None) -> None:
+        """Save document as JSON file (atomically replaced); a codec's dictionary is saved alongside."""
+        data = self.to_dict(include_text=include_text, codec=codec)
+        if codec is not None:
+            codec.save(Path(filepath).parent)
         
-        data = {
-            'title': self.title,
-            'source_url': self.source_url,
-            'sections': [section.to_dict() for section in self.sections]
-        }
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
+        with atomic_open(filepath) as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert document to dictionary."""
-        return {
+    def to_dict(self, include_text: bool = False, codec: Optional[Codec] = None) -> Dict[str, Any]:
+        """Convert document to dictionary (a codec compresses each section's content)."""
+        if include_text:
+            self.extract_text()
+        data = {
             'title': self.title,
             'source_url': self.source_url,
-            'sections': [section.to_dict() for section in self.sections]
+            'sections': [section.to_dict(include_text=include_text, codec=codec) for section in self.sections]
         }
+        if codec is not None:
+            data['codec'] = codec.id
+        return data
+
+    def extract_text(self, workers: Optional[int] = None) -> None:
+        """
+        Extract plain text for every section in one batch.
+
+        Args:
+            workers: Worker processes for large documents (None for CPU count, 1 for in-process)
+        """
+        pending = [section for section in self.sections if not section.has_text()]
+        texts = extract_texts([section.content for section in pending], workers=workers)
+        for section, text in zip(pending, texts):
+            section.set_text(text)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], directory: Optional[Path] = None) -> "Document":
+        """
+        Create document from dictionary.
+
+        Args:
+            data: Dictionary from to_dict
+            directory: Where the dictionary of a compressed document is kept;
+                required unless its codec needs no dictionary or is already loaded
+
+        Raises:
+            CodecError: If the document's codec can't be loaded
+        """
+        codec = load_codec(data['codec'], directory) if 'codec' in data else None
+        return cls(
+            title=data.get('title', ''),
+            sections=[Section.from_dict(section, codec) for section in data.get('sections', [])],
+            source_url=data.get('source_url', '')
+        )
+
+    @classmethod
+    def load_json(cls, filepath: Path) -> "Document":
+        """Load document from a JSON file written by save_json."""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f), Path(filepath).parent)
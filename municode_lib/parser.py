@@ -2,7 +2,9 @@
 
 import re
 import json
-from typing import List, Optional
+import mmap
+import os
+from typing import Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 
 from bs4 import BeautifulSoup, NavigableString
@@ -14,23 +16,48 @@ try:
 except ImportError:
     HAS_HTMLMIN = False
 
-from .models import Section, Document, parse_section_title
+from .models import Section, SpanSection, Document, parse_section_title
 from .exceptions import ParsingError
+from .cache import ParseCache
+from .hierarchy import PathRecord, rebuild_paths
+from .fragments import iter_chunk_fragments
+from .fileio import atomic_open
+
+# Bump when parsing output changes so cached results are invalidated
+PARSER_VERSION = "2"
+
+# Below this many chunks a process pool costs more than it saves
+_MIN_PARALLEL_CHUNKS = 64
+
+# Parser instance owned by each pool worker process
+_worker_parser = None
+
+
+def _init_worker(hierarchy_keywords: List[str], element_tags: List[str]) -> None:
+    global _worker_parser
+    _worker_parser = MunicodeParser(hierarchy_keywords, element_tags)
+
+
+def _process_fragment(fragment: str) -> dict:
+    return _worker_parser.process_fragment(fragment)
 
 
 class MunicodeParser:
     """Parser for processing municode HTML content."""
     
-    def __init__(self, hierarchy_keywords: Optional[List[str]] = None, element_tags: Optional[List[str]] = None):
+    def __init__(self, hierarchy_keywords: Optional[List[str]] = None, element_tags: Optional[List[str]] = None,
+                 cache: Optional[ParseCache] = None):
         """
         Initialize the parser.
         
         Args:
             hierarchy_keywords: Keywords for hierarchy levels (default: ["Chapter", "Article", "Sec"])
             element_tags: HTML tags for each hierarchy level (default: ["h2", "h3", "h4", "h5", "h6"])
+            cache: Persistent cache of parse_html_file results (default: no caching)
         """
         self.hierarchy_keywords = hierarchy_keywords or ["Chapter", "Article", "Sec"]
         self.element_tags = element_tags or ["h2", "h3", "h4", "h5", "h6"]
+        self.cache = cache
     
     def _get_level(self, tag, prefix: str) -> Optional[int]:
         """Extract increment or content level from CSS class."""
@@ -54,44 +81,51 @@ class MunicodeParser:
             first_heading.decompose()
         return str(soup)
 
-    def _process_chunk(self, chunk, soup, current_path: List[Optional[str]]) -> dict:
-        """Process a single content chunk and return section data."""
-        children = list(chunk.children)
-        result = []
+    def _chunk_heading(self, chunk) -> Tuple[Optional[NavigableString], str, Optional[int]]:
+        """Return the heading text node before a chunk with its title and hierarchy level."""
         prev = chunk.previous_sibling
-        title = "Untitled Section"
-        
+
         # Handle whitespace in previous siblings
         while prev and isinstance(prev, NavigableString) and not prev.strip():
             prev = prev.previous_sibling
-        
+
         # Check for hierarchy keywords in previous sibling
-        for i, keyword in enumerate(self.hierarchy_keywords):
-            if prev and isinstance(prev, NavigableString) and keyword.lower() in prev.lower():
-                title = prev.strip()
-                
-                # Update hierarchy path
-                current_path[i] = title
-                for j in range(i + 1, len(current_path)):
-                    current_path[j] = None  # Clear lower levels
-                
-                # Create new heading element
-                tag = self.element_tags[i] if i < len(self.element_tags) else "h2"
-                new_el = soup.new_tag(tag, **{"class": "chunk-title"})
-                new_el.string = title
-                result.append(new_el)
-                prev.extract()  # Remove the previous sibling
-                break
+        if prev and isinstance(prev, NavigableString):
+            for i, keyword in enumerate(self.hierarchy_keywords):
+                if keyword.lower() in prev.lower():
+                    return prev, prev.strip(), i
 
             # if isinstance(prev, Tag) and keyword.lower() in prev.text.lower():
             #     title = prev.text.strip()
-                
-            #     # Update hierarchy path
-            #     current_path[i] = title
-            #     for j in range(i + 1, len(current_path)):
-            #         current_path[j] = None  # Clear lower levels
             #     break
 
+        return None, "Untitled Section", None
+
+    def _process_chunk(self, chunk, soup, current_path: Optional[List[Optional[str]]]) -> dict:
+        """
+        Process a single content chunk and return section data.
+
+        With current_path=None the chunk is processed independently: no
+        path is built and only its hierarchy level is recorded.
+        """
+        children = list(chunk.children)
+        result = []
+        prev, title, level = self._chunk_heading(chunk)
+
+        if prev is not None:
+            # Update hierarchy path
+            if current_path is not None:
+                current_path[level] = title
+                for j in range(level + 1, len(current_path)):
+                    current_path[j] = None  # Clear lower levels
+
+            # Create new heading element
+            tag = self.element_tags[level] if level < len(self.element_tags) else "h2"
+            new_el = soup.new_tag(tag, **{"class": "chunk-title"})
+            new_el.string = title
+            result.append(new_el)
+            prev.extract()  # Remove the previous sibling
+
         # Process child elements
         i = 0
         while i < len(children):
@@ -134,18 +168,25 @@ class MunicodeParser:
             minified_content = chunk.decode_contents()
 
         return {
-            "path": [p for p in current_path if p],
+            "path": [p for p in current_path if p] if current_path is not None else None,
+            "level": level,
             "title": title,
             "content": self._remove_first_heading(minified_content)
         }
 
-    def parse_html_file(self, filepath: str, title: Optional[str] = None) -> Document:
+    def parse_html_file(self, filepath: str, title: Optional[str] = None, stream: bool = False,
+                        use_cache: bool = True, workers: Optional[int] = 1, lazy: bool = False) -> Document:
         """
         Parse HTML file and return structured Document.
         
         Args:
             filepath: Path to the HTML file
             title: Optional title for the document (defaults to filename)
+            stream: Parse chunk by chunk with bounded memory (see iter_html_file)
+            use_cache: Consult and fill self.cache (set False to force a fresh parse)
+            workers: Processes for chunk-level parallel parsing (None for CPU count)
+            lazy: Memory-map the file and return SpanSections whose content is
+                processed on first access (see parse_html_buffer); bypasses the cache
             
         Returns:
             Document object containing parsed sections
@@ -156,14 +197,172 @@ class MunicodeParser:
         
         if title is None:
             title = filepath.stem
-            
+
+        if lazy:
+            return self.parse_html_buffer(self._map_file(filepath), title, str(filepath))
+
+        cache_key = None
+        if self.cache is not None and use_cache:
+            cache_key = self._cache_key(filepath, "stream" if stream else "full")
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._relabel(cached, title, str(filepath))
+
+        if stream:
+            sections = list(self.iter_html_file(filepath))
+            document = Document(title=title, sections=sections, source_url=str(filepath))
+        else:
+            try:
+                with open(filepath, encoding="utf-8") as f:
+                    document = self.parse_html_string(f.read(), title, str(filepath), workers=workers)
+            except Exception as e:
+                raise ParsingError(f"Failed to parse file {filepath}: {e}")
+
+        if cache_key is not None:
+            self.cache.put(cache_key, document)
+        return document
+
+    def _map_file(self, filepath: Path) -> Union[bytes, mmap.mmap]:
+        """Memory-map a file read-only (empty files can't be mapped)."""
+        try:
+            with open(filepath, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b""
+                # The mapping stays valid after the file is closed
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError as e:
+            raise ParsingError(f"Failed to read file {filepath}: {e}")
+
+    def parse_html_buffer(self, buffer: Union[bytes, mmap.mmap], title: str = "Untitled",
+                          source_url: str = "") -> Document:
+        """
+        Parse UTF-8 HTML bytes into sections that reference the buffer.
+
+        Only the heading siblings before each 'chunk-content' div are parsed
+        up front, which is enough for ids, labels, titles and paths. Each
+        section's content is processed from its span of the buffer when it
+        is first accessed, with the same result as process_fragment, so
+        jobs that read few sections skip most of the parsing work.
+
+        Args:
+            buffer: Raw HTML, e.g. an mmap of the file (kept alive by the sections)
+            title: Title for the document
+            source_url: Source URL or file path
+
+        Returns:
+            Document of SpanSection objects
+        """
+        try:
+            spans = []
+            records = []
+            for fragment in iter_chunk_fragments(buffer):
+                # Parse just the chunk's preceding siblings and read the heading as _process_chunk does
+                soup = BeautifulSoup(bytes(buffer[fragment.text_start:fragment.start]).decode("utf-8"), "html.parser")
+                marker = soup.new_tag("div")
+                soup.append(marker)
+                _, chunk_title, level = self._chunk_heading(marker)
+                section_id = parse_section_title(chunk_title)[0]
+                records.append(PathRecord(section_id=section_id, level=level, key=chunk_title))
+                spans.append((fragment, chunk_title))
+
+            paths = rebuild_paths(records, len(self.hierarchy_keywords))
+            sections = []
+            for (fragment, chunk_title), path in zip(spans, paths):
+                section_id, label, parsed_title = parse_section_title(chunk_title)
+                sections.append(SpanSection(
+                    id=section_id,
+                    title=parsed_title,
+                    label=label,
+                    buffer=buffer,
+                    start=fragment.text_start,
+                    end=fragment.end,
+                    materialize=self._fragment_content,
+                    path=path,
+                    url=source_url
+                ))
+            return Document(title=title, sections=sections, source_url=source_url)
+        except Exception as e:
+            raise ParsingError(f"Failed to parse HTML content: {e}")
+
+    def _fragment_content(self, fragment: str) -> str:
+        return self.process_fragment(fragment)["content"]
+
+    def _cache_key(self, filepath: Path, mode: str) -> str:
+        """Hash a file's bytes together with this parser's configuration, parse mode and minification."""
+        def read_blocks():
+            with open(filepath, "rb") as f:
+                while True:
+                    block = f.read(1 << 20)
+                    if not block:
+                        return
+                    yield block
+
+        return ParseCache.make_key(read_blocks(), self.hierarchy_keywords, self.element_tags, PARSER_VERSION, mode,
+                                   minified=HAS_HTMLMIN)
+
+    def _relabel(self, document: Document, title: str, source_url: str) -> Document:
+        """Point a cached Document at the file it was requested for."""
+        document.title = title
+        document.source_url = source_url
+        for section in document.sections:
+            section.url = source_url
+        return document
+
+    def iter_html_file(self, filepath: str) -> Iterator[Section]:
+        """
+        Incrementally parse an HTML file, yielding sections as chunks complete.
+
+        The file is memory-mapped and split into 'chunk-content' fragments
+        (see iter_chunk_fragments). Each fragment is parsed on its own with
+        the same tree builder as parse_html_string, so implicitly closed
+        tags like <p>a<p>b come out the same, and memory stays bounded
+        by the largest chunk whatever the file size. The hierarchy path is
+        carried across chunks as in parse_html_string.
+
+        Args:
+            filepath: Path to the HTML file
+
+        Yields:
+            Section objects in document order
+        """
+        filepath = Path(filepath)
+        if not filepath.exists():
+            raise ParsingError(f"File not found: {filepath}")
+
+        source_url = str(filepath)
+        current_path = [None] * len(self.hierarchy_keywords)
+        buffer = self._map_file(filepath)
         try:
-            with open(filepath, encoding="utf-8") as f:
-                return self.parse_html_string(f.read(), title, str(filepath))
+            for fragment in iter_chunk_fragments(buffer):
+                soup = BeautifulSoup(bytes(buffer[fragment.text_start:fragment.end]).decode("utf-8"), "html.parser")
+                chunk = soup.find("div", class_="chunk-content")
+                yield self._build_section(self._process_chunk(chunk, soup, current_path), source_url)
         except Exception as e:
             raise ParsingError(f"Failed to parse file {filepath}: {e}")
+        finally:
+            if hasattr(buffer, "close"):
+                buffer.close()
 
-    def parse_html_string(self, html_content: str, title: str = "Untitled", source_url: str = "") -> Document:
+    def _build_section(self, chunk_data: dict, source_url: str) -> Section:
+        """Create a Section from processed chunk data."""
+        # Parse the title to extract id, label, and title components
+        section_id, label, parsed_title = parse_section_title(chunk_data["title"])
+        
+        # Include current section ID in path
+        section_path = chunk_data["path"].copy()
+        section_path.append(section_id)
+        
+        return Section(
+            id=section_id,
+            title=parsed_title,
+            label=label,
+            content=chunk_data["content"],
+            path=section_path,
+            url=source_url
+        )
+
+    def parse_html_string(self, html_content: str, title: str = "Untitled", source_url: str = "",
+                          deferred_paths: bool = False, workers: Optional[int] = 1) -> Document:
         """
         Parse HTML string and return structured Document.
         
@@ -171,41 +370,100 @@ class MunicodeParser:
             html_content: HTML content to parse
             title: Title for the document
             source_url: Source URL or file path
+            deferred_paths: Process chunks independently and rebuild all
+                paths in a final pass (see build_sections)
+            workers: Processes for chunk-level parallel parsing (None for
+                CPU count, 1 for in-process); implies deferred paths
             
         Returns:
             Document object containing parsed sections
         """
+        if workers != 1:
+            return self._parse_parallel(html_content, title, source_url, workers)
+
         try:
             soup = BeautifulSoup(html_content, "html.parser")
+            chunks = soup.find_all("div", class_="chunk-content")
+
+            if deferred_paths:
+                chunk_data = [self._process_chunk(chunk, soup, None) for chunk in chunks]
+                return Document(title=title, sections=self.build_sections(chunk_data, source_url),
+                                source_url=source_url)
+
             current_path = [None] * len(self.hierarchy_keywords)
             sections = []
             
             # Process each content chunk
-            for chunk in soup.find_all("div", class_="chunk-content"):
+            for chunk in chunks:
                 chunk_data = self._process_chunk(chunk, soup, current_path)
-                
-                # Parse the title to extract id, label, and title components
-                section_id, label, parsed_title = parse_section_title(chunk_data["title"])
-                
-                # Include current section ID in path
-                section_path = chunk_data["path"].copy()
-                section_path.append(section_id)
-                
-                section = Section(
-                    id=section_id,
-                    title=parsed_title,
-                    label=label,
-                    content=chunk_data["content"],
-                    path=section_path,
-                    url=source_url
-                )
-                sections.append(section)
+                sections.append(self._build_section(chunk_data, source_url))
             
             return Document(title=title, sections=sections, source_url=source_url)
             
         except Exception as e:
             raise ParsingError(f"Failed to parse HTML content: {e}")
 
+    def process_fragment(self, fragment: str) -> dict:
+        """
+        Process one chunk fragment independently.
+
+        Args:
+            fragment: Heading text followed by a single 'chunk-content' div
+
+        Returns:
+            Chunk data as from _process_chunk(..., current_path=None)
+        """
+        soup = BeautifulSoup(fragment, "html.parser")
+        chunk = soup.find("div", class_="chunk-content")
+        return self._process_chunk(chunk, soup, None)
+
+    def _parse_parallel(self, html_content: str, title: str, source_url: str,
+                        workers: Optional[int]) -> Document:
+        """Split raw HTML into chunk fragments and process them in a pool."""
+        try:
+            fragments = [html_content[f.text_start:f.end] for f in iter_chunk_fragments(html_content)]
+            if len(fragments) < _MIN_PARALLEL_CHUNKS:
+                chunk_data = [self.process_fragment(fragment) for fragment in fragments]
+            else:
+                from concurrent.futures import ProcessPoolExecutor
+
+                pool_size = workers or os.cpu_count() or 1
+                chunksize = max(1, len(fragments) // (pool_size * 4))
+                with ProcessPoolExecutor(max_workers=pool_size, initializer=_init_worker,
+                                         initargs=(self.hierarchy_keywords, self.element_tags)) as pool:
+                    chunk_data = list(pool.map(_process_fragment, fragments, chunksize=chunksize))
+
+            return Document(title=title, sections=self.build_sections(chunk_data, source_url),
+                            source_url=source_url)
+        except Exception as e:
+            raise ParsingError(f"Failed to parse HTML content: {e}")
+
+    def build_sections(self, chunk_data: List[dict], source_url: str = "") -> List[Section]:
+        """
+        Build sections from independently processed chunks.
+
+        Paths are reconstructed in one pass from each chunk's recorded
+        level, giving the same result as sequential parsing.
+
+        Args:
+            chunk_data: Results of _process_chunk(..., current_path=None), in document order
+            source_url: Source URL or file path
+
+        Returns:
+            List of sections with paths filled in
+        """
+        records = []
+        for data in chunk_data:
+            section_id = parse_section_title(data["title"])[0]
+            records.append(PathRecord(section_id=section_id, level=data["level"], key=data["title"]))
+
+        paths = rebuild_paths(records, len(self.hierarchy_keywords))
+        sections = []
+        for data, path in zip(chunk_data, paths):
+            # Paths from rebuild_paths already end with the section id
+            sections.append(self._build_section(dict(data, path=path[:-1]), source_url))
+        return sections
+
     def save_processed_html(self, document: Document, output_path: str) -> None:
         """
         Save processed document as HTML file.
@@ -214,11 +472,8 @@ class MunicodeParser:
             document: Document to save
             output_path: Path for output file
         """
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
         try:
-            with open(output_path, "w", encoding="utf-8") as f:
+            with atomic_open(output_path) as f:
                 f.write(f"<h1>{document.title}</h1>\n")
                 for section in document.sections:
                     f.write(section.content)
@@ -227,20 +482,18 @@ class MunicodeParser:
         except Exception as e:
             raise ParsingError(f"Failed to save HTML file: {e}")
 
-    def save_structured_json(self, document: Document, output_path: str) -> None:
+    def save_structured_json(self, document: Document, output_path: str, include_text: bool = False) -> None:
         """
         Save document as structured JSON file.
         
         Args:
             document: Document to save
             output_path: Path for output JSON file
+            include_text: Add a plain 'text' field to each section
         """
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
         try:
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(document.to_dict(), f, indent=2, ensure_ascii=False)
+            with atomic_open(output_path) as f:
+                json.dump(document.to_dict(include_text=include_text), f, indent=2, ensure_ascii=False)
             print(f"Saved structured JSON to {output_path}")
         except Exception as e:
             raise ParsingError(f"Failed to save JSON file: {e}")
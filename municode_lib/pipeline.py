@@ -0,0 +1,172 @@
+"""Pipelined crawling that overlaps page loading with parsing."""
+
+from typing import Iterator, List, Optional
+import queue
+import threading
+
+from .models import Section, Document
+from .filters import PathFilter
+from .exceptions import ScrapingError
+
+_DONE = object()
+
+
+class PipelinedCrawler:
+    """
+    Crawl a full municode with page loads running ahead of parsing.
+
+    A background thread owns the browser: it expands the 'mcc-codes-toc'
+    navigation one entry at a time and loads content pages into a bounded
+    queue. The caller's thread parses each page while the next one is
+    already loading, so sections are yielded before the rest of the TOC
+    has been expanded.
+    """
+
+    def __init__(self, scraper, prefetch: int = 2, include: Optional[List[str]] = None,
+                 exclude: Optional[List[str]] = None):
+        """
+        Initialize the crawler.
+
+        Args:
+            scraper: MunicodeScraper whose browser the fetch thread will drive
+            prefetch: Number of loaded pages allowed to wait for parsing
+            include: Patterns of TOC entries to crawl (see filters.Pattern)
+            exclude: Patterns of TOC entries to skip
+        """
+        self.scraper = scraper
+        self.prefetch = max(1, prefetch)
+        self.path_filter = PathFilter(include, exclude)
+
+    def _put(self, pages: queue.Queue, stop: threading.Event, item) -> bool:
+        """Put an item on the queue, giving up if the consumer went away."""
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fetch(self, url: str, pages: queue.Queue, stop: threading.Event) -> None:
+        """Expand the TOC lazily and load content pages (fetch thread)."""
+        scraper = self.scraper
+        try:
+            for entry_url, inherited in scraper._select_entries(url, self.path_filter):
+                if stop.is_set():
+                    return
+                print(f"🔗 Processing URL: {entry_url}")
+                try:
+                    toc = scraper._expand_section_toc(entry_url, self.path_filter, inherited)
+                except ScrapingError as e:
+                    print(f"❌ Failed to scrape {entry_url}: {e}")
+                    continue
+
+                # Parsed sections are filtered again: a root content page is
+                # selected only as far as its entry is, and pages the TOC
+                # selected may still hold excluded subsections
+                if toc is None:
+                    title, document_id, page_urls = None, None, [entry_url]
+                    page_inherited = inherited
+                else:
+                    title, document_id, page_urls = toc
+                    page_inherited = True
+
+                if not self._put(pages, stop, ("start", entry_url, title)):
+                    return
+                for page_url in page_urls:
+                    print(f"🔗 Parsing {page_url}")
+                    try:
+                        page = scraper._fetch_page(page_url)
+                    except ScrapingError as e:
+                        print(f"❌ {e}")
+                        continue
+                    if page is not None and not self._put(pages, stop, ("page", page_url, document_id, page, page_inherited)):
+                        return
+                if not self._put(pages, stop, ("end", entry_url, title)):
+                    return
+        except Exception as e:
+            self._put(pages, stop, ("error", e))
+        finally:
+            self._put(pages, stop, _DONE)
+
+    def _iter_events(self, url: str) -> Iterator[tuple]:
+        """Yield parsed sections and document boundaries as they complete."""
+        if not self.scraper.driver:
+            self.scraper._setup_driver()
+
+        pages: queue.Queue = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        fetcher = threading.Thread(target=self._fetch, args=(url, pages, stop), daemon=True)
+        fetcher.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is _DONE:
+                    break
+                kind = item[0]
+                if kind == "page":
+                    _, page_url, document_id, page, page_inherited = item
+                    try:
+                        sections = self.scraper._parse_page_html(page.html, page_url, document_id)
+                    except ScrapingError as e:
+                        print(f"❌ {e}")
+                        continue
+                    if not self.scraper._claim_page(page):
+                        continue
+                    if self.path_filter:
+                        sections = self.path_filter.select(sections, page_inherited)
+                    for section in sections:
+                        yield ("section", section)
+                elif kind == "error":
+                    raise item[1]
+                else:
+                    yield item
+        finally:
+            stop.set()
+            fetcher.join()
+
+    def iter_sections(self, url: str) -> Iterator[Section]:
+        """
+        Yield sections of the full municode as soon as each is parsed.
+
+        Args:
+            url: The base Municode URL to scrape.
+        """
+        for event in self._iter_events(url):
+            if event[0] == "section":
+                yield event[1]
+
+    def iter_documents(self, url: str) -> Iterator[Document]:
+        """
+        Yield one Document per top-level TOC entry as soon as it completes.
+
+        Args:
+            url: The base Municode URL to scrape.
+        """
+        sections: List[Section] = []
+        for event in self._iter_events(url):
+            kind = event[0]
+            if kind == "start":
+                sections = []
+            elif kind == "section":
+                sections.append(event[1])
+            elif kind == "end":
+                _, entry_url, title = event
+                if title is None:
+                    # Root content page: title comes from the first section
+                    if not sections:
+                        continue
+                    title = sections[0].label
+                yield Document(title=title, sections=sections, source_url=entry_url)
+
+    def crawl(self, url: str) -> List[Document]:
+        """
+        Scrape entire municode and return list of Documents.
+
+        Args:
+            url: The base Municode URL to scrape.
+
+        Returns:
+            List of Document objects, same as MunicodeScraper.scrape_full.
+        """
+        return list(self.iter_documents(url))
@@ -1,27 +1,39 @@
 """Web scraper for municode content."""
 
-from typing import List, Optional
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 from pathlib import Path
 import time
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 
 from .models import Section, Document, parse_section_title
+from .seen import SeenSet
+from .session import BrowserSession, create_driver
+from .watchdog import DriverWatchdog
+from .extract import extract_toc_links, extract_page_payload
+from .filters import PathFilter
+from .hierarchy import PathRecord, rebuild_paths
+from .urls import node_id_from_url
 from .exceptions import ScrapingError, InvalidUrlError, ElementNotFoundError
 
 
+class FetchedPage(NamedTuple):
+    """A loaded content page, not yet recorded in the seen-set."""
+    html: str                 # Outer HTML of the 'ul.chunks' list
+    heading: str              # First line of the chunk heading
+    node_id: Optional[str]
+
+
 class MunicodeScraper:
     """Web scraper for municode content."""
     
     def __init__(self, headless: bool = True, timeout: int = 10, output_dir: str = "data",
-                 hierarchy_keywords: List[str] = None):
+                 hierarchy_keywords: List[str] = None, seen: Optional[SeenSet] = None,
+                 session: Optional[BrowserSession] = None, page_load_strategy: str = "normal",
+                 block_resources: bool = False, watchdog: Optional[DriverWatchdog] = None):
         """
         Initialize the scraper.
 
@@ -30,13 +42,22 @@ class MunicodeScraper:
             timeout: Default timeout for element waits in seconds
             output_dir: Directory for output files
             hierarchy_keywords: Keywords for hierarchy levels (default: ["Chapter", "Article", "Sec"])
+            seen: Record of already-parsed pages, shareable across runs and workers (default: in-memory)
+            session: Warm browser session to attach to instead of launching a browser
+            page_load_strategy: "normal", "eager" or "none" (ignored when attaching to a session)
+            block_resources: Block images, fonts and analytics (ignored when attaching to a session)
+            watchdog: Restarts the browser when it has served too many pages or degrades
         """
         self.headless = headless
         self.timeout = timeout
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.driver = None
-        self.parsed_headings = []
+        self.seen = seen if seen is not None else SeenSet()
+        self.session = session
+        self.page_load_strategy = page_load_strategy
+        self.block_resources = block_resources
+        self.watchdog = watchdog
         self.hierarchy_keywords = hierarchy_keywords or ["Chapter", "Article", "Sec"]
         
     def __enter__(self):
@@ -46,25 +67,52 @@ class MunicodeScraper:
     
     def __exit__(self, exc_type, exc_value, traceback):
         """Context manager exit point."""
+        self.close()
+
+    def close(self):
+        """Quit the browser, or detach from a shared session."""
         if self.driver:
-            self.driver.quit()
+            if self.session:
+                self.session.release(self)
+            else:
+                self.driver.quit()
+            self.driver = None
 
     def _setup_driver(self):
         """Setup Chrome WebDriver with appropriate options."""
-        options = Options()
-        if self.headless:
-            options.add_argument("--headless")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-
-        self.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=options
+        if self.session:
+            self.driver = self.session.attach(self)
+            return
+
+        self.driver = create_driver(
+            headless=self.headless,
+            page_load_strategy=self.page_load_strategy,
+            block_resources=self.block_resources
         )
 
-    def _wait_for_element(self, url: str, by: By, value: str, timeout: Optional[int] = None) -> bool:
+    def _recycle_driver(self, reason: str) -> None:
+        """
+        Replace the browser with a fresh one.
+
+        Crawl state (seen set, TOC lists, hierarchy) lives in the scraper,
+        so the crawl continues with the next navigation.
+        """
+        print(f"♻️ Restarting browser: {reason}")
+        if self.session:
+            self.driver = self.session.restart()
+        else:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+            self._setup_driver()
+        if self.watchdog:
+            self.watchdog.restarts += 1
+            self.watchdog.reset()
+
+    def _wait_for_element(self, url: str, by: By, value: str, timeout: Optional[int] = None,
+                          may_be_missing: bool = False) -> bool:
         """
         Navigates to the given URL and waits for the element to load.
 
@@ -73,15 +121,49 @@ class MunicodeScraper:
             by: The method to locate the element (e.g., By.XPATH, By.ID).
             value: The value to locate the element (e.g., the XPath or ID).
             timeout: Time to wait in seconds (default: self.timeout).
+            may_be_missing: The element is a probe that some pages lack, so
+                a timeout is not counted as a failed load by the watchdog.
+
+        Returns:
+            True if the element is found, False otherwise.
+        """
+        if self.watchdog:
+            # Only restart between pages, never while one is being read
+            reason = self.watchdog.check(self.driver)
+            if reason:
+                self._recycle_driver(reason)
+
+        start = time.monotonic()
+        try:
+            self.driver.get(url)
+        except Exception:
+            if self.watchdog:
+                self.watchdog.record(None, ok=False)
+            return False
+        found = self._wait_for_present(by, value, timeout)
+        if self.watchdog:
+            if found:
+                self.watchdog.record(time.monotonic() - start)
+            else:
+                self.watchdog.record(None, ok=may_be_missing)
+        return found
+
+    def _wait_for_present(self, by: By, value: str, timeout: Optional[int] = None) -> bool:
+        """
+        Waits for an element on the current page without navigating.
+
+        Args:
+            by: The method to locate the element (e.g., By.XPATH, By.ID).
+            value: The value to locate the element (e.g., the XPath or ID).
+            timeout: Time to wait in seconds (default: self.timeout).
 
         Returns:
             True if the element is found, False otherwise.
         """
         if timeout is None:
             timeout = self.timeout
-            
+
         try:
-            self.driver.get(url)
             WebDriverWait(self.driver, timeout).until(
                 EC.presence_of_element_located((by, value))
             )
@@ -89,74 +171,136 @@ class MunicodeScraper:
         except Exception:
             return False
 
-    def _parse_sections(self, url: str, document_id: str) -> List[Section]:
-        """Parse sections from a municode page."""
-        sections = []
-        print(f"🔗 Parsing {url}")
-        
-        # Initialize hierarchy tracking
-        current_hierarchy = [None] * len(self.hierarchy_keywords)  # Track current section at each level
-        current_hierarchy[0] = document_id  # Set root ID
-        
-        # Check if the url has already been parsed
+    def _fetch_page(self, url: str) -> Optional[FetchedPage]:
+        """
+        Load a municode content page and return its chunk list HTML.
+
+        The page is not recorded as parsed here; call _claim_page once its
+        sections have been parsed, so a page that fails midway is retried.
+
+        Args:
+            url: URL of the content page.
+
+        Returns:
+            FetchedPage once 'codesContent' is present, or None if the page
+            was already parsed or has an empty heading.
+
+        Raises:
+            ScrapingError: If the page failed to load or timed out, so
+                callers can retry it.
+        """
+        # Skip nodes already handled by this or another run before navigating
+        node_id = node_id_from_url(url)
+        if self.seen.has_node(node_id):
+            print(f"🔍 Already parsed: {node_id}")
+            return None
+
+        # Check if the page heading has already been parsed
         try:
             if not self._wait_for_element(url, By.CLASS_NAME, "chunk-heading"):
-                print(f"{url} contains no 'chunk-heading' element")
-                return sections
+                raise ScrapingError(f"{url} contains no 'chunk-heading' element")
                 
-            chunk_heading = self.driver.find_element(By.CLASS_NAME, "chunk-heading")
-            chunk_heading_text = chunk_heading.text.splitlines()[0]
+            chunk_heading_text = extract_page_payload(self.driver, include_chunks=False)["heading"]
+            if not chunk_heading_text:
+                print(f"{url} contains an empty 'chunk-heading' element")
+                return None
 
-            if chunk_heading_text in self.parsed_headings:
+            if self.seen.has_heading(chunk_heading_text):
                 print(f"🔍 Already parsed: {chunk_heading_text}")
-                return sections
-            self.parsed_headings.append(chunk_heading_text)
+                return None
 
+            if not self._wait_for_present(By.ID, "codesContent"):
+                raise ScrapingError(f"{url} timed out waiting for 'codesContent'")
+            # Only the serialized chunk list crosses the wire, not page_source
+            html = extract_page_payload(self.driver)["chunks"]
+            return FetchedPage(html=html, heading=chunk_heading_text, node_id=node_id)
+        except ScrapingError:
+            time.sleep(1)
+            raise
         except Exception as e:
-            print(f"❌ Error loading {url}: {e}")
             time.sleep(1)
-            return sections
+            raise ScrapingError(f"Error loading {url}: {e}")
+
+    def _claim_page(self, page: FetchedPage) -> bool:
+        """
+        Record a parsed page in the seen-set.
+
+        Returns:
+            False if another run or worker recorded the same page first
+        """
+        if self.seen.claim(page.heading, page.node_id):
+            return True
+        print(f"🔍 Already parsed: {page.heading}")
+        return False
+
+    def _parse_page_html(self, html: str, url: str, document_id: Optional[str] = None) -> List[Section]:
+        """
+        Parse sections out of a loaded content page.
+
+        Args:
+            html: Chunk list (or full page) HTML returned by _fetch_page.
+            url: URL the page was loaded from.
+            document_id: ID of the enclosing document (root of every path).
+
+        Returns:
+            List of sections found in the page's 'chunks' list.
+
+        Raises:
+            ScrapingError: If the chunk list can't be parsed.
+        """
+        sections = []
+        records = []
 
         try:
-            if self._wait_for_element(url, By.ID, "codesContent"):
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                chunks = soup.find('ul', class_='chunks')
-
-                if chunks:
-                    li_list = chunks.find_all('li')
-                    for i, li in enumerate(li_list): 
-                        title_elem = li.find('div', class_='chunk-title')
-                        if not title_elem:
-                            continue
-                        content_elem = li.find('div', class_='chunk-content')
-                        
-                        # Parse the title to extract id, label, and title components
-                        full_title = title_elem.get_text(strip=True)
-                        section_id, label, parsed_title = parse_section_title(full_title)
-                        
-                        # Determine hierarchy level and update tree structure
-                        hierarchy_level = self._get_hierarchy_level(label)
-                        section_path = self._update_hierarchy_tree(
-                            current_hierarchy, hierarchy_level, section_id
-                        )
-                        
-                        section = Section(
-                            id=section_id,
-                            title=parsed_title,
-                            label=label,
-                            content=str(content_elem) if content_elem else "",
-                            path=section_path.copy(),
-                            url=url
-                        )
-                        sections.append(section)
-                        
-                        # Debug output
-                        print(f"📋 {label} -> Level {hierarchy_level} -> Path: {section_path}")
-                        
+            soup = BeautifulSoup(html, 'html.parser')
+            chunks = soup.find('ul', class_='chunks')
+
+            if chunks:
+                li_list = chunks.find_all('li')
+                for i, li in enumerate(li_list): 
+                    title_elem = li.find('div', class_='chunk-title')
+                    if not title_elem:
+                        continue
+                    content_elem = li.find('div', class_='chunk-content')
+                    
+                    # Parse the title to extract id, label, and title components
+                    full_title = title_elem.get_text(strip=True)
+                    section_id, label, parsed_title = parse_section_title(full_title)
+                    
+                    # Record the hierarchy level; paths are built after the loop
+                    hierarchy_level = self._get_hierarchy_level(label)
+                    records.append(PathRecord(section_id=section_id, level=hierarchy_level, key=section_id))
+                    
+                    section = Section(
+                        id=section_id,
+                        title=parsed_title,
+                        label=label,
+                        content=str(content_elem) if content_elem else "",
+                        url=url
+                    )
+                    sections.append(section)
+                    
         except Exception as e:
-            print(f"❌ Error parsing {url}: {e}")
-            time.sleep(1)
+            raise ScrapingError(f"Error parsing {url}: {e}")
 
+        # Same paths as _update_hierarchy_tree applied in page order
+        paths = rebuild_paths(records, len(self.hierarchy_keywords), root=document_id, append_id=False)
+        for section, record, path in zip(sections, records, paths):
+            section.path = path
+            # Debug output
+            print(f"📋 {section.label} -> Level {record.level} -> Path: {path}")
+
+        return sections
+
+    def _parse_sections(self, url: str, document_id: Optional[str] = None) -> List[Section]:
+        """Parse sections from a municode page (raises ScrapingError if it fails to load or parse)."""
+        print(f"🔗 Parsing {url}")
+        page = self._fetch_page(url)
+        if page is None:
+            return []
+        sections = self._parse_page_html(page.html, url, document_id)
+        if not self._claim_page(page):
+            return []
         return sections
 
     def _is_root_url(self, url: str) -> bool:
@@ -164,7 +308,7 @@ class MunicodeScraper:
         Determines if the given URL is a root URL by checking for TOC element.
         """
         toc_xpath = "/html/body/div[3]/div[2]/ui-view/mcc-codes/div[7]/main/div[1]/mcc-codes-content/div/div[2]/div[2]/ul"
-        return not self._wait_for_element(url, By.XPATH, toc_xpath)
+        return not self._wait_for_element(url, By.XPATH, toc_xpath, may_be_missing=True)
 
     def _click_load_more_button(self, url: str) -> bool:
         """Attempt to click 'Load More' button if present."""
@@ -238,87 +382,319 @@ class MunicodeScraper:
         
         return path
 
-    def scrape_section(self, url: str) -> Optional[Document]:
+    def _section_toc_links(self, url: str) -> Optional[List[Dict[str, str]]]:
         """
-        Scrape a single section and return Document object.
-        
+        Read the links of a section page's TOC list.
+
         Args:
-            url: The Municode URL to scrape.
-            
+            url: Section URL with a TOC list.
+
         Returns:
-            Document object containing scraped content, or None if failed.
-        """
-        if not self.driver:
-            self._setup_driver()
-            
-        # Validate URL
-        if "?nodeId=" not in url:
-            raise InvalidUrlError(f"URL is not a valid section URL: {url}")
+            List of {"href": ..., "text": ...} dicts in TOC order, or None
+            if the URL is a root content page without a TOC.
 
+        Raises:
+            ElementNotFoundError: If the TOC list does not load.
+        """
         # Check if the URL is a root URL
         if self._is_root_url(url):
-            print(f"🔗 Processing root URL: {url}")
-            sections = self._parse_sections(url)
-            if not sections:
-                return None
-            
-            title = sections[0].label if sections else "Unknown"
-            return Document(title=title, sections=sections, source_url=url)
+            return None
 
-        # Handle section with TOC
+        # Handle section with TOC (already loaded by the root URL check)
         section_toc_xpath = "/html/body/div[3]/div[2]/ui-view/mcc-codes/div[7]/main/div[1]/mcc-codes-content/div/div[2]/div[2]/ul"
 
-        if not self._wait_for_element(url, By.XPATH, section_toc_xpath):
+        if not self._wait_for_present(By.XPATH, section_toc_xpath):
             raise ElementNotFoundError(f"Failed to load TOC page at {url}")
         
         # Try to click load more button
         self._click_load_more_button(url)
 
-        # Get all section URLs from TOC
-        a_tags = self.driver.find_element(By.XPATH, section_toc_xpath).find_elements(By.TAG_NAME, "a")
-        toc_url_list = [a.get_attribute('href') for a in a_tags]
+        # Get all section links from TOC
+        links = extract_toc_links(self.driver, section_toc_xpath)
+        if links is None:
+            raise ElementNotFoundError(f"Failed to load TOC page at {url}")
+        return links
+
+    def _expand_section_toc(self, url: str, path_filter: Optional[PathFilter] = None,
+                            inherited: bool = False) -> Optional[Tuple[str, str, List[str]]]:
+        """
+        Expand the table of contents of a section page.
+
+        Args:
+            url: Section URL with a TOC list.
+            path_filter: Keep only the content pages of selected TOC entries.
+            inherited: The section itself is already selected by path_filter.
+
+        Returns:
+            Tuple of (document title, document id, content page URLs), or
+            None if the URL is a root content page without a TOC.
+
+        Raises:
+            ElementNotFoundError: If the TOC list does not load.
+        """
+        links = self._section_toc_links(url)
+        if links is None:
+            return None
+        toc_url_list = [link['href'] for link in links]
         
-        all_sections = []
-        title = a_tags[0].text if a_tags else "None"
+        title = links[0]['text'] if links else "None"
         document_id, _, _ = parse_section_title(title)
 
+        if path_filter:
+            # Prune on the TOC entries before any content page is loaded
+            selected = path_filter.select(self._outline_sections(links, document_id), inherited)
+            toc_url_list = [section.url for section in selected]
+        return title, document_id, toc_url_list
+
+    def _full_toc_links(self, url: str) -> List[Dict[str, str]]:
+        """
+        Collect the top-level entries of the 'mcc-codes-toc' navigation.
+
+        Args:
+            url: The base Municode URL.
+
+        Returns:
+            List of {"href": ..., "text": ...} dicts in navigation order.
+
+        Raises:
+            ElementNotFoundError: If the navigation tree does not load.
+        """
+        full_toc_xpath = "/html/body/div[3]/div[2]/ui-view/mcc-codes/div[7]/nav/div[2]/div[2]/mcc-codes-toc/mcc-product-toc/div/ul"
+        
+        if not self._wait_for_element(url, By.XPATH, full_toc_xpath):
+            raise ElementNotFoundError(f"Failed to load full TOC page at {url}")
+
+        links = extract_toc_links(self.driver, full_toc_xpath)
+        if links is None:
+            raise ElementNotFoundError(f"Failed to load full TOC page at {url}")
+        return links
+
+    def _get_full_toc(self, url: str) -> List[str]:
+        """
+        Collect the top-level URLs of the 'mcc-codes-toc' navigation.
+
+        Args:
+            url: The base Municode URL.
+
+        Returns:
+            List of top-level section URLs.
+
+        Raises:
+            ElementNotFoundError: If the navigation tree does not load.
+        """
+        return [link['href'] for link in self._full_toc_links(url)]
+
+    def _outline_sections(self, links: List[Dict[str, str]], document_id: Optional[str] = None) -> List[Section]:
+        """
+        Build content-less sections from TOC link texts.
+
+        Args:
+            links: TOC links in order, as from extract_toc_links.
+            document_id: ID of the enclosing document (root of every path).
+
+        Returns:
+            Sections with id, label, title, path and url filled in. Links
+            without text keep their URL under an id made from the nodeId.
+        """
+        sections = []
+        records = []
+        for i, link in enumerate(links):
+            section_id, label, title = parse_section_title(link['text'] or "")
+            if not section_id:
+                node_id = node_id_from_url(link['href'])
+                section_id = node_id.lower().replace("_", "-") if node_id else f"entry-{i}"
+            records.append(PathRecord(section_id=section_id, level=self._get_hierarchy_level(label), key=section_id))
+            sections.append(Section(id=section_id, title=title, label=label, content="", url=link['href']))
+
+        paths = rebuild_paths(records, len(self.hierarchy_keywords), root=document_id, append_id=False)
+        for section, path in zip(sections, paths):
+            section.path = path
+        return sections
+
+    def _select_entries(self, url: str, path_filter: Optional[PathFilter] = None) -> List[Tuple[str, bool]]:
+        """
+        Collect the top-level TOC entries that may hold selected sections.
+
+        Args:
+            url: The base Municode URL.
+            path_filter: Include/exclude filter (default: keep everything).
+
+        Returns:
+            List of (entry URL, whether the whole entry is selected).
+        """
+        entries = []
+        for link in self._full_toc_links(url):
+            if not path_filter:
+                entries.append((link['href'], False))
+                continue
+            section_id, label, _ = parse_section_title(link['text'])
+            if not path_filter.may_contain(section_id, label, [section_id]):
+                print(f"⏭️ Skipping {label or link['href']}")
+                continue
+            entries.append((link['href'], path_filter.matches(section_id, label, [section_id])))
+        return entries
+
+    def _scrape_entry(self, url: str, path_filter: Optional[PathFilter] = None,
+                      inherited: bool = False) -> Optional[Document]:
+        """Scrape one TOC entry, keeping only sections selected by path_filter."""
+        toc = self._expand_section_toc(url, path_filter, inherited)
+        if toc is None:
+            print(f"🔗 Processing root URL: {url}")
+            try:
+                sections = self._parse_sections(url)
+            except ScrapingError as e:
+                print(f"❌ {e}")
+                return None
+            if path_filter:
+                sections = path_filter.select(sections, inherited)
+            if not sections:
+                return None
+            
+            title = sections[0].label if sections else "Unknown"
+            return Document(title=title, sections=sections, source_url=url)
+
+        title, document_id, toc_url_list = toc
+        if path_filter and not toc_url_list:
+            return None
+
+        all_sections = []
         for section_url in toc_url_list:
-            sections = self._parse_sections(section_url, document_id=document_id)
+            try:
+                sections = self._parse_sections(section_url, document_id=document_id)
+            except ScrapingError as e:
+                print(f"❌ {e}")
+                continue
+            if path_filter:
+                # The TOC selected the page; its subsections may still be excluded
+                sections = path_filter.select(sections, inherited=True)
             if sections:
                 all_sections.extend(sections)
                 
         return Document(title=title, sections=all_sections, source_url=url)
 
-    def scrape_full(self, url: str) -> List[Document]:
+    def scrape_section(self, url: str, include: Optional[List[str]] = None,
+                       exclude: Optional[List[str]] = None) -> Optional[Document]:
+        """
+        Scrape a single section and return Document object.
+        
+        Args:
+            url: The Municode URL to scrape.
+            include: Patterns of TOC entries to scrape (see filters.Pattern).
+            exclude: Patterns of TOC entries to skip.
+            
+        Returns:
+            Document object containing scraped content, or None if failed.
+        """
+        if not self.driver:
+            self._setup_driver()
+            
+        # Validate URL
+        if "?nodeId=" not in url:
+            raise InvalidUrlError(f"URL is not a valid section URL: {url}")
+
+        return self._scrape_entry(url, PathFilter(include, exclude))
+
+    def iter_full(self, url: str, include: Optional[List[str]] = None,
+                  exclude: Optional[List[str]] = None) -> Iterator[Document]:
+        """
+        Yield the Documents of an entire municode as each one completes.
+
+        Args:
+            url: The base Municode URL to scrape.
+            include: Patterns of TOC entries to scrape (see filters.Pattern).
+            exclude: Patterns of TOC entries to skip.
+        """
+        if not self.driver:
+            self._setup_driver()
+
+        path_filter = PathFilter(include, exclude)
+        for section_url, inherited in self._select_entries(url, path_filter):
+            print(f"🔗 Processing URL: {section_url}")
+            try:
+                doc = self._scrape_entry(section_url, path_filter, inherited)
+            except Exception as e:
+                print(f"❌ Failed to scrape {section_url}: {e}")
+                continue
+            if doc:
+                yield doc
+
+    def scrape_full(self, url: str, include: Optional[List[str]] = None,
+                    exclude: Optional[List[str]] = None) -> List[Document]:
         """
         Scrape entire municode and return list of Documents.
+
+        Filters are applied while the TOC is expanded, so excluded
+        branches are pruned before their content pages are loaded.
         
         Args:
             url: The base Municode URL to scrape.
+            include: Patterns of TOC entries to scrape (see filters.Pattern).
+            exclude: Patterns of TOC entries to skip.
             
         Returns:
             List of Document objects.
         """
+        return list(self.iter_full(url, include, exclude))
+
+    def outline_section(self, url: str, text: Optional[str] = None) -> Optional[Document]:
+        """
+        Read a section's structure from its TOC without loading content pages.
+
+        Args:
+            url: The Municode URL of the section.
+            text: TOC link text for the URL, used if a root content page
+                has no readable heading.
+
+        Returns:
+            Document skeleton whose sections have empty content and carry
+            their nodeId URL for fetching later, or None if failed.
+        """
+        if not self.driver:
+            self._setup_driver()
+
+        # Validate URL
+        if "?nodeId=" not in url:
+            raise InvalidUrlError(f"URL is not a valid section URL: {url}")
+
+        links = self._section_toc_links(url)
+        if links is None:
+            # Root content page (already loaded by the root URL check)
+            if self._wait_for_present(By.CLASS_NAME, "chunk-heading"):
+                text = extract_page_payload(self.driver, include_chunks=False)["heading"] or text
+            if not text:
+                return None
+            sections = self._outline_sections([{"href": url, "text": text}])
+            return Document(title=sections[0].label, sections=sections, source_url=url)
+
+        title = links[0]['text'] if links else "None"
+        document_id, _, _ = parse_section_title(title)
+        return Document(title=title, sections=self._outline_sections(links, document_id), source_url=url)
+
+    def outline_full(self, url: str) -> List[Document]:
+        """
+        Read the structure of an entire municode from its TOCs only.
+
+        Loads the navigation page and one TOC page per top-level entry,
+        instead of every content page.
+
+        Args:
+            url: The base Municode URL.
+
+        Returns:
+            List of Document skeletons (see outline_section).
+        """
         if not self.driver:
             self._setup_driver()
-            
-        full_toc_xpath = "/html/body/div[3]/div[2]/ui-view/mcc-codes/div[7]/nav/div[2]/div[2]/mcc-codes-toc/mcc-product-toc/div/ul"
-        
-        if not self._wait_for_element(url, By.XPATH, full_toc_xpath):
-            raise ElementNotFoundError(f"Failed to load full TOC page at {url}")
 
-        a_tags = self.driver.find_element(By.XPATH, full_toc_xpath).find_elements(By.TAG_NAME, 'a')
-        toc_url_list = [a.get_attribute('href') for a in a_tags]
-        
         documents = []
-        for section_url in toc_url_list:
-            print(f"🔗 Processing URL: {section_url}")
+        for link in self._full_toc_links(url):
+            print(f"🔗 Outlining URL: {link['href']}")
             try:
-                doc = self.scrape_section(section_url)
+                doc = self.outline_section(link['href'], text=link['text'])
                 if doc:
                     documents.append(doc)
             except Exception as e:
-                print(f"❌ Failed to scrape {section_url}: {e}")
+                print(f"❌ Failed to outline {link['href']}: {e}")
                 continue
-                
+
         return documents
@@ -0,0 +1,188 @@
+"""Persistent record of already-parsed municode pages."""
+
+from typing import Optional, Set
+from pathlib import Path
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_heading(heading: str) -> str:
+    """Normalize a chunk heading so cosmetic differences hash the same."""
+    return _WHITESPACE.sub(' ', heading).strip().casefold()
+
+
+def _hash_key(kind: str, value: str) -> str:
+    return hashlib.sha1(f"{kind}:{value}".encode("utf-8")).hexdigest()
+
+
+class SeenSet:
+    """
+    Hashed set of pages that have already been parsed.
+
+    Every parsed page is recorded under two keys: its normalized chunk
+    heading and its nodeId. The nodeId key lets a scraper skip a URL before
+    navigating to it; the heading key catches different nodeIds that render
+    the same page.
+    """
+
+    def __init__(self):
+        """Initialize an in-memory seen-set."""
+        self._keys: Set[str] = set()
+
+    def _contains_key(self, key: str) -> bool:
+        return key in self._keys
+
+    def _add_key(self, key: str) -> bool:
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        return True
+
+    def has_node(self, node_id: Optional[str]) -> bool:
+        """Return True if a page with this nodeId was already parsed."""
+        return bool(node_id) and self._contains_key(_hash_key("node", node_id))
+
+    def has_heading(self, heading: str) -> bool:
+        """Return True if a page with this chunk heading was already parsed."""
+        return self._contains_key(_hash_key("heading", normalize_heading(heading)))
+
+    def add_node(self, node_id: Optional[str]) -> None:
+        """Record a nodeId without a heading."""
+        if node_id:
+            self._add_key(_hash_key("node", node_id))
+
+    def claim(self, heading: str, node_id: Optional[str] = None) -> bool:
+        """
+        Record a page as parsed.
+
+        Args:
+            heading: First line of the page's chunk heading
+            node_id: nodeId of the page URL, if known
+
+        Returns:
+            True if the heading was new, False if another run or worker
+            already claimed it
+        """
+        is_new = self._add_key(_hash_key("heading", normalize_heading(heading)))
+        self.add_node(node_id)
+        return is_new
+
+    def __contains__(self, heading: str) -> bool:
+        return self.has_heading(heading)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class FileSeenSet(SeenSet):
+    """
+    Seen-set persisted as an append-only file of hashed keys.
+
+    Keys appended by other processes sharing the file are picked up before
+    each lookup, so parallel workers skip each other's pages.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the seen-set from a file.
+
+        Args:
+            path: File holding one hashed key per line (created if missing)
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+        self._offset = 0
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Load keys appended to the file since the last refresh."""
+        if os.path.getsize(self.path) == self._offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Only consume complete lines; a partial write is picked up next time
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].split():
+            self._keys.add(line.decode("ascii"))
+        self._offset += end
+
+    def _contains_key(self, key: str) -> bool:
+        if key not in self._keys:
+            self.refresh()
+        return key in self._keys
+
+    def _add_key(self, key: str) -> bool:
+        with self._lock:
+            if self._contains_key(key):
+                return False
+            self._keys.add(key)
+            with open(self.path, "a", encoding="ascii") as f:
+                f.write(key + "\n")
+            return True
+
+
+class SqliteSeenSet(SeenSet):
+    """
+    Seen-set stored in a SQLite database shared between workers.
+
+    Claims are atomic, so exactly one worker parses each page.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the seen-set from a SQLite database.
+
+        Args:
+            path: Database file (created if missing)
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY)")
+
+    def _contains_key(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def _add_key(self, key: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,))
+        return cursor.rowcount == 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+def open_seen_set(path: Optional[str] = None) -> SeenSet:
+    """
+    Open a seen-set, choosing the backend from the path.
+
+    Args:
+        path: None for in-memory, a .db/.sqlite file for SQLite, anything else for a key file
+
+    Returns:
+        SeenSet instance
+    """
+    if path is None:
+        return SeenSet()
+    if Path(path).suffix.lower() in (".db", ".sqlite", ".sqlite3"):
+        return SqliteSeenSet(path)
+    return FileSeenSet(path)
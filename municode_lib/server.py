@@ -0,0 +1,305 @@
+"""Read-only HTTP query server over a scraped corpus."""
+
+from collections import OrderedDict, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+import hashlib
+import json
+import re
+import threading
+
+from .models import Section, Document
+from .exceptions import MunicodeError
+from .citations import CITATIONS_FILE, CitationGraph, section_key
+from .versions import INDEX_FILE
+
+_TOKEN = re.compile(r"\w+")
+
+# (document index, section index) within one municipality
+Ref = Tuple[int, int]
+
+
+# JSON files kept next to documents that aren't documents themselves
+_SKIPPED_NAMES = {CITATIONS_FILE, INDEX_FILE}
+_SKIPPED_SUFFIXES = (".outline.json",)
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _document_files(directory: Path) -> Iterator[Path]:
+    """JSON files under a corpus directory that may hold documents."""
+    for path in sorted(directory.rglob("*.json")):
+        if path.name in _SKIPPED_NAMES or path.name.endswith(_SKIPPED_SUFFIXES):
+            continue
+        # Hidden directories hold caches and other tool state
+        if any(part.startswith(".") for part in path.relative_to(directory).parent.parts):
+            continue
+        yield path
+
+
+def _is_document(data: Any) -> bool:
+    """Whether parsed JSON has the shape Document.to_dict produces."""
+    return (isinstance(data, dict) and isinstance(data.get("title"), str)
+            and isinstance(data.get("sections"), list)
+            and all(isinstance(section, dict) and "id" in section for section in data["sections"]))
+
+
+class Corpus:
+    """
+    Documents of a corpus directory, indexed in memory.
+
+    Each subdirectory is a municipality; JSON documents directly in the
+    corpus directory belong to a municipality named after the directory.
+    Sections are indexed by id, by every prefix of their hierarchy path
+    and by the words of their label, title and text. Citations come from
+    each municipality's citations.json, or are extracted at load time.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Load and index every document JSON under a directory.
+
+        Outlines, citation graphs, version indexes, hidden directories and
+        files that aren't documents are skipped; unreadable documents are
+        reported and skipped.
+
+        Args:
+            directory: Output directory of save_json (or of several scrapes)
+        """
+        self.directory = Path(directory)
+        self.documents: Dict[str, List[Document]] = defaultdict(list)
+        self.by_id: Dict[str, Dict[str, List[Ref]]] = defaultdict(lambda: defaultdict(list))
+        self.by_prefix: Dict[str, Dict[Tuple[str, ...], List[Ref]]] = defaultdict(lambda: defaultdict(list))
+        self.words: Dict[str, Dict[str, set]] = defaultdict(lambda: defaultdict(set))
+        self.citations: Dict[str, CitationGraph] = {}
+
+        for path in _document_files(self.directory):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⏭️ Skipping {path}: {e}")
+                continue
+            if not _is_document(data):
+                continue  # Manifests and other JSON files
+            parent = path.parent
+            municipality = self.directory.name if parent == self.directory else parent.relative_to(self.directory).parts[0]
+            try:
+                document = Document.from_dict(data, path.parent)
+            except (MunicodeError, KeyError, TypeError, ValueError) as e:
+                print(f"⏭️ Skipping {path}: {e}")
+                continue
+            self._add(municipality, document)
+
+        for municipality, documents in self.documents.items():
+            graph_file = self.directory / municipality / CITATIONS_FILE
+            if municipality == self.directory.name and not graph_file.exists():
+                graph_file = self.directory / CITATIONS_FILE
+            try:
+                self.citations[municipality] = CitationGraph.load(graph_file)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                self.citations[municipality] = CitationGraph.build(documents)
+
+    def _add(self, municipality: str, document: Document) -> None:
+        documents = self.documents[municipality]
+        doc_index = len(documents)
+        documents.append(document)
+        document.extract_text()
+        for sec_index, section in enumerate(document.sections):
+            ref = (doc_index, sec_index)
+            self.by_id[municipality][section.id].append(ref)
+            for depth in range(1, len(section.path) + 1):
+                self.by_prefix[municipality][tuple(section.path[:depth])].append(ref)
+            for word in set(_tokens(f"{section.label} {section.title} {section.text}")):
+                self.words[municipality][word].add(ref)
+
+    def section(self, municipality: str, ref: Ref) -> Section:
+        """Return the section behind a reference."""
+        return self.documents[municipality][ref[0]].sections[ref[1]]
+
+    def search(self, municipality: str, query: str, limit: int = 20) -> List[Ref]:
+        """
+        Find sections containing every word of a query.
+
+        Sections whose label or title contain more of the words rank first.
+
+        Args:
+            municipality: Municipality to search
+            query: Words to look for
+            limit: Maximum number of results
+
+        Returns:
+            Matching section references
+        """
+        words = set(_tokens(query))
+        index = self.words.get(municipality)
+        if not words or index is None:
+            return []
+        refs = set.intersection(*(index.get(word, set()) for word in words))
+
+        def rank(ref: Ref):
+            section = self.section(municipality, ref)
+            heading = set(_tokens(f"{section.label} {section.title}"))
+            return (-len(words & heading), ref)
+
+        return sorted(refs, key=rank)[:limit]
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of encoded responses and their ETags."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[int, bytes, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: Tuple[int, bytes, str]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _section_json(municipality: str, section: Section, include_content: bool = True) -> Dict:
+    data = section.to_dict(include_text=True)
+    if not include_content:
+        data.pop("content", None)
+    data["municipality"] = municipality
+    return data
+
+
+class CorpusHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+        GET /                                     municipalities
+        GET /<municipality>                       document titles
+        GET /<municipality>/sections/<id>         sections with that id
+        GET /<municipality>/sections/<id>/cites     keys of sections it cites
+        GET /<municipality>/sections/<id>/cited-by  keys of sections citing it
+        GET /<municipality>/tree/<path...>        subtree under a path prefix
+        GET /<municipality>/search?q=...&limit=N  word search
+
+    Path segments are percent-decoded after splitting, so an id or path
+    entry containing "/" must be sent as %2F.
+    """
+
+    corpus: Corpus = None
+    cache: ResponseCache = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Keep load tests quiet
+
+    def do_GET(self):
+        entry = self.cache.get(self.path)
+        if entry is None:
+            status, payload = self._route()
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            entry = (status, body, '"' + hashlib.sha1(body).hexdigest() + '"')
+            if status == 200:
+                self.cache.put(self.path, entry)
+
+        status, body, etag = entry
+        if status == 200 and etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self) -> Tuple[int, object]:
+        url = urlparse(self.path)
+        parts = [unquote(part) for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+        corpus = self.corpus
+
+        if not parts:
+            return 200, {m: len(docs) for m, docs in sorted(corpus.documents.items())}
+
+        municipality = parts[0]
+        if municipality not in corpus.documents:
+            return 404, {"error": f"Unknown municipality: {municipality}"}
+
+        if len(parts) == 1:
+            return 200, [{"title": doc.title, "source_url": doc.source_url, "sections": len(doc.sections)}
+                         for doc in corpus.documents[municipality]]
+
+        kind = parts[1]
+        if kind == "sections" and len(parts) in (3, 4):
+            refs = corpus.by_id[municipality].get(parts[2], [])
+            if not refs:
+                return 404, {"error": f"Unknown section: {parts[2]}"}
+            if len(parts) == 3:
+                return 200, [_section_json(municipality, corpus.section(municipality, ref)) for ref in refs]
+
+            graph = corpus.citations[municipality]
+            lookup = {"cites": graph.cites, "cited-by": graph.cited_by}.get(parts[3])
+            if lookup is None:
+                return 404, {"error": f"Unknown route: {url.path}"}
+            result = []
+            for ref in refs:
+                title = corpus.documents[municipality][ref[0]].title
+                section = corpus.section(municipality, ref)
+                result.append({"document": title, "key": section_key(section), parts[3]: lookup(title, section)})
+            return 200, result
+
+        if kind == "tree" and len(parts) > 2:
+            refs = corpus.by_prefix[municipality].get(tuple(parts[2:]), [])
+            if not refs:
+                return 404, {"error": f"Unknown path: {'/'.join(parts[2:])}"}
+            return 200, [_section_json(municipality, corpus.section(municipality, ref)) for ref in refs]
+
+        if kind == "search" and len(parts) == 2:
+            try:
+                limit = int(query.get("limit", ["20"])[0])
+            except ValueError:
+                return 400, {"error": "limit must be an integer"}
+            if limit < 0:
+                return 400, {"error": "limit must not be negative"}
+            refs = corpus.search(municipality, query.get("q", [""])[0], limit)
+            return 200, [_section_json(municipality, corpus.section(municipality, ref), include_content=False)
+                         for ref in refs]
+
+        return 404, {"error": f"Unknown route: {url.path}"}
+
+
+def make_server(corpus_dir: str, host: str = "127.0.0.1", port: int = 8000,
+                cache_size: int = 1024) -> ThreadingHTTPServer:
+    """
+    Load a corpus and build a server for it (call serve_forever to run).
+
+    Args:
+        corpus_dir: Directory of document JSON files
+        host: Interface to bind
+        port: Port to bind (0 for any free port)
+        cache_size: Responses kept in the LRU cache
+
+    Returns:
+        ThreadingHTTPServer instance
+    """
+    handler = type("BoundCorpusHandler", (CorpusHandler,), {
+        "corpus": Corpus(corpus_dir),
+        "cache": ResponseCache(cache_size),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
@@ -0,0 +1,277 @@
+"""Warm, reusable Chrome sessions for the scraper."""
+
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+import os
+import threading
+import weakref
+
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+# URL patterns blocked through the DevTools protocol when block_resources is on
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*newrelic.com*", "*nr-data.net*", "*hotjar.com*",
+]
+
+# Cache file for the resolved chromedriver path, shared across processes
+DRIVER_PATH_CACHE = Path(os.environ.get(
+    "MUNICODE_DRIVER_CACHE", Path.home() / ".cache" / "municode_lib" / "chromedriver_path"
+))
+
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+
+def resolve_driver_path(refresh: bool = False) -> str:
+    """
+    Return the chromedriver binary path, installing it only once.
+
+    The path is cached in memory and on disk, so ChromeDriverManager only
+    runs when no cached binary exists.
+
+    Args:
+        refresh: Ignore cached paths and ask ChromeDriverManager again
+
+    Returns:
+        Path to the chromedriver executable
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if not refresh and _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+
+        if not refresh and DRIVER_PATH_CACHE.exists():
+            cached = DRIVER_PATH_CACHE.read_text(encoding="utf-8").strip()
+            if cached and os.path.exists(cached):
+                _driver_path = cached
+                return _driver_path
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        _driver_path = ChromeDriverManager().install()
+        try:
+            DRIVER_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            DRIVER_PATH_CACHE.write_text(_driver_path, encoding="utf-8")
+        except OSError:
+            pass  # Disk cache is best effort
+        return _driver_path
+
+
+def build_chrome_options(headless: bool = True, page_load_strategy: str = "normal",
+                         block_resources: bool = False):
+    """
+    Build Chrome options for scraping.
+
+    Args:
+        headless: Whether to run browser in headless mode
+        page_load_strategy: "normal", "eager" (stop at DOMContentLoaded) or "none"
+        block_resources: Disable images and fonts through browser preferences
+
+    Returns:
+        Configured Options object
+    """
+    from selenium.webdriver.chrome.options import Options
+
+    if page_load_strategy not in PAGE_LOAD_STRATEGIES:
+        raise ValueError(f"Unknown page load strategy: {page_load_strategy}")
+
+    options = Options()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.page_load_strategy = page_load_strategy
+
+    if block_resources:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.images": 2,
+            "webkit.webprefs.remote_fonts_enabled": False,
+        })
+    return options
+
+
+def create_driver(headless: bool = True, page_load_strategy: str = "normal",
+                  block_resources: bool = False, blocked_urls: Optional[List[str]] = None):
+    """
+    Start a Chrome WebDriver using the cached driver binary.
+
+    If Chrome refuses the cached chromedriver (typically after a browser
+    upgrade), the path is resolved again and the start is retried once.
+
+    Args:
+        headless: Whether to run browser in headless mode
+        page_load_strategy: "normal", "eager" or "none"
+        block_resources: Block images, fonts and analytics requests
+        blocked_urls: URL patterns to block (default: BLOCKED_URL_PATTERNS)
+
+    Returns:
+        Chrome WebDriver instance
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.common.exceptions import SessionNotCreatedException
+
+    options = build_chrome_options(headless, page_load_strategy, block_resources)
+    try:
+        driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=options)
+    except SessionNotCreatedException:
+        driver = webdriver.Chrome(service=Service(resolve_driver_path(refresh=True)), options=options)
+
+    if block_resources:
+        # Fonts and analytics can't be disabled through preferences
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {
+                "urls": blocked_urls if blocked_urls is not None else BLOCKED_URL_PATTERNS
+            })
+        except Exception:
+            pass  # Request interception is an optimization only
+    return driver
+
+
+class BrowserSession:
+    """
+    Long-lived Chrome session that several scrapers can attach to.
+
+    Scrapers attached to the same session share one browser and must be
+    used one at a time. The browser stays warm between scrapers and is
+    only quit by close(). When restart() replaces the browser, every
+    attached scraper is re-bound to the new driver.
+    """
+
+    def __init__(self, headless: bool = True, page_load_strategy: str = "normal",
+                 block_resources: bool = False):
+        """
+        Initialize the session (the browser starts on first attach).
+
+        Args:
+            headless: Whether to run browser in headless mode
+            page_load_strategy: "normal", "eager" or "none"
+            block_resources: Block images, fonts and analytics requests
+        """
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.block_resources = block_resources
+        self.driver = None
+        self.users = 0
+        self._owners = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def attach(self, owner=None):
+        """
+        Return the session's driver, starting the browser if needed.
+
+        Args:
+            owner: Object holding the driver in its 'driver' attribute,
+                re-bound by restart()
+        """
+        with self._lock:
+            if self.driver is None:
+                self.driver = create_driver(self.headless, self.page_load_strategy, self.block_resources)
+            self.users += 1
+            if owner is not None:
+                self._owners.add(owner)
+            return self.driver
+
+    def release(self, owner=None) -> None:
+        """Detach a scraper; the browser keeps running."""
+        with self._lock:
+            self.users = max(0, self.users - 1)
+            if owner is not None:
+                self._owners.discard(owner)
+
+    def restart(self):
+        """
+        Quit and relaunch the browser, re-binding attached owners.
+
+        The old browser is quit first so two never run at once (restarts
+        usually free memory). If the relaunch fails, every owner is
+        detached with its driver set to None instead of keeping the dead
+        one, and the error is raised; the next attach starts a browser.
+
+        Returns:
+            The new driver
+        """
+        with self._lock:
+            self._quit()
+            try:
+                self.driver = create_driver(self.headless, self.page_load_strategy, self.block_resources)
+            except Exception:
+                for owner in list(self._owners):
+                    owner.driver = None
+                self._owners.clear()
+                self.users = 0
+                raise
+            for owner in list(self._owners):
+                owner.driver = self.driver
+            return self.driver
+
+    def _quit(self) -> None:
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+    def close(self) -> None:
+        """Quit the browser."""
+        with self._lock:
+            self._quit()
+            self.users = 0
+            self._owners.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class SessionManager:
+    """Pool of warm browser sessions keyed by their configuration."""
+
+    def __init__(self):
+        """Initialize an empty pool."""
+        self._sessions: Dict[Tuple[bool, str, bool], BrowserSession] = {}
+        self._lock = threading.Lock()
+
+    def get(self, headless: bool = True, page_load_strategy: str = "normal",
+            block_resources: bool = False) -> BrowserSession:
+        """
+        Return the shared session for a configuration, creating it if needed.
+
+        Args:
+            headless: Whether to run browser in headless mode
+            page_load_strategy: "normal", "eager" or "none"
+            block_resources: Block images, fonts and analytics requests
+
+        Returns:
+            BrowserSession instance
+        """
+        key = (headless, page_load_strategy, block_resources)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = BrowserSession(*key)
+            return session
+
+    def close_all(self) -> None:
+        """Quit every browser in the pool."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close_all()
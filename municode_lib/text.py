@@ -0,0 +1,127 @@
+"""Plain-text extraction from section HTML."""
+
+from typing import List, Optional, Sequence
+import importlib.util
+import re
+
+# Optional lxml engine (fast path), imported on first use
+HAS_LXML = importlib.util.find_spec("lxml") is not None
+
+# Tags that start a new line of text
+BLOCK_TAGS = frozenset([
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "figcaption",
+    "figure", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "ol",
+    "p", "pre", "section", "table", "tbody", "thead", "tfoot", "tr", "ul",
+])
+# Table cells, separated from the next cell on the same line
+CELL_TAGS = frozenset(["td", "th"])
+_SKIP_TAGS = frozenset(["script", "style"])
+
+_INLINE_SPACE = re.compile(r'[ \t\r\f\v\xa0]+')
+_NBSP = "\xa0"
+
+# Below this many documents a process pool costs more than it saves
+_MIN_PARALLEL_BATCH = 256
+
+
+def _normalize_lines(raw: str) -> str:
+    """Collapse whitespace per line, keeping &nbsp; indentation."""
+    lines = []
+    for line in raw.split("\n"):
+        stripped = line.lstrip(" \t\r\f\v" + _NBSP)
+        if not stripped.strip():
+            continue
+        # Indentation produced by MunicodeParser is a run of &nbsp;
+        indent = line[:len(line) - len(stripped)].count(_NBSP)
+        lines.append(" " * indent + _INLINE_SPACE.sub(" ", stripped).rstrip())
+    return "\n".join(lines)
+
+
+def _walk_lxml(el, parts: List[str]) -> None:
+    tag = el.tag if isinstance(el.tag, str) else None  # Comments have no string tag
+    if tag in _SKIP_TAGS:
+        if el.tail:
+            parts.append(el.tail)
+        return
+    block = tag in BLOCK_TAGS
+    if block or tag == "br":
+        parts.append("\n")
+    if tag is not None and el.text:
+        parts.append(el.text)
+    for child in el:
+        _walk_lxml(child, parts)
+    if block:
+        parts.append("\n")
+    elif tag in CELL_TAGS:
+        parts.append("\t")
+    if el.tail:
+        parts.append(el.tail)
+
+
+def _html_to_text_bs4(html: str) -> str:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup.find_all(_SKIP_TAGS):
+        tag.decompose()
+    for tag in soup.find_all("br"):
+        tag.replace_with("\n")
+    for tag in soup.find_all(BLOCK_TAGS):
+        tag.insert_before("\n")
+        tag.insert_after("\n")
+    for tag in soup.find_all(CELL_TAGS):
+        tag.insert_after("\t")
+    return soup.get_text()
+
+
+def html_to_text(html: str) -> str:
+    """
+    Convert section HTML into normalized plain text.
+
+    Block elements become separate lines, table cells are separated by a
+    space, &nbsp; indentation is kept as leading spaces, and other
+    whitespace is collapsed.
+
+    Args:
+        html: Section HTML content
+
+    Returns:
+        Plain text
+    """
+    if not html or not html.strip():
+        return ""
+    if HAS_LXML:
+        from lxml import html as lxml_html
+        from lxml import etree
+
+        try:
+            root = lxml_html.fragment_fromstring(html, create_parent="div")
+        except (etree.ParserError, ValueError):
+            raw = _html_to_text_bs4(html)
+        else:
+            parts: List[str] = []
+            _walk_lxml(root, parts)
+            raw = "".join(parts)
+    else:
+        raw = _html_to_text_bs4(html)
+    return _normalize_lines(raw)
+
+
+def extract_texts(htmls: Sequence[str], workers: Optional[int] = None, chunksize: int = 64) -> List[str]:
+    """
+    Convert many HTML strings to text, using a process pool for large batches.
+
+    Args:
+        htmls: HTML strings
+        workers: Worker processes (None for CPU count, 1 for in-process)
+        chunksize: Strings sent to a worker per task
+
+    Returns:
+        Text for each input, in order
+    """
+    if workers == 1 or len(htmls) < _MIN_PARALLEL_BATCH:
+        return [html_to_text(html) for html in htmls]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(html_to_text, htmls, chunksize=chunksize))
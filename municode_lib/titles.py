@@ -0,0 +1,78 @@
+"""Fast section title parsing and id normalization."""
+
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+import re
+
+# Maximum number of distinct titles kept in the memo cache
+TITLE_CACHE_SIZE = 8192
+
+_LABEL_SEPARATOR = " - "
+_ID_SEPARATORS = re.compile(r'[.\s]+')
+_NON_WORD = re.compile(r'[^\w\s]')
+
+
+def normalize_label_id(label: str) -> str:
+    """
+    Normalize a section label into a section id.
+
+    Args:
+        label: Section label like "Sec. 22-1." or "ARTICLE II"
+
+    Returns:
+        Normalized id like "sec-22-1" or "article-ii"
+    """
+    # Remove periods, convert to lowercase, replace spaces with hyphens
+    return _ID_SEPARATORS.sub('-', label).lower().strip('-')
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def parse_section_title(full_title: str) -> Tuple[str, str, str]:
+    """
+    Parse a full section title into id, label, and title components.
+
+    Results are memoized, so repeated labels across pages and runs are
+    only parsed once.
+
+    Args:
+        full_title: Full title like "Article II - Some Title" or "Sec. 22-1. - Emergency procedures"
+
+    Returns:
+        Tuple of (id, label, title)
+    """
+    # Split on the first dash to separate label from title
+    if _LABEL_SEPARATOR in full_title:
+        label_part, title_part = full_title.split(_LABEL_SEPARATOR, 1)
+        label = label_part.strip()
+        return normalize_label_id(label), label, title_part.strip()
+
+    # Fallback: no dash separator found
+    clean_title = full_title.strip()
+    # Create a simple ID from the beginning of the title
+    fallback_id = _NON_WORD.sub('', clean_title[:20]).lower().replace(' ', '-').strip('-')
+    return fallback_id, clean_title, clean_title
+
+
+def parse_section_titles(titles: Iterable[str]) -> List[Tuple[str, str, str]]:
+    """
+    Parse many section titles in one call.
+
+    Args:
+        titles: Iterable of full titles
+
+    Returns:
+        List of (id, label, title) tuples in the same order as the input
+    """
+    parsed = {}
+    results = []
+    for full_title in titles:
+        result = parsed.get(full_title)
+        if result is None:
+            result = parsed[full_title] = parse_section_title(full_title)
+        results.append(result)
+    return results
+
+
+def clear_title_cache() -> None:
+    """Drop all memoized title parses."""
+    parse_section_title.cache_clear()
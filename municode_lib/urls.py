@@ -0,0 +1,20 @@
+"""URL helpers for municode pages."""
+
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+
+def node_id_from_url(url: str) -> Optional[str]:
+    """
+    Extract the nodeId query parameter from a municode URL.
+
+    Args:
+        url: URL like "https://library.municode.com/...?nodeId=PTIICOOR_CH22"
+
+    Returns:
+        The nodeId value, or None if the URL has none
+    """
+    if not url:
+        return None
+    values = parse_qs(urlparse(url).query).get("nodeId")
+    return values[0] if values else None
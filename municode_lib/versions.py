@@ -0,0 +1,230 @@
+"""Versioned corpus storage with per-section deltas."""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import gzip
+import json
+import time
+
+from .models import Document
+from .fileio import atomic_open
+
+INDEX_FILE = "index.json"
+
+
+def _section_keys(sections: List[Dict[str, Any]]) -> List[Tuple[str, int]]:
+    """Section ids made unique by their occurrence number."""
+    counts: Dict[str, int] = {}
+    keys = []
+    for section in sections:
+        n = counts.get(section["id"], 0)
+        counts[section["id"]] = n + 1
+        keys.append((section["id"], n))
+    return keys
+
+
+def _delta_sections(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Encode sections against the previous version of the same document.
+
+    Unchanged sections become runs ["=", start, count] of previous
+    indices; changed and new sections are stored in full.
+    """
+    position = {key: i for i, key in enumerate(_section_keys(previous))}
+    ops: List[Any] = []
+    for key, section in zip(_section_keys(current), current):
+        i = position.get(key)
+        if i is None or previous[i] != section:
+            ops.append(section)
+            continue
+        last = ops[-1] if ops else None
+        if isinstance(last, list) and last[1] + last[2] == i:
+            last[2] += 1
+        else:
+            ops.append(["=", i, 1])
+    return ops
+
+
+def _apply_sections(previous: List[Dict[str, Any]], ops: List[Any]) -> List[Dict[str, Any]]:
+    sections = []
+    for op in ops:
+        if isinstance(op, list):
+            sections.extend(previous[op[1]:op[1] + op[2]])
+        else:
+            sections.append(op)
+    return sections
+
+
+class VersionStore:
+    """
+    Historical snapshots of each municipality's documents.
+
+    The first snapshot is stored in full. Later snapshots are stored as
+    deltas against the previous version: unchanged documents and runs of
+    unchanged sections are references, so storage grows with the amount
+    of change. Every checkpoint_every-th version is stored in full, which
+    bounds how many deltas a reconstruction applies.
+
+    Layout: <root>/<municipality>/index.json plus one gzip JSON file per
+    version.
+    """
+
+    def __init__(self, root: str, checkpoint_every: int = 10):
+        """
+        Open (or create) a store.
+
+        Args:
+            root: Store directory
+            checkpoint_every: Versions between full snapshots (1 stores every version in full)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_every = max(1, checkpoint_every)
+        # Most recently materialized version per municipality: (version, document dicts)
+        self._latest: Dict[str, Tuple[int, List[Dict[str, Any]]]] = {}
+
+    def municipalities(self) -> List[str]:
+        """Names of municipalities with at least one version."""
+        return sorted(path.parent.name for path in self.root.glob(f"*/{INDEX_FILE}"))
+
+    def versions(self, municipality: str) -> List[Dict[str, Any]]:
+        """
+        List a municipality's versions, oldest first.
+
+        Returns:
+            Dicts with "version", "label", "created", "kind" ("full" or
+            "delta") and "bytes"
+        """
+        index_path = self.root / municipality / INDEX_FILE
+        if not index_path.exists():
+            return []
+        with open(index_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _read(self, municipality: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        with open(self.root / municipality / entry["file"], "rb") as f:
+            return json.loads(gzip.decompress(f.read()))
+
+    def _write(self, municipality: str, filename: str, data: Dict[str, Any]) -> int:
+        payload = gzip.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        with atomic_open(self.root / municipality / filename, "wb") as f:
+            f.write(payload)
+        return len(payload)
+
+    def _materialize_dicts(self, municipality: str, version: Optional[int] = None) -> Tuple[int, List[Dict[str, Any]]]:
+        entries = self.versions(municipality)
+        if not entries:
+            raise KeyError(f"No versions stored for {municipality}")
+        if version is None:
+            version = entries[-1]["version"]
+        if not 1 <= version <= len(entries):
+            raise KeyError(f"{municipality} has no version {version}")
+
+        cached = self._latest.get(municipality)
+        if cached is not None and cached[0] == version:
+            return cached
+
+        # Start from the closest full snapshot at or before the version
+        start = version
+        while entries[start - 1]["kind"] != "full":
+            start -= 1
+        if cached is not None and start <= cached[0] < version:
+            start, documents = cached[0] + 1, cached[1]
+        else:
+            documents = self._read(municipality, entries[start - 1])["documents"]
+            start += 1
+
+        for number in range(start, version + 1):
+            documents = self._apply(documents, self._read(municipality, entries[number - 1]))
+        return version, documents
+
+    @staticmethod
+    def _apply(previous: List[Dict[str, Any]], delta: Dict[str, Any]) -> List[Dict[str, Any]]:
+        documents = []
+        for entry in delta["documents"]:
+            if "same" in entry:
+                documents.append(previous[entry["same"]])
+                continue
+            base = previous[entry["base"]]["sections"] if "base" in entry else []
+            documents.append({
+                "title": entry["title"],
+                "source_url": entry["source_url"],
+                "sections": _apply_sections(base, entry["sections"]),
+            })
+        return documents
+
+    @staticmethod
+    def _delta(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> Dict[str, Any]:
+        by_title = {doc["title"]: i for i, doc in enumerate(previous)}
+        entries = []
+        for doc in current:
+            i = by_title.get(doc["title"])
+            if i is not None and previous[i] == doc:
+                entries.append({"same": i})
+                continue
+            entry = {"title": doc["title"], "source_url": doc["source_url"]}
+            if i is None:
+                entry["sections"] = doc["sections"]
+            else:
+                entry["base"] = i
+                entry["sections"] = _delta_sections(previous[i]["sections"], doc["sections"])
+            entries.append(entry)
+        return {"documents": entries}
+
+    def add_version(self, municipality: str, documents: List[Document], label: Optional[str] = None) -> int:
+        """
+        Store a new snapshot of a municipality.
+
+        Args:
+            municipality: Municipality name (a directory name)
+            documents: Every document of the snapshot
+            label: Free-form description, e.g. the scrape date
+
+        Returns:
+            The new version number (starting at 1)
+        """
+        entries = self.versions(municipality)
+        version = len(entries) + 1
+        current = [doc.to_dict() for doc in documents]
+
+        full = not entries or (version - 1) % self.checkpoint_every == 0
+        if full:
+            kind, filename, data = "full", f"v{version:05d}.full.json.gz", {"documents": current}
+        else:
+            _, previous = self._materialize_dicts(municipality, version - 1)
+            kind, filename, data = "delta", f"v{version:05d}.delta.json.gz", self._delta(previous, current)
+
+        size = self._write(municipality, filename, data)
+        entries.append({"version": version, "label": label, "created": time.time(),
+                        "kind": kind, "file": filename, "bytes": size})
+        with atomic_open(self.root / municipality / INDEX_FILE) as f:
+            json.dump(entries, f, indent=2)
+        self._latest[municipality] = (version, current)
+        return version
+
+    def materialize(self, municipality: str, version: Optional[int] = None) -> List[Document]:
+        """
+        Reconstruct a snapshot.
+
+        Args:
+            municipality: Municipality name
+            version: Version number (default: latest)
+
+        Returns:
+            The snapshot's documents
+
+        Raises:
+            KeyError: If the municipality or version doesn't exist
+        """
+        version, documents = self._materialize_dicts(municipality, version)
+        self._latest[municipality] = (version, documents)
+        return [Document.from_dict(doc) for doc in documents]
+
+    def stats(self, municipality: str) -> Dict[str, int]:
+        """Return version counts and stored bytes for a municipality."""
+        entries = self.versions(municipality)
+        return {
+            "versions": len(entries),
+            "full": sum(1 for entry in entries if entry["kind"] == "full"),
+            "bytes": sum(entry["bytes"] for entry in entries),
+        }
@@ -0,0 +1,163 @@
+"""Health tracking for long-running browser sessions."""
+
+from collections import deque
+from typing import Deque, Dict, List, Optional
+import os
+import statistics
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+
+def _proc_tree_rss(root_pid: int) -> Optional[int]:
+    """Sum resident memory of a process tree by reading /proc."""
+    if not os.path.isdir("/proc"):
+        return None
+
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its closing paren
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        try:
+            with open(f"/proc/{pid}/statm", encoding="utf-8") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            pass
+        stack.extend(children.get(pid, []))
+    return total
+
+
+def browser_rss(driver) -> Optional[int]:
+    """
+    Resident memory of a local browser, including all renderer processes.
+
+    Args:
+        driver: Selenium WebDriver started through a local chromedriver
+
+    Returns:
+        Bytes in use, or None if it can't be measured (e.g. remote drivers)
+    """
+    try:
+        pid = driver.service.process.pid
+    except AttributeError:
+        return None
+
+    if HAS_PSUTIL:
+        try:
+            root = psutil.Process(pid)
+            total = 0
+            for process in [root] + root.children(recursive=True):
+                try:
+                    total += process.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total
+        except psutil.Error:
+            return None
+    return _proc_tree_rss(pid)
+
+
+class DriverWatchdog:
+    """
+    Decide when a browser should be restarted.
+
+    Tracks pages served, browser memory and a rolling window of page load
+    latencies for the current driver. The browser is due for a restart
+    after max_pages loads, when its memory passes max_rss_mb, when the
+    rolling median latency grows to latency_factor times the median of
+    its first window, or after max_failures consecutive failed loads.
+    """
+
+    def __init__(self, max_pages: int = 500, max_rss_mb: Optional[float] = 2048, window: int = 50,
+                 latency_factor: float = 3.0, max_failures: int = 3, check_every: int = 25):
+        """
+        Initialize the watchdog.
+
+        Args:
+            max_pages: Page loads per browser (0 for no limit)
+            max_rss_mb: Browser memory limit in MB (None for no limit)
+            window: Page loads per latency window
+            latency_factor: Slowdown against the first window that triggers a restart
+            max_failures: Consecutive failed loads that trigger a restart (0 for no limit)
+            check_every: Page loads between memory measurements
+        """
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.window = max(1, window)
+        self.latency_factor = latency_factor
+        self.max_failures = max_failures
+        self.check_every = max(1, check_every)
+        self.restarts = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Start tracking a fresh browser."""
+        self.pages = 0
+        self.failures = 0
+        self.rss: Optional[int] = None
+        self.baseline: Optional[float] = None
+        self._latencies: Deque[float] = deque(maxlen=self.window)
+
+    def record(self, latency: Optional[float], ok: bool = True) -> None:
+        """
+        Record one page load.
+
+        Args:
+            latency: Seconds from navigation until the awaited element
+                appeared, or None if it never did
+            ok: Whether the page loaded; False for navigation errors and
+                element timeouts (probes that may miss, like the TOC list
+                on root pages, record None with ok=True)
+        """
+        self.pages += 1
+        self.failures = 0 if ok else self.failures + 1
+        if latency is None:
+            return
+        self._latencies.append(latency)
+        if self.baseline is None and len(self._latencies) == self.window:
+            self.baseline = statistics.median(self._latencies)
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Median latency of the rolling window."""
+        return statistics.median(self._latencies) if self._latencies else None
+
+    def check(self, driver) -> Optional[str]:
+        """
+        Check whether the browser should be restarted.
+
+        Args:
+            driver: The browser being tracked
+
+        Returns:
+            Reason for a restart, or None if the browser is healthy
+        """
+        if self.max_pages and self.pages >= self.max_pages:
+            return f"{self.pages} pages served"
+        if self.max_failures and self.failures >= self.max_failures:
+            return f"{self.failures} consecutive failed loads"
+        if (self.baseline and len(self._latencies) == self.window
+                and self.latency > self.baseline * self.latency_factor):
+            return f"median latency {self.latency:.2f}s vs {self.baseline:.2f}s baseline"
+        if self.max_rss_mb is not None and self.pages and self.pages % self.check_every == 0:
+            self.rss = browser_rss(driver)
+            if self.rss is not None and self.rss > self.max_rss_mb * 1024 * 1024:
+                return f"browser memory {self.rss / (1024 * 1024):.0f} MB"
+        return None
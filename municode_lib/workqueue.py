@@ -0,0 +1,318 @@
+"""Work-queue based distributed scraping."""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from pathlib import Path
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from .models import Section, Document
+from .exceptions import ScrapingError
+
+
+@dataclass
+class Task:
+    """One content page to scrape as part of a document."""
+    id: str
+    document_key: str
+    position: int
+    url: str
+    document_id: Optional[str] = None
+    attempts: int = 0
+
+
+class TaskQueue(ABC):
+    """
+    Interface for queues of section tasks.
+
+    Delivery is at-least-once: a claimed task that is not acknowledged
+    before its lease expires is handed to another worker. Acknowledging a
+    task stores its sections idempotently, so duplicate deliveries are
+    harmless.
+    """
+
+    @abstractmethod
+    def add_document(self, key: str, title: Optional[str], source_url: str, position: int) -> None:
+        """Register a document whose tasks will be enqueued."""
+
+    @abstractmethod
+    def put(self, tasks: List[Task]) -> None:
+        """Enqueue tasks, ignoring ones already present."""
+
+    @abstractmethod
+    def claim(self, worker: str) -> Optional[Task]:
+        """Lease the next available task, or return None if none is ready."""
+
+    @abstractmethod
+    def ack(self, task: Task, sections: List[Section]) -> None:
+        """Store a task's sections and mark it done."""
+
+    @abstractmethod
+    def nack(self, task: Task) -> None:
+        """Release a task so it can be retried."""
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Return the number of tasks per status."""
+
+    @abstractmethod
+    def documents(self) -> List[Dict]:
+        """Return registered documents with their results, ordered by position."""
+
+
+def task_id(document_key: str, url: str) -> str:
+    """Deterministic task id, so re-enqueueing a crawl is a no-op."""
+    return hashlib.sha1(f"{document_key}\x1f{url}".encode("utf-8")).hexdigest()
+
+
+class SqliteTaskQueue(TaskQueue):
+    """Task queue stored in a SQLite database on a shared filesystem."""
+
+    def __init__(self, path: str, lease_seconds: int = 300, max_attempts: int = 5):
+        """
+        Open (or create) a queue.
+
+        Args:
+            path: Database file
+            lease_seconds: How long a claimed task is reserved for its worker
+            max_attempts: Deliveries after which a task is marked failed
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._conn = sqlite3.connect(str(self.path), timeout=60, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "key TEXT PRIMARY KEY, title TEXT, source_url TEXT, position INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "id TEXT PRIMARY KEY, document_key TEXT, position INTEGER, url TEXT, document_id TEXT, "
+                "status TEXT DEFAULT 'pending', lease_until REAL DEFAULT 0, attempts INTEGER DEFAULT 0, "
+                "worker TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, lease_until)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS results (task_id TEXT PRIMARY KEY, sections TEXT)")
+
+    def add_document(self, key: str, title: Optional[str], source_url: str, position: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO documents (key, title, source_url, position) VALUES (?, ?, ?, ?)",
+                (key, title, source_url, position)
+            )
+
+    def put(self, tasks: List[Task]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tasks (id, document_key, position, url, document_id) VALUES (?, ?, ?, ?, ?)",
+                [(task.id, task.document_key, task.position, task.url, task.document_id) for task in tasks]
+            )
+
+    def claim(self, worker: str) -> Optional[Task]:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            # Tasks whose worker died without acking become claimable again
+            self._conn.execute(
+                "UPDATE tasks SET status = 'failed' WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            )
+            row = self._conn.execute(
+                "SELECT id, document_key, position, url, document_id, attempts FROM tasks "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_until < ?) "
+                "ORDER BY document_key, position LIMIT 1", (now,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE tasks SET status = 'leased', lease_until = ?, attempts = attempts + 1, worker = ? "
+                "WHERE id = ?", (now + self.lease_seconds, worker, row[0])
+            )
+        return Task(id=row[0], document_key=row[1], position=row[2], url=row[3],
+                    document_id=row[4], attempts=row[5] + 1)
+
+    def ack(self, task: Task, sections: List[Section]) -> None:
+        payload = json.dumps([section.to_dict() for section in sections], ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO results (task_id, sections) VALUES (?, ?)", (task.id, payload))
+            self._conn.execute("UPDATE tasks SET status = 'done' WHERE id = ?", (task.id,))
+
+    def nack(self, task: Task) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "lease_until = 0 WHERE id = ? AND status = 'leased'", (self.max_attempts, task.id)
+            )
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def documents(self) -> List[Dict]:
+        with self._lock:
+            docs = self._conn.execute(
+                "SELECT key, title, source_url FROM documents ORDER BY position"
+            ).fetchall()
+            result = []
+            for key, title, source_url in docs:
+                tasks = self._conn.execute(
+                    "SELECT t.status, r.sections FROM tasks t LEFT JOIN results r ON r.task_id = t.id "
+                    "WHERE t.document_key = ? ORDER BY t.position", (key,)
+                ).fetchall()
+                result.append({
+                    "key": key,
+                    "title": title,
+                    "source_url": source_url,
+                    "complete": all(status == "done" for status, _ in tasks),
+                    "results": [json.loads(sections) for status, sections in tasks if sections is not None],
+                })
+        return result
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+def enqueue_crawl(scraper, url: str, queue: TaskQueue, full: bool = True) -> int:
+    """
+    Expand TOCs into section tasks (producer side).
+
+    Args:
+        scraper: MunicodeScraper used to read the TOCs
+        url: Base municode URL (full=True) or a single section URL
+        queue: Queue to fill
+        full: Expand the whole 'mcc-codes-toc' navigation instead of one section
+
+    Returns:
+        Number of tasks enqueued
+    """
+    if not scraper.driver:
+        scraper._setup_driver()
+
+    entry_urls = scraper._get_full_toc(url) if full else [url]
+    count = 0
+    for position, entry_url in enumerate(entry_urls):
+        print(f"🔗 Expanding {entry_url}")
+        try:
+            toc = scraper._expand_section_toc(entry_url)
+        except ScrapingError as e:
+            print(f"❌ Failed to expand {entry_url}: {e}")
+            continue
+
+        if toc is None:
+            title, document_id, page_urls = None, None, [entry_url]
+        else:
+            title, document_id, page_urls = toc
+
+        queue.add_document(entry_url, title, entry_url, position)
+        queue.put([
+            Task(id=task_id(entry_url, page_url), document_key=entry_url, position=i,
+                 url=page_url, document_id=document_id)
+            for i, page_url in enumerate(page_urls)
+        ])
+        count += len(page_urls)
+    return count
+
+
+def run_worker(scraper, queue: TaskQueue, idle_timeout: float = 30.0, poll_interval: float = 2.0) -> int:
+    """
+    Consume section tasks until the queue stays empty (worker side).
+
+    A page is recorded in the scraper's seen-set only after its sections
+    are acknowledged, so a page skipped as already seen has its sections
+    stored by another task, and acknowledging it empty loses nothing. A
+    worker that dies mid-task leaves its page unrecorded for the retry.
+    Workers on separate hosts share one seen-set only if the scraper is
+    given a persistent one (e.g. SqliteSeenSet).
+
+    Args:
+        scraper: MunicodeScraper that parses the content pages
+        queue: Queue to consume
+        idle_timeout: Seconds without an available task before returning
+        poll_interval: Seconds between polls while waiting for tasks
+
+    Returns:
+        Number of tasks completed
+    """
+    if not scraper.driver:
+        scraper._setup_driver()
+
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    completed = 0
+    idle_since = time.monotonic()
+    while True:
+        task = queue.claim(worker)
+        if task is None:
+            if time.monotonic() - idle_since >= idle_timeout:
+                return completed
+            time.sleep(poll_interval)
+            continue
+
+        idle_since = time.monotonic()
+        try:
+            print(f"🔗 Parsing {task.url}")
+            page = scraper._fetch_page(task.url)
+            # No page: already stored by another task, or an empty heading
+            sections = [] if page is None else scraper._parse_page_html(page.html, task.url, task.document_id)
+        except Exception as e:
+            print(f"❌ Task failed {task.url}: {e}")
+            queue.nack(task)
+            continue
+        queue.ack(task, sections)
+        if page is not None:
+            scraper._claim_page(page)
+        completed += 1
+
+
+def assemble_documents(queue: TaskQueue, complete_only: bool = True) -> List[Document]:
+    """
+    Reassemble task results into ordered Documents.
+
+    Results are ordered by TOC position. A page whose sections repeat an
+    earlier page of the same document is dropped, matching the heading
+    dedupe of a sequential scrape.
+
+    Args:
+        queue: Queue holding the results
+        complete_only: Skip documents that still have unfinished tasks
+
+    Returns:
+        List of Document objects in TOC order
+    """
+    documents = []
+    for doc in queue.documents():
+        if complete_only and not doc["complete"]:
+            continue
+
+        sections = []
+        seen_pages = set()
+        for page in doc["results"]:
+            if not page:
+                continue
+            fingerprint = hashlib.sha1(json.dumps(page, sort_keys=True).encode("utf-8")).hexdigest()
+            if fingerprint in seen_pages:
+                continue
+            seen_pages.add(fingerprint)
+            sections.extend(Section.from_dict(data) for data in page)
+
+        title = doc["title"]
+        if title is None:
+            # Root content page: title comes from the first section
+            if not sections:
+                continue
+            title = sections[0].label
+        documents.append(Document(title=title, sections=sections, source_url=doc["source_url"]))
+    return documents
@@ -0,0 +1,159 @@
+"""Background writing of scraped documents."""
+
+from pathlib import Path
+from typing import Iterable, Optional
+import json
+import os
+import queue
+import tempfile
+import threading
+
+from .models import Section, Document
+from .codec import Codec
+from .exceptions import MunicodeError
+
+FORMATS = ("html", "json", "jsonl")
+
+_DONE = object()
+
+
+class OutputWriter:
+    """
+    Persist documents and sections on a background thread.
+
+    Items are handed over through a bounded queue, so the producer keeps
+    scraping while earlier output is written, and blocks once max_pending
+    items are waiting for a slow disk. Every file is written to a
+    temporary name and renamed into place when complete.
+
+    Formats:
+        html: One <title>.html per document
+        json: One <title>.json per document
+        jsonl: One line per section in a single stream file, renamed
+            into place when the writer is closed
+
+    With a codec, JSON and JSONL sections carry compressed 'content_z'
+    and the codec id, and any dictionary is saved in output_dir.
+    """
+
+    def __init__(self, output_dir: str, formats: Iterable[str] = ("html",), include_text: bool = False,
+                 max_pending: int = 8, jsonl_name: str = "sections.jsonl", codec: Optional[Codec] = None):
+        """
+        Start the writer thread.
+
+        Args:
+            output_dir: Directory for output files
+            formats: Any of FORMATS
+            include_text: Add a plain 'text' field to JSON and JSONL sections
+            max_pending: Items allowed to wait for the writer before submit blocks
+            jsonl_name: File name of the JSONL stream
+            codec: Compress section content in JSON and JSONL output
+        """
+        self.formats = tuple(formats)
+        unknown = set(self.formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown output formats: {', '.join(sorted(unknown))}")
+
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.include_text = include_text
+        self.codec = codec
+        if codec is not None:
+            codec.save(self.output_dir)
+        self.written = 0
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        self._jsonl = None
+        self._jsonl_path = self.output_dir / jsonl_name
+        if "jsonl" in self.formats:
+            fd, self._jsonl_tmp = tempfile.mkstemp(dir=str(self.output_dir), prefix=f".{jsonl_name}.", suffix=".tmp")
+            self._jsonl = os.fdopen(fd, "w", encoding="utf-8")
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        """Context manager entry point."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Finish writing, discarding the JSONL stream if the block failed."""
+        self.close(discard=exc_type is not None)
+
+    def write_document(self, document: Document) -> None:
+        """Queue a document for writing (blocks while the queue is full)."""
+        self._submit(("document", document))
+
+    def write_section(self, section: Section, document_title: Optional[str] = None) -> None:
+        """Queue a single section for the JSONL stream (blocks while the queue is full)."""
+        self._submit(("section", section, document_title))
+
+    def _submit(self, item) -> None:
+        if self._closed:
+            raise MunicodeError("Writer is closed")
+        if self._error is not None:
+            raise MunicodeError(f"Writer failed: {self._error}")
+        self._queue.put(item)
+
+    def _run(self) -> None:
+        """Write queued items until the sentinel (writer thread)."""
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            if self._error is not None:
+                continue  # Keep draining so producers never block on a dead writer
+            try:
+                if item[0] == "document":
+                    self._write_document(item[1])
+                else:
+                    self._write_jsonl(item[1], item[2])
+                self.written += 1
+            except BaseException as e:
+                self._error = e
+
+    def _write_document(self, document: Document) -> None:
+        if "html" in self.formats:
+            document.save_html(self.output_dir / f"{document.title}.html")
+        if "json" in self.formats:
+            document.save_json(self.output_dir / f"{document.title}.json", include_text=self.include_text,
+                               codec=self.codec)
+        for section in document.sections:
+            self._write_jsonl(section, document.title)
+
+    def _write_jsonl(self, section: Section, document_title: Optional[str]) -> None:
+        if self._jsonl is None:
+            return
+        record = {"document": document_title}
+        record.update(section.to_dict(include_text=self.include_text, codec=self.codec))
+        if self.codec is not None:
+            record["codec"] = self.codec.id
+        self._jsonl.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self, discard: bool = False) -> None:
+        """
+        Wait for pending writes and finish the JSONL stream.
+
+        Args:
+            discard: Drop the JSONL stream instead of renaming it into place
+
+        Raises:
+            MunicodeError: If any write failed
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_DONE)
+        self._thread.join()
+
+        if self._jsonl is not None:
+            self._jsonl.close()
+            if discard or self._error is not None:
+                os.unlink(self._jsonl_tmp)
+            else:
+                os.replace(self._jsonl_tmp, self._jsonl_path)
+
+        if self._error is not None:
+            raise MunicodeError(f"Writer failed: {self._error}")
@@ -41,6 +41,12 @@ setup(
         "lxml>=4.6.0",
     ],
     extras_require={
+        "monitor": [
+            "psutil>=5.8",
+        ],
+        "zstd": [
+            "zstandard>=0.15",
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
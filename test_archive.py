@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Tests for the random-access section archive."""
+
+import tempfile
+from pathlib import Path
+
+from municode_lib.archive import _FOOTER, COMPRESSORS, ArchiveError, SectionArchive, write_archive
+from municode_lib.models import Section, Document
+
+
+def _document():
+    sections = [Section(id=f"sec-{i}", title=f"Section {i}", label=f"Sec. {i}.", content=f"<p>Text {i} é</p>",
+                        path=["chapter-1", f"sec-{i}"], url="https://example.com") for i in range(50)]
+    # Repeated ids, as produced for untitled chunks
+    sections += [Section(id="untitled-section", title="", label="", content=f"<p>Untitled {i}</p>")
+                 for i in range(2)]
+    return Document(title="Chapter 1", sections=sections, source_url="https://example.com")
+
+
+def test_round_trip_per_compressor():
+    """Every compressor supports lookups, repeated ids and full decoding."""
+    document = _document()
+    with tempfile.TemporaryDirectory() as tmp:
+        for compression in COMPRESSORS:
+            path = Path(tmp) / f"{compression}.mcsa"
+            write_archive(document, str(path), compression=compression)
+            with SectionArchive(str(path)) as archive:
+                assert archive.compression == compression
+                assert len(archive) == len(document.sections)
+                assert archive["sec-17"] == document.sections[17]
+                assert "sec-99" not in archive and archive.get("sec-99") is None
+                assert [s.content for s in archive.get_all("untitled-section")] == \
+                    ["<p>Untitled 0</p>", "<p>Untitled 1</p>"]
+                assert archive.to_document() == document
+
+
+def test_damaged_files_raise_archive_error():
+    """Empty, short, foreign, truncated and corrupt files are rejected with ArchiveError."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "chapter.mcsa"
+        write_archive(_document(), str(path))
+        data = path.read_bytes()
+        meta_offset = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)[0]
+
+        damaged = {
+            "empty": b"",
+            "short": data[:3],
+            "foreign": b"<html>" + data[6:],
+            "truncated": data[:-7],
+            "corrupt metadata": data[:meta_offset] + b"\x00" * 8 + data[meta_offset + 8:],
+        }
+        for name, content in damaged.items():
+            broken = Path(tmp) / f"{name}.mcsa"
+            broken.write_bytes(content)
+            try:
+                SectionArchive(str(broken)).close()
+                assert False, f"{name} archive was accepted"
+            except ArchiveError:
+                pass
+
+        try:
+            write_archive(_document(), str(path), compression="lz4")
+            assert False, "unknown compression was accepted"
+        except ArchiveError:
+            pass
+
+
+if __name__ == "__main__":
+    test_round_trip_per_compressor()
+    test_damaged_files_raise_archive_error()
+    print("Archive tests passed")
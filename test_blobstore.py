@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Tests for the content-addressed blob store."""
+
+import tempfile
+from pathlib import Path
+
+from municode_lib.blobstore import BlobStore, content_key
+from municode_lib.fileio import _UMASK
+from municode_lib.models import Section, Document
+
+BOILERPLATE = ("<p>Any person violating any provision of this chapter shall be guilty of a misdemeanor "
+               "and upon conviction shall be punished by a fine not exceeding five hundred dollars.</p>")
+
+
+def _document(title, contents):
+    sections = [Section(id=f"sec-{i}", title=f"Section {i}", label=f"Sec. {i}.", content=content)
+                for i, content in enumerate(contents)]
+    return Document(title=title, sections=sections, source_url="")
+
+
+def test_round_trip_is_exact():
+    """Content comes back byte for byte, including carriage returns."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BlobStore(tmp)
+        content = "<p>Line one\r\nline two\rend</p>"
+        key = store.put(content)
+        assert store.get(key) == content
+        assert content_key(store.get(key)) == key
+        store.close()
+
+
+def test_dedupe_and_shared_sections():
+    """Identical content is stored once and reported across municipalities."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BlobStore(tmp)
+        springfield = _document("Chapter 1", [BOILERPLATE, "<p>Springfield only.</p>"])
+        shelbyville = _document("Chapter 9", ["<p>Shelbyville only.</p>", BOILERPLATE.replace(" ", "  ")])
+
+        data = store.store_document(springfield, "springfield")
+        store.store_document(shelbyville, "shelbyville")
+
+        assert "content" not in data["sections"][0]
+        assert store.stats() == {"references": 4, "blobs": 3}
+        assert sum(1 for path in Path(tmp, "blobs").rglob("*") if path.is_file()) == 3
+        assert store.shared_sections() == {content_key(BOILERPLATE): [
+            ("shelbyville", "Chapter 9", "sec-1"), ("springfield", "Chapter 1", "sec-0")
+        ]}
+        assert store.load_document(data) == springfield
+        store.close()
+
+
+def test_near_duplicates():
+    """MinHash/LSH finds lightly edited content but not unrelated content."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BlobStore(tmp, near_duplicates=True, threshold=0.5)
+        original = store.put(BOILERPLATE)
+        store.put("<p>The council shall meet on the first Monday of every month at city hall.</p>")
+
+        edited = BOILERPLATE.replace("five hundred", "one thousand")
+        matches = store.find_near_duplicates(edited)
+        assert [key for key, _ in matches] == [original]
+        assert 0.5 <= matches[0][1] < 1.0
+        assert store.find_near_duplicates(BOILERPLATE) == []  # Its own blob is excluded
+        store.close()
+
+
+def test_blobs_stored_before_near_duplicate_indexing_are_found():
+    """Blobs written without near_duplicates are indexed when put again or by index_existing."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BlobStore(tmp)
+        original = store.put(BOILERPLATE)
+        other = store.put("<p>Dogs shall be kept on a leash not exceeding six feet in length in any public park.</p>")
+        store.close()
+
+        store = BlobStore(tmp, near_duplicates=True, threshold=0.5)
+        edited = BOILERPLATE.replace("five hundred", "one thousand")
+        assert store.find_near_duplicates(edited) == []
+        assert store.put(BOILERPLATE) == original
+        assert [key for key, _ in store.find_near_duplicates(edited)] == [original]
+
+        assert store.index_existing() == 1
+        assert store.index_existing() == 0
+        assert [key for key, _ in store.find_near_duplicates(
+            "<p>Dogs shall be kept on a leash not exceeding six feet in length in any city park.</p>")] == [other]
+        store.close()
+
+
+def test_saved_files_get_default_permissions():
+    """Blobs and referencing JSON are not left owner-only by the temporary file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BlobStore(tmp)
+        filepath = Path(tmp) / "out" / "chapter.json"
+        store.save_document(_document("Chapter 1", [BOILERPLATE]), "springfield", str(filepath))
+        assert store.load_json(str(filepath)).sections[0].content == BOILERPLATE
+        expected = 0o666 & ~_UMASK
+        assert filepath.stat().st_mode & 0o777 == expected
+        assert store._blob_path(content_key(BOILERPLATE)).stat().st_mode & 0o777 == expected
+        store.close()
+
+
+if __name__ == "__main__":
+    test_round_trip_is_exact()
+    test_dedupe_and_shared_sections()
+    test_near_duplicates()
+    test_blobs_stored_before_near_duplicate_indexing_are_found()
+    test_saved_files_get_default_permissions()
+    print("Blob store tests passed")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Tests for the persistent parse cache."""
+
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from municode_lib import cli
+from municode_lib.cache import ParseCache
+from municode_lib.models import Section, Document
+from municode_lib.parser import MunicodeParser
+
+SAMPLE_FILE = Path(__file__).parent / "fixtures" / "sample_code.html"
+
+KEYWORDS = ["Chapter", "Article", "Sec"]
+TAGS = ["h2", "h3", "h4"]
+
+
+def _document(title, size=1):
+    return Document(title=title, source_url="", sections=[
+        Section(id="sec-1", title="Title", label="Sec. 1.", content="x" * size)
+    ])
+
+
+def test_key_stability_and_invalidation():
+    """Keys ignore how input is split but change with config, version and mode."""
+    key = ParseCache.make_key([b"<div>abc</div>"], KEYWORDS, TAGS, "1")
+    assert key == ParseCache.make_key([b"<div>a", b"bc</div>"], KEYWORDS, TAGS, "1")
+    assert key == ParseCache.make_key([b"<div>abc</div>"], KEYWORDS, TAGS, "1", "full")
+
+    others = [
+        ParseCache.make_key([b"<div>abd</div>"], KEYWORDS, TAGS, "1"),
+        ParseCache.make_key([b"<div>abc</div>"], ["Chapter", "Sec"], TAGS, "1"),
+        ParseCache.make_key([b"<div>abc</div>"], KEYWORDS, ["h2"], "1"),
+        ParseCache.make_key([b"<div>abc</div>"], KEYWORDS, TAGS, "2"),
+        ParseCache.make_key([b"<div>abc</div>"], KEYWORDS, TAGS, "1", "stream"),
+        ParseCache.make_key([b"<div>abc</div>"], KEYWORDS, TAGS, "1", minified=True),
+    ]
+    assert len({key, *others}) == len(others) + 1
+
+
+def test_evicts_least_recently_used():
+    """Past max_bytes the entries with the oldest mtime go first; get refreshes mtime."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParseCache(tmp, max_bytes=10 ** 9)
+        for i, key in enumerate(["a", "b", "c"]):
+            cache.put(key, _document(key, 1000))
+            os.utime(cache._path(key), (1000 + i, 1000 + i))
+
+        assert cache.get("a").title == "a"  # Now the most recently used
+        entry_size = cache._path("a").stat().st_size
+        cache.max_bytes = entry_size * 3
+        cache.put("d", _document("d", 1000))
+
+        assert cache.get("b") is None
+        assert [cache.get(key).title for key in ("a", "c", "d")] == ["a", "c", "d"]
+
+
+def test_parser_caches_modes_apart():
+    """Full and streaming parses of one file are separate cache entries."""
+    with tempfile.TemporaryDirectory() as tmp:
+        parser = MunicodeParser(cache=ParseCache(tmp))
+        full = parser.parse_html_file(str(SAMPLE_FILE))
+        streamed = parser.parse_html_file(str(SAMPLE_FILE), stream=True)
+        assert len(list(Path(tmp).glob("*.json"))) == 2
+
+        again = parser.parse_html_file(str(SAMPLE_FILE), title="Renamed")
+        assert again.title == "Renamed"
+        assert again.sections == full.sections == streamed.sections
+
+
+def test_parser_key_follows_htmlmin_availability():
+    """Results parsed with and without htmlmin are cached apart."""
+    parser = MunicodeParser()
+    with mock.patch("municode_lib.parser.HAS_HTMLMIN", True):
+        minified = parser._cache_key(SAMPLE_FILE, "full")
+    with mock.patch("municode_lib.parser.HAS_HTMLMIN", False):
+        plain = parser._cache_key(SAMPLE_FILE, "full")
+    assert minified != plain
+
+
+def test_cli_cache_is_opt_in():
+    """The parse command only uses the cache when asked to."""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = str(Path(tmp) / "out.json")
+        with mock.patch.object(cli, "ParseCache") as cache:
+            with mock.patch("sys.argv", ["municode_lib", "parse", str(SAMPLE_FILE), "-o", output]):
+                assert cli.main() == 0
+            assert not cache.called
+
+            with mock.patch("sys.argv", ["municode_lib", "parse", str(SAMPLE_FILE), "-o", output,
+                                         "--cache-dir", tmp]):
+                cli.main()
+            cache.assert_called_once_with(tmp)
+
+
+if __name__ == "__main__":
+    test_key_stability_and_invalidation()
+    test_evicts_least_recently_used()
+    test_parser_caches_modes_apart()
+    test_parser_key_follows_htmlmin_availability()
+    test_cli_cache_is_opt_in()
+    print("Parse cache tests passed")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Tests for retrieval chunking and the incremental chunk pipeline."""
+
+import json
+import tempfile
+from pathlib import Path
+
+from municode_lib.chunking import Chunker, ChunkPipeline
+from municode_lib.models import Section, Document
+
+LONG_PATH = ["chapter-22", "Chapter 22 - CIVIL EMERGENCIES AND DISASTER RESPONSE", "article-ii",
+             "ARTICLE II. - ENFORCEMENT OF EMERGENCY ORDERS", "sec-22-31"]
+
+
+def _section(section_id, words, path=None):
+    content = "<p>" + " ".join(f"{section_id}w{i}" for i in range(words)) + "</p>"
+    return Section(id=section_id, title="Emergency orders", label="Sec. 22-31.", content=content,
+                   path=path or ["chapter-22", section_id])
+
+
+def test_chunks_respect_max_tokens():
+    """Prefix plus body never exceeds max_tokens, even with a long breadcrumb."""
+    section = _section("sec-22-31", 40, LONG_PATH)
+    chunks = Chunker(max_tokens=8, overlap=2).chunk_section(section, "Code")
+
+    assert all(len(chunk.text.split()) <= 8 for chunk in chunks)
+    assert chunks[0].context.startswith("chapter-22 > ")  # Metadata keeps the full breadcrumb
+    bodies = [chunk.text.split("\n", 1)[1].split() for chunk in chunks]
+    covered = [word for body in bodies for word in body]
+    assert set(covered) == set(section.text.split())
+    assert bodies[1][:2] == bodies[0][-2:]  # Overlap between consecutive chunks
+
+
+def test_pipeline_upserts_and_deletes_changes():
+    """Later runs only emit chunks of changed sections and deletes for removed ones."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = Path(tmp) / "manifest.json"
+        output = Path(tmp) / "chunks.jsonl"
+        chunker = Chunker(max_tokens=16, overlap=4)
+        sections = [_section("sec-1", 30), _section("sec-2", 10), _section("sec-3", 10)]
+
+        stats = ChunkPipeline(chunker, str(manifest)).run([Document("Code", sections, "")], str(output))
+        first = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+        assert stats["sections"] == stats["changed"] == 3
+        assert {record["op"] for record in first} == {"upsert"}
+
+        stats = ChunkPipeline(chunker, str(manifest)).run([Document("Code", sections, "")], str(output))
+        assert stats["changed"] == 0 and output.read_text(encoding="utf-8") == ""
+
+        removed_ids = {record["id"] for record in first if record["section_id"] == "sec-3"}
+        old_ids = {record["id"] for record in first if record["section_id"] == "sec-1"}
+        changed = [_section("sec-1", 20), sections[1]]
+        stats = ChunkPipeline(chunker, str(manifest)).run([Document("Code", changed, "")], str(output))
+        records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+
+        upserted = {record["id"] for record in records if record["op"] == "upsert"}
+        deleted = {record["id"] for record in records if record["op"] == "delete"}
+        assert {record["section_id"] for record in records if record["op"] == "upsert"} == {"sec-1"}
+        assert deleted == removed_ids | (old_ids - upserted)
+        assert stats["changed"] == 1 and stats["deleted"] == len(deleted)
+
+
+def test_failed_run_keeps_previous_output_and_manifest():
+    """A run that fails midway leaves the last output and manifest as they were."""
+    def failing_documents():
+        yield Document("Code", [_section("sec-1", 20)], "")
+        raise RuntimeError("source went away")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = Path(tmp) / "state" / "manifest.json"
+        output = Path(tmp) / "chunks.jsonl"
+        chunker = Chunker(max_tokens=16, overlap=4)
+        ChunkPipeline(chunker, str(manifest)).run([Document("Code", [_section("sec-1", 30)], "")], str(output))
+        before = (output.read_bytes(), manifest.read_bytes())
+
+        try:
+            ChunkPipeline(chunker, str(manifest)).run(failing_documents(), str(output))
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("failure was swallowed")
+
+        assert (output.read_bytes(), manifest.read_bytes()) == before
+        assert sorted(path.name for path in Path(tmp).rglob("*")) == ["chunks.jsonl", "manifest.json", "state"]
+
+
+if __name__ == "__main__":
+    test_chunks_respect_max_tokens()
+    test_pipeline_upserts_and_deletes_changes()
+    test_failed_run_keeps_previous_output_and_manifest()
+    print("Chunking tests passed")
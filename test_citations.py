@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Tests for citation extraction and the citation graph."""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from municode_lib.citations import CITATIONS_FILE, CitationGraph, extract_citations
+from municode_lib.cli import cite_command
+from municode_lib.models import Section, Document
+from municode_lib.titles import normalize_label_id
+
+
+def test_extract_citations_normalizes_references():
+    """References normalize like section titles, including lists."""
+    text = "See Sec. 22-1. and sections 22-3, 22-4, and 22-5; Article II of this chapter; § 30-1.2(a)."
+    assert [target for target, _ in extract_citations(text)] == [
+        "sec-22-1", "sec-22-3", "sec-22-4", "sec-22-5", "article-ii", "sec-30-1-2"
+    ]
+
+
+def test_graph_resolves_within_nearest_subtree():
+    """A repeated id resolves to the candidate sharing the longest path."""
+    sections = [
+        Section(id="chapter-22", title="", label="Chapter 22", content="", path=["chapter-22"]),
+        Section(id="article-ii", title="", label="Article II", content="", path=["chapter-22", "article-ii"]),
+        Section(id="sec-22-1", title="", label="Sec. 22-1.", content="<p>See Article II and Sec. 30-1.</p>",
+                path=["chapter-22", "sec-22-1"]),
+        Section(id="chapter-30", title="", label="Chapter 30", content="", path=["chapter-30"]),
+        Section(id="article-ii", title="", label="Article II", content="", path=["chapter-30", "article-ii"]),
+        Section(id="sec-30-1", title="", label="Sec. 30-1.", content="<p>As in Sec. 22-1.</p>",
+                path=["chapter-30", "sec-30-1"]),
+    ]
+    graph = CitationGraph.build([Document(title="Code", sections=sections, source_url="")])
+    assert graph.cites("Code", sections[2]) == ["chapter-22/article-ii", "chapter-30/sec-30-1"]
+    assert graph.cited_by("Code", "chapter-22/sec-22-1") == ["chapter-30/sec-30-1"]
+    assert graph.cited_by("Code", sections[4]) == []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        graph.save(Path(tmp) / "citations.json")
+        loaded = CitationGraph.load(Path(tmp) / "citations.json")
+    assert loaded.forward == graph.forward and loaded.reverse == graph.reverse
+
+
+def _labelled(label, content=""):
+    return Section(id=normalize_label_id(label), title="", label=label, content=content, path=[label])
+
+
+def test_references_resolve_with_the_documents_label_style():
+    """Codes labelled "Section 5.1." or "§ 5.1." resolve references written either way."""
+    for prefix in ("Section", "§"):
+        sections = [
+            _labelled(f"{prefix} 5.1.", "<p>See Sec. 5.2 and section 5.3.</p>"),
+            _labelled(f"{prefix} 5.2."),
+            _labelled(f"{prefix} 5.3.", "<p>As in § 5.1.</p>"),
+        ]
+        graph = CitationGraph.build([Document(title="Code", sections=sections, source_url="")])
+        assert graph.cites("Code", sections[0]) == [f"{prefix} 5.2.", f"{prefix} 5.3."]
+        assert graph.cites("Code", sections[2]) == [f"{prefix} 5.1."]
+
+
+def test_range_citations_cover_sections_between():
+    """A range cites both ends and the sections of the same kind between them."""
+    assert [target for target, _ in extract_citations("Secs. 22-1\u201422-3 and 22-5 through 22-6")] == [
+        "sec-22-1", "sec-22-3", "sec-22-5", "sec-22-6"
+    ]
+    sections = [_labelled(label) for label in ("Sec. 22-1.", "ARTICLE II.", "Sec. 22-2.", "Sec. 22-3.", "Sec. 22-4.")]
+    sections.append(_labelled("Sec. 22-9.", "<p>Secs. 22-1\u201422-3 apply.</p>"))
+    graph = CitationGraph.build([Document(title="Code", sections=sections, source_url="")])
+    assert graph.cites("Code", sections[-1]) == ["Sec. 22-1.", "Sec. 22-2.", "Sec. 22-3."]
+
+
+def test_cite_writes_next_to_documents():
+    """Without --output the graph lands in the documents' directory, not the working directory."""
+    section = Section(id="sec-1", title="", label="Sec. 1.", content="<p>See Sec. 2.</p>", path=["sec-1"])
+    with tempfile.TemporaryDirectory() as tmp:
+        municipality = Path(tmp) / "springfield"
+        paths = []
+        for name in ("Chapter 1", "Chapter 2"):
+            path = municipality / f"{name}.json"
+            Document(title=name, sections=[section], source_url="").save_json(path)
+            paths.append(str(path))
+
+        assert cite_command(argparse.Namespace(inputs=paths, output=None)) == 0
+        assert (municipality / CITATIONS_FILE).exists()
+        assert not Path(CITATIONS_FILE).exists()
+
+
+if __name__ == "__main__":
+    test_extract_citations_normalizes_references()
+    test_graph_resolves_within_nearest_subtree()
+    test_references_resolve_with_the_documents_label_style()
+    test_range_citations_cover_sections_between()
+    test_cite_writes_next_to_documents()
+    print("Citation tests passed")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Tests for per-section compression codecs."""
+
+import argparse
+import json
+import random
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from municode_lib import codec as codec_module
+from municode_lib.models import Section, Document
+from municode_lib.archive import SectionArchive, write_archive
+from municode_lib.cli import diff_command
+from municode_lib.server import Corpus
+from municode_lib.blobstore import BlobStore
+from municode_lib.codec import CodecError, GzipCodec, ZstdDictCodec, HAS_ZSTD, load_codec
+from municode_lib.writer import OutputWriter
+
+WORDS = "shall may permit zoning district owner property council notice hearing fee lot street".split()
+
+
+def _document(count=400):
+    rng = random.Random(7)
+    sections = []
+    for i in range(count):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 40)))
+        content = f'<p>&nbsp;&nbsp;&nbsp;&nbsp;(a) {text}.</p><p class="historyitem">(Ord. No. {i})</p>'
+        sections.append(Section(id=f"sec-{i}", title=f"Section {i}", label=f"Sec. {i}.", content=content,
+                                path=["chapter-1", f"sec-{i}"]))
+    return Document(title="Chapter 1", sections=sections, source_url="")
+
+
+def test_gzip_round_trip():
+    """The baseline codec restores text exactly and needs no dictionary."""
+    codec = load_codec(GzipCodec().id)
+    text = "<p>Café § 22-1</p>"
+    assert codec.decode_text(codec.encode_text(text)) == text
+
+
+@pytest.mark.skipif(not HAS_ZSTD, reason="zstandard is not installed")
+def test_dictionary_codec_in_every_store():
+    """Data compressed with a trained dictionary reads back from JSON, JSONL, archives and blobs."""
+    document = _document()
+    codec = ZstdDictCodec.train(section.content for section in document.sections)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        with OutputWriter(tmp / "out", ["json", "jsonl"], codec=codec) as writer:
+            writer.write_document(document)
+        assert (tmp / "out" / "dictionaries" / f"{codec.digest}.zdict").exists()
+        assert Document.load_json(tmp / "out" / "Chapter 1.json") == document
+        record = json.loads((tmp / "out" / "sections.jsonl").read_text(encoding="utf-8").splitlines()[5])
+        assert "content" not in record
+        assert Section.from_dict(record, load_codec(record["codec"], tmp / "out")) == document.sections[5]
+
+        write_archive(document, tmp / "archive" / "chapter.mcsa", compression=codec)
+        with SectionArchive(tmp / "archive" / "chapter.mcsa") as archive:
+            assert archive.compression == codec.id
+            assert archive["sec-42"] == document.sections[42]
+
+        store = BlobStore(str(tmp / "blobs"), codec=codec)
+        key = store.put(document.sections[3].content)
+        assert store.get(key) == document.sections[3].content
+        store.close()
+
+        compressed = sum(len(codec.compress(s.content.encode("utf-8"))) for s in document.sections)
+        gzipped = sum(len(GzipCodec().compress(s.content.encode("utf-8"))) for s in document.sections)
+        assert compressed < gzipped
+
+        with pytest.raises(CodecError):
+            load_codec("zstd-dict:0000000000000000", tmp)
+
+
+@pytest.mark.skipif(not HAS_ZSTD, reason="zstandard is not installed")
+def test_fresh_process_loads_dictionary_from_disk():
+    """A reader that never saw the codec finds its dictionary in the data directory."""
+    codec = ZstdDictCodec.train(section.content for section in _document().sections)
+    encoded = codec.encode_text("<p>Sec. 22-1. Emergency procedures.</p>")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        codec.save(Path(tmp))
+        fresh = {"none": codec_module.Codec(), "gzip": GzipCodec()}
+        with mock.patch.object(codec_module, "_LOADED", fresh):
+            with pytest.raises(CodecError):
+                load_codec(codec.id, Path(tmp) / "elsewhere")
+            loaded = load_codec(codec.id, Path(tmp))
+            assert loaded is not codec and loaded.dictionary == codec.dictionary
+            assert loaded.decode_text(encoded) == "<p>Sec. 22-1. Emergency procedures.</p>"
+            assert load_codec(codec.id) is loaded
+
+
+@pytest.mark.skipif(not HAS_ZSTD, reason="zstandard is not installed")
+def test_unreadable_dictionary_raises_codec_error():
+    """A corrupt dictionary file or a missing directory is reported as CodecError."""
+    codec = ZstdDictCodec.train(section.content for section in _document().sections)
+    with tempfile.TemporaryDirectory() as tmp:
+        codec.save(Path(tmp))
+        path = Path(tmp) / "dictionaries" / f"{codec.digest}.zdict"
+        path.write_bytes(b"\x37\xa4\x30\xec" + b"\x00" * 64)
+        with mock.patch.object(codec_module, "_LOADED", {}):
+            with pytest.raises(CodecError):
+                load_codec(codec.id, Path(tmp))
+            with pytest.raises(CodecError):
+                load_codec(codec.id)
+
+
+
+@pytest.mark.skipif(not HAS_ZSTD, reason="zstandard is not installed")
+def test_missing_dictionary_is_reported_not_raised():
+    """Commands and the corpus server handle a compressed document whose dictionary is gone."""
+    document = _document(50)
+    codec = ZstdDictCodec.train(section.content for section in _document().sections)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        document.save_json(tmp / "town" / "compressed.json", codec=codec)
+        document.save_json(tmp / "town" / "plain.json")
+        shutil.rmtree(tmp / "town" / "dictionaries")
+
+        with mock.patch.object(codec_module, "_LOADED", {}):
+            args = argparse.Namespace(old=str(tmp / "town" / "compressed.json"), new=str(tmp / "town" / "plain.json"),
+                                      no_text=False, context=3, output=None)
+            assert diff_command(args) == 1
+            corpus = Corpus(str(tmp))
+        assert [doc.title for doc in corpus.documents["town"]] == ["Chapter 1"]
+
+
+if __name__ == "__main__":
+    test_gzip_round_trip()
+    if HAS_ZSTD:
+        test_dictionary_codec_in_every_store()
+        test_fresh_process_loads_dictionary_from_disk()
+        test_unreadable_dictionary_raises_codec_error()
+        test_missing_dictionary_is_reported_not_raised()
+    print("Codec tests passed")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Tests for the structural document diff."""
+
+from municode_lib.diff import diff_documents
+from municode_lib.models import Section, Document
+
+
+def _section(number, body, chapter="chapter-22"):
+    section_id = f"sec-{number}"
+    return Section(id=section_id, title=f"Title {body[:8]}", label=f"Sec. {number}.",
+                   content=f"<p>{body}</p>", path=[chapter, section_id])
+
+
+def test_diff_classifies_changes():
+    """Additions, removals, edits, moves and renumbering are told apart."""
+    old = Document(title="Code", source_url="", sections=[
+        _section("22-1", "Emergency procedures apply to all departments."),
+        _section("22-2", "Suspension of portions of this code."),
+        _section("22-3", "Penalties for violations of this chapter are set by the council."),
+        _section("22-4", "Repealed."),
+    ])
+    new = Document(title="Code", source_url="", sections=[
+        _section("22-1", "Emergency   procedures apply to all departments."),  # Whitespace only
+        _section("30-1", "Suspension of portions of this code.", chapter="chapter-30"),
+        _section("22-5", "Penalties for violations of this chapter are set by the city council."),
+        _section("22-6", "Definitions."),
+    ])
+
+    changes = diff_documents(old, new)
+    kinds = [(change.kind, change.old_id, change.new_id) for change in changes.changes]
+    assert kinds == [
+        ("moved", "sec-22-2", "sec-30-1"),
+        ("modified", "sec-22-3", "sec-22-5"),
+        ("removed", "sec-22-4", None),
+        ("added", None, "sec-22-6"),
+    ]
+    assert changes.summary()["unchanged"] == 1
+    assert "+Penalties for violations of this chapter are set by the city council." in changes.changes[1].text_diff
+
+
+
+def test_inserted_section_shifts_numbering_without_modifying():
+    """Sections renumbered by an insertion are moved; an edited one is still paired."""
+    bodies = ["Emergency procedures apply to all departments.",
+              "Suspension of portions of this code.",
+              "Penalties for violations of this chapter are set by the council.",
+              "Notices shall be delivered in writing to the clerk."]
+    old = Document(title="Code", source_url="", sections=[
+        _section(f"22-{n}", body) for n, body in enumerate(bodies, 1)
+    ])
+    new = Document(title="Code", source_url="", sections=[
+        _section("22-1", bodies[0]),
+        _section("22-2", "Definitions."),
+        _section("22-3", bodies[1]),
+        _section("22-4", bodies[2]),
+        _section("22-5", bodies[3].replace("clerk", "city clerk")),
+    ])
+
+    changes = diff_documents(old, new)
+    kinds = [(change.kind, change.old_id, change.new_id) for change in changes.changes]
+    assert kinds == [
+        ("added", None, "sec-22-2"),
+        ("moved", "sec-22-2", "sec-22-3"),
+        ("moved", "sec-22-3", "sec-22-4"),
+        ("modified", "sec-22-4", "sec-22-5"),
+    ]
+    assert changes.summary()["unchanged"] == 1
+
+
+def test_swapped_sections_are_moved():
+    """Two sections exchanging numbers are moves, not two edits."""
+    first, second = "Suspension of portions of this code.", "Notices shall be delivered in writing."
+    old = Document(title="Code", source_url="", sections=[_section("22-1", first), _section("22-2", second)])
+    new = Document(title="Code", source_url="", sections=[_section("22-1", second), _section("22-2", first)])
+    assert [change.kind for change in diff_documents(old, new).changes] == ["moved", "moved"]
+
+
+if __name__ == "__main__":
+    test_diff_classifies_changes()
+    test_inserted_section_shifts_numbering_without_modifying()
+    test_swapped_sections_are_moved()
+    print("Diff tests passed")
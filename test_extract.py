@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for batched DOM extraction."""
+
+from municode_lib.extract import extract_page_payload, extract_toc_links
+from municode_lib.scraper import MunicodeScraper
+
+CHUNKS = ('<ul class="chunks"><li><div class="chunk-title">Sec. 22-1. - Emergency procedures.</div>'
+          '<div class="chunk-content"><p>Text.</p></div></li>'
+          '<li><div class="chunk-title">Sec. 22-2. - Suspension.</div>'
+          '<div class="chunk-content"><p>More text.</p></div></li></ul>')
+
+
+class ScriptDriver:
+    """Stands in for a WebDriver, answering execute_script with canned results."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        return self.results.pop(0)
+
+
+class PayloadScraper(MunicodeScraper):
+    """Scraper whose page loads always succeed on a ScriptDriver."""
+
+    def __init__(self, driver):
+        super().__init__()
+        self.driver = driver
+
+    def _wait_for_element(self, url, by, value, timeout=None, may_be_missing=False):
+        return True
+
+    def _wait_for_present(self, by, value, timeout=None):
+        return True
+
+
+def test_payload_results_and_fallbacks():
+    """Script results pass through; a page without a result reads as empty."""
+    driver = ScriptDriver({"heading": "Sec. 22-1. - Emergency procedures.", "chunks": CHUNKS}, None,
+                          [{"href": "https://example.com/?nodeId=CH22", "text": "Chapter 22"}], None)
+
+    assert extract_page_payload(driver) == {"heading": "Sec. 22-1. - Emergency procedures.", "chunks": CHUNKS}
+    assert extract_page_payload(driver, include_chunks=False) == {"heading": None, "chunks": None}
+    assert extract_toc_links(driver, "//ul") == [{"href": "https://example.com/?nodeId=CH22", "text": "Chapter 22"}]
+    assert extract_toc_links(driver, "//nav/ul") is None
+    assert driver.calls == [(True,), (False,), ("//ul",), ("//nav/ul",)]
+
+
+def test_page_payload_is_parsed_into_sections():
+    """The heading is read first without chunks, then the chunk list is parsed into sections."""
+    heading = "Sec. 22-1. - Emergency procedures."
+    driver = ScriptDriver({"heading": heading, "chunks": None}, {"heading": heading, "chunks": CHUNKS})
+    scraper = PayloadScraper(driver)
+
+    sections = scraper._parse_sections("https://example.com/codes?nodeId=CH22_S1", document_id="chapter-22")
+
+    assert driver.calls == [(False,), (True,)]
+    assert [(section.id, section.title) for section in sections] == [
+        ("sec-22-1", "Emergency procedures."), ("sec-22-2", "Suspension.")
+    ]
+    assert sections[1].content == '<div class="chunk-content"><p>More text.</p></div>'
+    assert sections[1].path == ["chapter-22", "sec-22-2"]
+
+
+def test_seen_or_empty_heading_skips_the_chunk_list():
+    """A page already parsed, or with an empty heading, never serializes its chunk list."""
+    heading = "Sec. 22-1. - Emergency procedures."
+    driver = ScriptDriver({"heading": heading, "chunks": None}, {"heading": heading, "chunks": CHUNKS},
+                          {"heading": " SEC. 22-1. -  Emergency procedures. ", "chunks": None},
+                          {"heading": "", "chunks": None})
+    scraper = PayloadScraper(driver)
+
+    assert len(scraper._parse_sections("https://example.com/codes?nodeId=CH22_S1")) == 2
+    assert scraper._parse_sections("https://example.com/codes?nodeId=CH22_S1_DUP") == []
+    assert scraper._parse_sections("https://example.com/codes?nodeId=CH22_S9") == []
+    assert driver.calls == [(False,), (True,), (False,), (False,)]
+
+
+if __name__ == "__main__":
+    test_payload_results_and_fallbacks()
+    test_page_payload_is_parsed_into_sections()
+    test_seen_or_empty_heading_skips_the_chunk_list()
+    print("Extraction tests passed")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Tests for include/exclude TOC filters."""
+
+from municode_lib.filters import PathFilter
+from municode_lib.models import Section
+from municode_lib.scraper import FetchedPage, MunicodeScraper
+
+
+def _toc():
+    entries = [
+        ("chapter-22", "Chapter 22", ["chapter-22"]),
+        ("article-i", "ARTICLE I.", ["chapter-22", "article-i"]),
+        ("sec-22-1", "Sec. 22-1.", ["chapter-22", "article-i", "sec-22-1"]),
+        ("article-ii", "ARTICLE II.", ["chapter-22", "article-ii"]),
+        ("sec-22-20", "Sec. 22-20.", ["chapter-22", "article-ii", "sec-22-20"]),
+    ]
+    return [Section(id=i, title="", label=label, content="", path=path) for i, label, path in entries]
+
+
+def _ids(sections):
+    return [section.id for section in sections]
+
+
+def test_path_glob_selects_subtrees():
+    """A path glob selects matching entries and everything below them."""
+    path_filter = PathFilter(include=["chapter-22/article-*"])
+    assert _ids(path_filter.select(_toc())) == ["article-i", "sec-22-1", "article-ii", "sec-22-20"]
+    assert path_filter.may_contain("chapter-22", "Chapter 22", ["chapter-22"])
+    assert not path_filter.may_contain("chapter-30", "Chapter 30", ["chapter-30"])
+
+
+def test_exclude_prunes_subtree():
+    """Excluding an entry drops its descendants too."""
+    path_filter = PathFilter(exclude=["re:^article ii\\b"])
+    assert _ids(path_filter.select(_toc())) == ["chapter-22", "article-i", "sec-22-1"]
+
+
+def _page(*titles):
+    items = "".join(f'<li><div class="chunk-title">{t}</div><div class="chunk-content"><p>{t}</p></div></li>'
+                    for t in titles)
+    return f'<ul class="chunks">{items}</ul>'
+
+
+class TocScraper(MunicodeScraper):
+    """Scraper serving one chapter TOC and its content pages from memory."""
+
+    LINKS = [
+        {"href": "https://example.com/code?nodeId=CH22", "text": "Chapter 22 - CIVIL EMERGENCIES"},
+        {"href": "https://example.com/code?nodeId=CH22_ARTI", "text": "ARTICLE I. - IN GENERAL"},
+        {"href": "https://example.com/code?nodeId=CH22_ARTII", "text": ""},
+    ]
+    PAGES = {
+        "CH22": _page("Chapter 22 - CIVIL EMERGENCIES"),
+        "CH22_ARTI": _page("ARTICLE I. - IN GENERAL", "Sec. 22-1. - Definitions.", "Sec. 22-2. - Reserved."),
+        "CH22_ARTII": _page("ARTICLE II. - ENFORCEMENT", "Sec. 22-20. - Penalties."),
+    }
+
+    def _section_toc_links(self, url):
+        return self.LINKS
+
+    def _fetch_page(self, url):
+        node_id = url.split("nodeId=")[1]
+        return FetchedPage(html=self.PAGES[node_id], heading=node_id, node_id=node_id)
+
+
+def test_scrape_filters_content_pages_and_keeps_untitled_links():
+    """Excluded subsections of a selected page are dropped; TOC links without text are still scraped."""
+    document = TocScraper()._scrape_entry("https://example.com/code?nodeId=CH22", PathFilter(exclude=["sec-22-2"]))
+    assert _ids(document.sections) == ["chapter-22", "article-i", "sec-22-1", "article-ii", "sec-22-20"]
+
+    outline = TocScraper()._outline_sections(TocScraper.LINKS, "chapter-22")
+    assert _ids(outline) == ["chapter-22", "article-i", "ch22-artii"]
+    assert outline[2].url == TocScraper.LINKS[2]["href"]
+
+
+if __name__ == "__main__":
+    test_path_glob_selects_subtrees()
+    test_exclude_prunes_subtree()
+    test_scrape_filters_content_pages_and_keeps_untitled_links()
+    print("Filter tests passed")
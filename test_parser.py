@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Tests for the alternative MunicodeParser parsing modes."""
+
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from municode_lib import parser as parser_module
+from municode_lib.parser import MunicodeParser
+
+SAMPLE_FILE = Path(__file__).parent / "fixtures" / "sample_code.html"
+
+
+def _chunk(heading, body):
+    return f'<li>{heading}<div class="chunk-content">{body}</div></li>'
+
+
+# Markup a naive tag scan splits differently from the tree builder
+TRICKY_HTML = {
+    "heading with >": _chunk("Sec. 1. - Rates > 10 percent.", "<p>One.</p>") + _chunk("Sec. 2. - Two.", "<p>Two.</p>"),
+    "div in comment": _chunk("Sec. 1. - One.", "<p>One <!-- </div> --> still one.</p><p>More.</p>")
+    + _chunk("Sec. 2. - Two.", "<p>Two.</p>"),
+    "div in script": _chunk("Sec. 1. - One.", "<script>var s = '<div>';</script><style>/* <div> */</style>")
+    + _chunk("Sec. 2. - Two.", "<p>Two.</p>"),
+    "unclosed div": _chunk("Sec. 1. - One.", "<div class='note'>Unclosed <p>One.</p>")
+    + _chunk("Sec. 2. - Two.", "<p>Two.</p>") + _chunk("Sec. 3. - Three.", "<p>Three.</p>"),
+    "chunk left open": '<div class="code">Sec. 1. - One.<div class="chunk-content"><div>open<p>One.</p></div>'
+    'Sec. 2. - Two.<div class="chunk-content"><p>Two.</p></div></div>Sec. 3.<div class="chunk-content">3</div>',
+    "attributes and case": '<UL><LI>Sec. 1. - A &gt; B.<DIV CLASS="chunk-content"><a title="x > y">a</a></DIV></LI>'
+    '<!-- Sec. 9 --> <li>Sec. 2.<div class="chunk-content"/></li><li>Sec. 3.<div class="chunk-content">y</span>'
+    '<div data-x=\'</div>\'>q</div></div></li></UL>',
+}
+
+
+def test_streaming_matches_full_parse():
+    """Streaming mode must produce the same sections as a full parse."""
+    parser = MunicodeParser()
+    expected = parser.parse_html_file(str(SAMPLE_FILE))
+    streamed = parser.parse_html_file(str(SAMPLE_FILE), stream=True)
+
+    assert len(expected.sections) == 11
+    assert streamed.to_dict() == expected.to_dict()
+
+
+def test_deferred_paths_match_sequential_parse():
+    """Rebuilding paths in a post-pass must match sequential path tracking."""
+    parser = MunicodeParser()
+    html_content = SAMPLE_FILE.read_text(encoding="utf-8")
+    expected = parser.parse_html_string(html_content)
+    deferred = parser.parse_html_string(html_content, deferred_paths=True)
+
+    assert deferred.to_dict() == expected.to_dict()
+
+
+def test_parallel_matches_sequential_parse():
+    """Chunk-level parallel parsing must match a sequential parse."""
+    parser = MunicodeParser()
+    html_content = SAMPLE_FILE.read_text(encoding="utf-8")
+    expected = parser.parse_html_string(html_content)
+    # Lower the threshold so the fixture goes through the process pool
+    with mock.patch.object(parser_module, "_MIN_PARALLEL_CHUNKS", 1), \
+            mock.patch.object(parser, "process_fragment", side_effect=AssertionError("sequential fallback")):
+        parallel = parser.parse_html_string(html_content, workers=2)
+
+    assert parallel.to_dict() == expected.to_dict()
+
+
+def test_lazy_matches_sequential_parse():
+    """Span-backed sections must materialize the same content as a full parse."""
+    parser = MunicodeParser()
+    expected = parser.parse_html_file(str(SAMPLE_FILE))
+    lazy = parser.parse_html_file(str(SAMPLE_FILE), lazy=True)
+
+    assert not any(section.is_materialized() for section in lazy.sections)
+    assert [s.path for s in lazy.sections] == [s.path for s in expected.sections]
+    assert lazy.to_dict() == expected.to_dict()
+
+
+def test_fragment_modes_match_full_parse_on_tricky_markup():
+    """Fragment-based modes split chunks exactly where the full parse puts them."""
+    parser = MunicodeParser()
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, body in TRICKY_HTML.items():
+            path = Path(tmp) / "code.html"
+            html_content = f"<html><body><ul>{body}</ul></body></html>"
+            path.write_text(html_content, encoding="utf-8")
+            expected = parser.parse_html_file(str(path)).to_dict()
+
+            assert parser.parse_html_file(str(path), stream=True).to_dict() == expected, name
+            assert parser.parse_html_file(str(path), lazy=True).to_dict() == expected, name
+            with mock.patch.object(parser_module, "_MIN_PARALLEL_CHUNKS", 1):
+                parallel = parser.parse_html_string(html_content, "code", str(path), workers=2)
+            assert parallel.to_dict() == expected, name
+
+
+if __name__ == "__main__":
+    test_streaming_matches_full_parse()
+    test_deferred_paths_match_sequential_parse()
+    test_parallel_matches_sequential_parse()
+    test_lazy_matches_sequential_parse()
+    test_fragment_modes_match_full_parse_on_tricky_markup()
+    print("Parser mode tests passed")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Tests for the pipelined crawler."""
+
+import threading
+
+from municode_lib.exceptions import ScrapingError
+from municode_lib.pipeline import PipelinedCrawler
+from municode_lib.scraper import FetchedPage, MunicodeScraper
+
+BASE_URL = "https://example.com/codes"
+
+
+def _entry(chapter, pages):
+    url = f"{BASE_URL}?nodeId=CH{chapter}"
+    return url, (f"Chapter {chapter}", f"chapter-{chapter}", [f"{url}_S{n}" for n in range(1, pages + 1)])
+
+
+class StubScraper(MunicodeScraper):
+    """Scraper serving a fixed TOC, with each content page holding one section."""
+
+    def __init__(self, entries, fail_entry=None, fail_page=None):
+        super().__init__()
+        self.driver = object()
+        self.entries = dict(entries)
+        self.fail_entry = fail_entry
+        self.fail_page = fail_page
+        self.fetched = []
+
+    def _select_entries(self, url, path_filter=None):
+        return [(entry_url, False) for entry_url in self.entries]
+
+    def _expand_section_toc(self, url, path_filter=None, inherited=False):
+        if url == self.fail_entry:
+            raise RuntimeError("browser crashed")
+        return self.entries[url]
+
+    def _fetch_page(self, url):
+        self.fetched.append(url)
+        if url == self.fail_page:
+            raise ScrapingError(f"{url} timed out waiting for 'codesContent'")
+        number = url.rsplit("_S", 1)[1]
+        chapter = url.split("nodeId=CH", 1)[1].split("_", 1)[0]
+        html = (f'<ul class="chunks"><li><div class="chunk-title">Sec. {chapter}-{number}. - Title.</div>'
+                f'<div class="chunk-content"><p>Text of {url}.</p></div></li></ul>')
+        return FetchedPage(html=html, heading=url, node_id=None)
+
+
+def test_documents_in_toc_order_and_failed_pages_skipped():
+    """Documents come out in TOC order; a page that fails to load is skipped."""
+    first, second = _entry(1, 3), _entry(2, 2)
+    scraper = StubScraper([first, second], fail_page=f"{first[0]}_S2")
+
+    documents = PipelinedCrawler(scraper, prefetch=1).crawl(BASE_URL)
+
+    assert [doc.title for doc in documents] == ["Chapter 1", "Chapter 2"]
+    assert [[section.id for section in doc.sections] for doc in documents] == [
+        ["sec-1-1", "sec-1-3"], ["sec-2-1", "sec-2-2"]
+    ]
+    assert documents[0].sections[0].path == ["chapter-1", "sec-1-1"]
+
+
+def test_fetch_error_reaches_the_consumer():
+    """An unexpected error in the fetch thread is raised from the iterator after what completed."""
+    first, second = _entry(1, 2), _entry(2, 2)
+    scraper = StubScraper([first, second], fail_entry=second[0])
+    threads = threading.active_count()
+
+    documents = []
+    try:
+        for doc in PipelinedCrawler(scraper).iter_documents(BASE_URL):
+            documents.append(doc)
+    except RuntimeError as e:
+        assert str(e) == "browser crashed"
+    else:
+        raise AssertionError("fetch error was swallowed")
+
+    assert [doc.title for doc in documents] == ["Chapter 1"]
+    assert threading.active_count() == threads
+
+
+def test_abandoned_crawl_stops_the_fetch_thread():
+    """Closing the iterator early stops page loads instead of draining the TOC."""
+    scraper = StubScraper([_entry(1, 50)])
+    threads = threading.active_count()
+
+    sections = PipelinedCrawler(scraper, prefetch=1).iter_sections(BASE_URL)
+    assert next(sections).id == "sec-1-1"
+    sections.close()
+
+    assert threading.active_count() == threads
+    assert len(scraper.fetched) < 10
+
+
+if __name__ == "__main__":
+    test_documents_in_toc_order_and_failed_pages_skipped()
+    test_fetch_error_reaches_the_consumer()
+    test_abandoned_crawl_stops_the_fetch_thread()
+    print("Pipeline tests passed")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Tests for the persistent seen-set of parsed pages."""
+
+import tempfile
+from pathlib import Path
+
+from municode_lib.exceptions import ScrapingError
+from municode_lib.scraper import MunicodeScraper
+from municode_lib.seen import FileSeenSet, SeenSet, SqliteSeenSet, open_seen_set
+
+
+def _check_claims(first: SeenSet, second: SeenSet):
+    """Two handles on the same store: exactly one claim of a page wins."""
+    assert first.claim("Sec. 22-1.  Emergency\nprocedures", node_id="100")
+    assert not second.claim("sec. 22-1. emergency procedures", node_id="101")
+    assert second.has_node("100") and second.has_node("101")
+    assert "SEC. 22-1. EMERGENCY PROCEDURES" in second
+    assert not second.has_heading("Sec. 22-2.")
+
+
+def test_file_backend_shares_claims():
+    """Processes sharing a key file see each other's claims, ignoring partial lines."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "seen.txt"
+        first, second = FileSeenSet(str(path)), FileSeenSet(str(path))
+        _check_claims(first, second)
+
+        with open(path, "a", encoding="ascii") as f:
+            f.write("abc")  # A concurrent write still in progress
+        assert len(FileSeenSet(str(path))) == 3
+
+
+def test_sqlite_backend_shares_claims():
+    """Concurrent connections claim each page exactly once."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "seen.db"
+        first, second = SqliteSeenSet(str(path)), SqliteSeenSet(str(path))
+        _check_claims(first, second)
+        assert len(first) == 3
+        first.close()
+        second.close()
+
+
+def test_open_seen_set_picks_backend():
+    """The backend follows the path suffix."""
+    with tempfile.TemporaryDirectory() as tmp:
+        assert type(open_seen_set()) is SeenSet
+        assert isinstance(open_seen_set(str(Path(tmp) / "seen.txt")), FileSeenSet)
+        store = open_seen_set(str(Path(tmp) / "seen.sqlite"))
+        assert isinstance(store, SqliteSeenSet)
+        store.close()
+
+
+class StubDriver:
+    """Stands in for a WebDriver on a loaded content page."""
+
+    def execute_script(self, script, include_chunks):
+        return {"heading": "Sec. 22-1. - Emergency procedures.", "chunks": None}
+
+
+class TimeoutScraper(MunicodeScraper):
+    """Scraper whose pages show a heading but never finish loading content."""
+
+    def __init__(self, seen):
+        super().__init__(seen=seen)
+        self.driver = StubDriver()
+
+    def _wait_for_element(self, url, by, value, timeout=None, may_be_missing=False):
+        return True
+
+    def _wait_for_present(self, by, value, timeout=None):
+        return False
+
+
+def test_failed_page_is_not_recorded():
+    """A page that times out after its heading loads is retried by later runs."""
+    seen = SeenSet()
+    scraper = TimeoutScraper(seen)
+    try:
+        scraper._parse_sections("https://example.com/doc?nodeId=100")
+        assert False, "expected ScrapingError"
+    except ScrapingError:
+        pass
+    assert len(seen) == 0
+
+
+if __name__ == "__main__":
+    test_file_backend_shares_claims()
+    test_sqlite_backend_shares_claims()
+    test_open_seen_set_picks_backend()
+    test_failed_page_is_not_recorded()
+    print("Seen-set tests passed")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Tests for the corpus query server."""
+
+import json
+import tempfile
+import threading
+import urllib.request
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.parse import quote
+
+from municode_lib.models import Section, Document
+from municode_lib.parser import MunicodeParser
+from municode_lib.server import Corpus, make_server
+
+SAMPLE_FILE = Path(__file__).parent / "fixtures" / "sample_code.html"
+
+
+def _get(url, etag=None):
+    request = urllib.request.Request(url)
+    if etag:
+        request.add_header("If-None-Match", etag)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read()), response.headers["ETag"]
+    except HTTPError as e:
+        return e.code, None, e.headers["ETag"]
+
+
+def test_routes_and_etags():
+    """Sections, subtrees and search are served; a matching ETag gives 304."""
+    with tempfile.TemporaryDirectory() as tmp:
+        document = MunicodeParser().parse_html_file(str(SAMPLE_FILE), use_cache=False)
+        document.save_json(Path(tmp) / "springfield" / "code.json")
+
+        server = make_server(tmp, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            assert _get(base + "/")[1] == {"springfield": 1}
+
+            section = document.sections[2]
+            status, body, etag = _get(f"{base}/springfield/sections/{section.id}")
+            assert status == 200 and body[0]["title"] == section.title
+            assert _get(f"{base}/springfield/sections/{section.id}", etag)[0] == 304
+
+            status, body, _ = _get(f"{base}/springfield/tree/{quote(section.path[0], safe='')}")
+            assert [s["id"] for s in body] == [s.id for s in document.sections if s.path[0] == section.path[0]]
+
+            status, body, _ = _get(f"{base}/springfield/search?q=emergency")
+            assert status == 200 and body
+            assert _get(f"{base}/nowhere")[0] == 404
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_corpus_loads_only_documents():
+    """Outlines, graphs, indexes, manifests and broken files are skipped, not indexed or fatal."""
+    section = Section(id="sec-1", title="Fees/charges", label="Sec. 1.", content="<p>Fees shall apply.</p>",
+                      path=["Chapter 1 - Fees/charges", "sec-1"])
+    document = Document(title="Chapter 1", sections=[section], source_url="")
+    with tempfile.TemporaryDirectory() as tmp:
+        town = Path(tmp) / "springfield"
+        document.save_json(town / "Chapter 1.json")
+        document.save_json(town / "Chapter 1.outline.json")
+        document.save_json(town / ".cache" / "parsed.json")
+        (town / "index.json").write_text(json.dumps({"versions": [], "sections": []}), encoding="utf-8")
+        (town / "chunks.manifest.json").write_text(json.dumps({"sections": {"fingerprint": "x"}}), encoding="utf-8")
+        (town / "broken.json").write_text('{"title": "Broken", "sections": [{"id": "a", "path": 5}]}',
+                                          encoding="utf-8")
+        (town / "binary.json").write_bytes(b"\xff\xfe{")
+
+        corpus = Corpus(tmp)
+        assert [doc.title for doc in corpus.documents["springfield"]] == ["Chapter 1"]
+
+        server = make_server(tmp, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            tree = "/".join(quote(entry, safe="") for entry in section.path)
+            status, body, _ = _get(f"{base}/springfield/tree/{tree}")
+            assert status == 200 and [s["id"] for s in body] == ["sec-1"]
+            assert _get(f"{base}/springfield/search?q=fees&limit=-1")[0] == 400
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    test_routes_and_etags()
+    test_corpus_loads_only_documents()
+    print("Server tests passed")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Tests for browser session management."""
+
+from unittest import mock
+
+from selenium.common.exceptions import SessionNotCreatedException
+
+from municode_lib import session as session_module
+from municode_lib.scraper import MunicodeScraper
+from municode_lib.session import BrowserSession, create_driver
+
+
+class FakeDriver:
+    """Stands in for a Chrome WebDriver."""
+
+    def __init__(self, service=None, options=None):
+        self.path = service.path if service is not None else None
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_stale_driver_path_is_refreshed():
+    """A cached chromedriver that Chrome rejects is resolved again once."""
+    def chrome(service, options):
+        if service.path == "/cache/old-chromedriver":
+            raise SessionNotCreatedException("This version of ChromeDriver only supports Chrome version 120")
+        return FakeDriver(service, options)
+
+    def resolve(refresh=False):
+        return "/cache/new-chromedriver" if refresh else "/cache/old-chromedriver"
+
+    with mock.patch("selenium.webdriver.Chrome", side_effect=chrome), \
+            mock.patch.object(session_module, "resolve_driver_path", side_effect=resolve):
+        driver = create_driver()
+    assert driver.path == "/cache/new-chromedriver"
+
+
+def test_restart_rebinds_attached_scrapers():
+    """Every scraper attached to a session follows it to the new browser."""
+    with mock.patch.object(session_module, "create_driver", side_effect=lambda *args: FakeDriver()):
+        browser = BrowserSession()
+        first = MunicodeScraper(session=browser)
+        second = MunicodeScraper(session=browser)
+        first._setup_driver()
+        second._setup_driver()
+        old = second.driver
+
+        first._recycle_driver("test")
+
+        assert old.quit_called
+        assert first.driver is second.driver is browser.driver is not old
+        second.close()
+        assert second.driver is None and browser.users == 1
+        browser.restart()
+        assert first.driver is browser.driver and second.driver is None
+
+
+def test_failed_restart_detaches_scrapers():
+    """A relaunch failure leaves no scraper holding the quit browser."""
+    drivers = [FakeDriver(), RuntimeError("Chrome failed to start"), FakeDriver()]
+
+    def launch(*args):
+        driver = drivers.pop(0)
+        if isinstance(driver, Exception):
+            raise driver
+        return driver
+
+    with mock.patch.object(session_module, "create_driver", side_effect=launch):
+        browser = BrowserSession()
+        first = MunicodeScraper(session=browser)
+        second = MunicodeScraper(session=browser)
+        first._setup_driver()
+        second._setup_driver()
+        old = first.driver
+
+        try:
+            first._recycle_driver("test")
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("restart failure was swallowed")
+
+        assert old.quit_called
+        assert browser.driver is None and first.driver is None and second.driver is None
+        assert browser.users == 0
+        first.close()
+        second._setup_driver()
+        assert second.driver is browser.driver is not old and browser.users == 1
+
+
+if __name__ == "__main__":
+    test_stale_driver_path_is_refreshed()
+    test_restart_rebinds_attached_scrapers()
+    test_failed_restart_detaches_scrapers()
+    print("Session tests passed")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Tests for plain-text extraction from section HTML."""
+
+from municode_lib import text
+from municode_lib.text import html_to_text
+
+CASES = [
+    ("<table><tr><th>Zone</th><th>Use</th></tr><tr><td>R-1</td><td>Single-family</td></tr></table>",
+     "Zone Use\nR-1 Single-family"),
+    ("<p>First line<br>second line<br/>third</p>", "First line\nsecond line\nthird"),
+    ("<p>Fees &amp; charges &lt;$50&gt; &#167; 22-1</p>", "Fees & charges <$50> § 22-1"),
+    ("<div><p>Outer <em>emphasis</em></p><ul><li>one</li><li>two <b>bold</b></li></ul></div>",
+     "Outer emphasis\none\ntwo bold"),
+    ("<p>&nbsp;&nbsp;&nbsp;&nbsp;(a) Indented</p><script>ignored()</script>", "    (a) Indented"),
+]
+
+
+def test_html_to_text():
+    """Tables, line breaks, entities and nested blocks convert as expected."""
+    for html, expected in CASES:
+        assert html_to_text(html) == expected, html
+
+
+def test_engines_agree():
+    """The BeautifulSoup fallback gives the same text as lxml."""
+    for html, expected in CASES:
+        assert text._normalize_lines(text._html_to_text_bs4(html)) == expected, html
+
+
+if __name__ == "__main__":
+    test_html_to_text()
+    test_engines_agree()
+    print("Text extraction tests passed")
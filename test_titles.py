@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Golden-file test for section title parsing."""
+
+import json
+from pathlib import Path
+
+from municode_lib.models import parse_section_title
+from municode_lib.titles import parse_section_titles, clear_title_cache
+
+GOLDEN_FILE = Path(__file__).parent / "fixtures" / "section_titles.json"
+
+
+def _load_golden():
+    with open(GOLDEN_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_parse_section_title_matches_golden():
+    """Each title must parse to the recorded (id, label, title)."""
+    clear_title_cache()
+    for case in _load_golden():
+        assert list(parse_section_title(case["input"])) == case["expected"], case["input"]
+        # Second call is served from the memo cache and must not differ
+        assert list(parse_section_title(case["input"])) == case["expected"], case["input"]
+
+
+def test_parse_section_titles_batch_matches_golden():
+    """The batch API must agree with the single-title API, in order."""
+    golden = _load_golden()
+    inputs = [case["input"] for case in golden] * 2
+    expected = [case["expected"] for case in golden] * 2
+    assert [list(r) for r in parse_section_titles(inputs)] == expected
+
+
+if __name__ == "__main__":
+    test_parse_section_title_matches_golden()
+    test_parse_section_titles_batch_matches_golden()
+    print("Golden title tests passed")
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Tests for the versioned corpus store."""
+
+import tempfile
+
+from municode_lib.models import Section, Document
+from municode_lib.versions import VersionStore
+
+
+def _snapshot(edits):
+    sections = [Section(id=f"sec-{i}", title=f"Title {i}", label=f"Sec. {i}.",
+                        content=edits.get(i, f"<p>Original text of section {i}.</p>"), path=["chapter-1", f"sec-{i}"])
+                for i in range(200)]
+    return [Document(title="Chapter 1", sections=sections, source_url=""),
+            Document(title="Chapter 2", sections=sections[:5], source_url="")]
+
+
+def test_versions_round_trip_with_small_deltas():
+    """Every version materializes exactly; deltas stay small."""
+    snapshots = [
+        _snapshot({}),
+        _snapshot({3: "<p>Amended.</p>"}),
+        _snapshot({3: "<p>Amended.</p>", 150: "<p>Amended again.</p>"}),
+        _snapshot({150: "<p>Amended again.</p>"}),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VersionStore(tmp, checkpoint_every=3)
+        for snapshot in snapshots:
+            store.add_version("springfield", snapshot)
+
+        kinds = [entry["kind"] for entry in store.versions("springfield")]
+        assert kinds == ["full", "delta", "delta", "full"]
+        versions = store.versions("springfield")
+        assert versions[1]["bytes"] < versions[0]["bytes"] / 5
+
+        # A fresh store has no cached state and reconstructs from disk
+        fresh = VersionStore(tmp, checkpoint_every=3)
+        for number, snapshot in reversed(list(enumerate(snapshots, start=1))):
+            assert fresh.materialize("springfield", number) == snapshot
+
+
+if __name__ == "__main__":
+    test_versions_round_trip_with_small_deltas()
+    print("Version store tests passed")
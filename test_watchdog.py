@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Tests for the browser watchdog."""
+
+import argparse
+
+from municode_lib.cli import make_watchdog
+from municode_lib.scraper import MunicodeScraper
+from municode_lib.watchdog import DriverWatchdog
+
+
+def test_restart_after_page_limit_and_failures():
+    """Page count and consecutive failures each trigger a restart."""
+    watchdog = DriverWatchdog(max_pages=3, max_rss_mb=None)
+    watchdog.record(0.5)
+    watchdog.record(None)  # Element absent, but the page loaded
+    assert watchdog.check(None) is None
+    watchdog.record(0.5)
+    assert watchdog.check(None) == "3 pages served"
+
+    watchdog.reset()
+    watchdog.max_pages = 0
+    for _ in range(3):
+        watchdog.record(None, ok=False)
+    assert watchdog.check(None) == "3 consecutive failed loads"
+
+
+def test_restart_when_latency_degrades():
+    """A rolling median well above the first window triggers a restart."""
+    watchdog = DriverWatchdog(max_pages=0, max_rss_mb=None, window=4, latency_factor=2.0)
+    for latency in (1.0, 1.2, 0.8, 1.0):
+        watchdog.record(latency)
+    for latency in (1.5, 1.8):
+        watchdog.record(latency)
+    assert watchdog.check(None) is None
+    for latency in (2.5, 3.0):
+        watchdog.record(latency)
+    assert watchdog.check(None).startswith("median latency")
+
+
+class LoadingDriver:
+    """Stands in for a WebDriver whose pages load but never show content."""
+
+    def get(self, url):
+        pass
+
+
+class StalledScraper(MunicodeScraper):
+    """Scraper whose awaited elements never appear."""
+
+    def __init__(self, watchdog):
+        super().__init__(watchdog=watchdog)
+        self.driver = LoadingDriver()
+
+    def _wait_for_present(self, by, value, timeout=None):
+        return False
+
+
+def test_element_timeouts_count_as_failures():
+    """Consecutive element timeouts trigger a restart; the root-page TOC probe doesn't."""
+    watchdog = DriverWatchdog(max_pages=0, max_rss_mb=None, max_failures=3)
+    scraper = StalledScraper(watchdog)
+    for _ in range(3):
+        assert scraper._is_root_url("https://example.com/root")
+    assert watchdog.check(None) is None
+
+    for _ in range(3):
+        assert not scraper._wait_for_element("https://example.com/page", "class name", "chunk-heading")
+    assert watchdog.check(None) == "3 consecutive failed loads"
+
+
+def test_watchdog_is_opt_in():
+    """The CLI only watches the browser when a limit is given."""
+    assert make_watchdog(argparse.Namespace(recycle_pages=None, max_browser_mb=None)) is None
+    watchdog = make_watchdog(argparse.Namespace(recycle_pages=200, max_browser_mb=None))
+    assert watchdog.max_pages == 200 and watchdog.max_rss_mb is None
+
+
+if __name__ == "__main__":
+    test_restart_after_page_limit_and_failures()
+    test_restart_when_latency_degrades()
+    test_element_timeouts_count_as_failures()
+    test_watchdog_is_opt_in()
+    print("Watchdog tests passed")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Tests for the distributed scraping task queue."""
+
+import tempfile
+from pathlib import Path
+
+from municode_lib.scraper import MunicodeScraper
+from municode_lib.seen import SqliteSeenSet
+from municode_lib.workqueue import SqliteTaskQueue, Task, run_worker, assemble_documents
+
+PAGE = ('<ul class="chunks"><li><div class="chunk-title">Sec. 22-1. - Emergency procedures.</div>'
+        '<div class="chunk-content"><p>Text.</p></div></li></ul>')
+
+
+class StubDriver:
+    """Stands in for a WebDriver on a loaded content page."""
+
+    def execute_script(self, script, include_chunks):
+        return {"heading": "Sec. 22-1. - Emergency procedures.", "chunks": PAGE if include_chunks else None}
+
+
+class FlakyScraper(MunicodeScraper):
+    """Scraper whose first page load times out."""
+
+    def __init__(self):
+        super().__init__()
+        self.driver = StubDriver()
+        self.loads = 0
+
+    def _wait_for_element(self, url, by, value, timeout=None, may_be_missing=False):
+        self.loads += 1
+        return self.loads > 1
+
+    def _wait_for_present(self, by, value, timeout=None):
+        return True
+
+
+def test_failed_fetch_is_redelivered():
+    """A page that fails to load is nacked and retried instead of acked empty."""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = SqliteTaskQueue(str(Path(tmp) / "queue.db"))
+        queue.add_document("doc", "Chapter 22", "https://example.com/doc", 0)
+        queue.put([Task(id="t1", document_key="doc", position=0, url="https://example.com/doc?nodeId=1")])
+
+        scraper = FlakyScraper()
+        completed = run_worker(scraper, queue, idle_timeout=0, poll_interval=0)
+
+        assert scraper.loads == 2
+        assert completed == 1
+        assert queue.counts()["done"] == 1
+        documents = assemble_documents(queue)
+        assert [section.id for section in documents[0].sections] == ["sec-22-1"]
+        queue.close()
+
+
+class PageScraper(MunicodeScraper):
+    """Scraper whose pages all load, sharing a seen-set with other workers."""
+
+    def __init__(self, seen):
+        super().__init__(seen=seen)
+        self.driver = StubDriver()
+
+    def _wait_for_element(self, url, by, value, timeout=None, may_be_missing=False):
+        return True
+
+    def _wait_for_present(self, by, value, timeout=None):
+        return True
+
+
+class DyingQueue(SqliteTaskQueue):
+    """Queue whose worker dies before acknowledging its first task."""
+
+    def ack(self, task, sections):
+        raise KeyboardInterrupt("worker killed")
+
+
+def test_redelivered_page_is_not_acked_empty():
+    """A page whose worker died before acking is parsed again, even with a shared seen-set."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "queue.db")
+        seen = SqliteSeenSet(str(Path(tmp) / "seen.db"))
+        queue = DyingQueue(path, lease_seconds=0)
+        queue.add_document("doc", "Chapter 22", "https://example.com/doc", 0)
+        queue.put([Task(id="t1", document_key="doc", position=0, url="https://example.com/doc?nodeId=1")])
+        try:
+            run_worker(PageScraper(seen), queue, idle_timeout=0, poll_interval=0)
+        except KeyboardInterrupt:
+            pass
+        queue.close()
+
+        queue = SqliteTaskQueue(path)
+        assert run_worker(PageScraper(seen), queue, idle_timeout=0, poll_interval=0) == 1
+        documents = assemble_documents(queue)
+        assert [section.id for section in documents[0].sections] == ["sec-22-1"]
+        queue.close()
+        seen.close()
+
+
+def test_page_stored_by_another_worker_is_acked_empty():
+    """The same page under a second document is skipped once a worker has stored it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        seen = SqliteSeenSet(str(Path(tmp) / "seen.db"))
+        queue = SqliteTaskQueue(str(Path(tmp) / "queue.db"))
+        for position, key in enumerate(["doc-a", "doc-b"]):
+            queue.add_document(key, key, f"https://example.com/{key}", position)
+            queue.put([Task(id=key, document_key=key, position=0, url=f"https://example.com/{key}?nodeId={key}")])
+
+        run_worker(PageScraper(seen), queue, idle_timeout=0, poll_interval=0)
+
+        assert queue.counts()["done"] == 2
+        assert [len(doc.sections) for doc in assemble_documents(queue)] == [1, 0]
+        assert seen.has_node("doc-a") and not seen.has_node("doc-b")
+        queue.close()
+        seen.close()
+
+
+if __name__ == "__main__":
+    test_failed_fetch_is_redelivered()
+    test_redelivered_page_is_not_acked_empty()
+    test_page_stored_by_another_worker_is_acked_empty()
+    print("Work queue tests passed")
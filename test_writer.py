@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Tests for the background output writer."""
+
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+from municode_lib import fileio
+from municode_lib.models import Section, Document
+from municode_lib.writer import OutputWriter
+
+
+def _document(title):
+    sections = [Section(id=f"sec-{i}", title=f"Section {i}", label=f"Sec. {i}.", content=f"<p>{i}</p>")
+                for i in range(3)]
+    return Document(title=title, sections=sections, source_url="")
+
+
+def test_writes_all_formats_atomically():
+    """Every format is written and no temporary files are left behind."""
+    with tempfile.TemporaryDirectory() as tmp:
+        with OutputWriter(tmp, ["html", "json", "jsonl"], max_pending=1) as writer:
+            for title in ("Chapter 1", "Chapter 2"):
+                writer.write_document(_document(title))
+
+        names = sorted(path.name for path in Path(tmp).iterdir())
+        assert names == ["Chapter 1.html", "Chapter 1.json", "Chapter 2.html", "Chapter 2.json", "sections.jsonl"]
+        assert Document.load_json(Path(tmp) / "Chapter 2.json") == _document("Chapter 2")
+        lines = (Path(tmp) / "sections.jsonl").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["document"] for line in lines] == ["Chapter 1"] * 3 + ["Chapter 2"] * 3
+
+
+def test_failed_run_leaves_no_stream():
+    """An exception while producing discards the partial JSONL stream."""
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            with OutputWriter(tmp, ["jsonl"]) as writer:
+                writer.write_document(_document("Chapter 1"))
+                raise RuntimeError("scrape failed")
+        except RuntimeError:
+            pass
+        assert list(Path(tmp).iterdir()) == []
+
+
+def test_atomic_files_keep_normal_permissions():
+    """New files follow the umask and replaced files keep their mode, instead of mkstemp's 0600."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "Chapter 1.json"
+        _document("Chapter 1").save_json(path)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~fileio._UMASK
+
+        os.chmod(path, 0o640)
+        _document("Chapter 1").save_json(path)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+
+if __name__ == "__main__":
+    test_writes_all_formats_atomically()
+    test_failed_run_leaves_no_stream()
+    test_atomic_files_keep_normal_permissions()
+    print("Writer tests passed")